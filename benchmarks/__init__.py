@@ -0,0 +1,5 @@
+"""
+Benchmarks of the dictgest ingestion hot paths.
+
+Run with ``python -m benchmarks.run``, see ``python -m benchmarks.run --help``.
+"""
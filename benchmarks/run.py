@@ -0,0 +1,138 @@
+"""
+Benchmark runner.
+
+Examples
+--------
+
+    python -m benchmarks.run                       # run all the workloads
+    python -m benchmarks.run -k flat -k table      # run the matching workloads
+    python -m benchmarks.run --save baseline.json  # save the results
+    python -m benchmarks.run --compare baseline.json
+
+Each workload is timed several times with `time.perf_counter`, the median time
+is reported as records/sec. Memory is measured in a separate run with `tracemalloc`
+and reported per record as the peak of traced memory in bytes (`peak_bytes_per_record`)
+and as the number of memory blocks allocated by the run and still alive at its end,
+eg: the output items (`blocks_per_record`).
+When comparing, workloads slower than the baseline by more than the threshold
+are reported as regressions and the exit code is 1.
+"""
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Optional
+
+from .workloads import WORKLOADS, Workload
+
+
+def measure(workload: Workload, size: int, repeat: int) -> dict:
+    """Time a workload and measure its peak of traced memory and its allocated blocks"""
+    run, records = workload.setup(size)
+    run()  # warmup: plan compilation, caches
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        output = run()
+        _, peak = tracemalloc.get_traced_memory()
+        # only the blocks allocated since `tracemalloc.start` are traced
+        traced = tracemalloc.take_snapshot().statistics("filename")
+        blocks = sum(stat.count for stat in traced)
+    finally:
+        tracemalloc.stop()
+    del output
+
+    median = statistics.median(timings)
+    return {
+        "records": records,
+        "median_s": median,
+        "min_s": min(timings),
+        "records_per_s": records / median if median else float("inf"),
+        "peak_bytes_per_record": peak / records,
+        "blocks_per_record": blocks / records,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print the speed ratio of each workload against the baseline.
+
+    Returns
+    -------
+        Names of the workloads slower than the baseline by more than threshold
+    """
+    regressions = []
+    print(f"\n{'workload':<20} {'baseline rec/s':>15} {'rec/s':>12} {'ratio':>7}")
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<20} {'-':>15} {result['records_per_s']:>12,.0f}")
+            continue
+        ref = baseline[name]["records_per_s"]
+        ratio = result["records_per_s"] / ref
+        flag = ""
+        if ratio < 1 - threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<20} {ref:>15,.0f} {result['records_per_s']:>12,.0f} {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Command line entry point, returns the exit code"""
+    parser = argparse.ArgumentParser(description="dictgest benchmarks")
+    parser.add_argument("-k", dest="filters", action="append", default=[],
+                        help="only run workloads containing this text (repeatable)")
+    parser.add_argument("--size", type=int, default=2000, help="records per workload")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per workload")
+    parser.add_argument("--save", metavar="FILE", help="save the results as json")
+    parser.add_argument("--compare", metavar="FILE", help="compare with saved results")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="relative slowdown reported as regression (default: 0.1)")
+    parser.add_argument("--list", action="store_true", help="list the workloads")
+    args = parser.parse_args(argv)
+
+    workloads = [
+        workload
+        for workload in WORKLOADS
+        if not args.filters or any(text in workload.name for text in args.filters)
+    ]
+    if args.list:
+        for workload in workloads:
+            print(f"{workload.name:<20} {workload.description}")
+        return 0
+
+    print(
+        f"{'workload':<20} {'rec/s':>12} {'median ms':>10} {'peak B/rec':>11} {'blocks/rec':>11}"
+    )
+    results = {}
+    for workload in workloads:
+        result = measure(workload, args.size, args.repeat)
+        results[workload.name] = result
+        print(
+            f"{workload.name:<20} {result['records_per_s']:>12,.0f} "
+            f"{result['median_s'] * 1000:>10.2f} {result['peak_bytes_per_record']:>11,.0f} "
+            f"{result['blocks_per_record']:>11,.1f}"
+        )
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump({"python": sys.version, "results": results}, file, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+"""
+Synthetic benchmark workloads.
+
+Each workload builds its data once (`Workload.setup`) and returns a callable
+doing the measured work, together with the number of records it processes.
+"""
+from dataclasses import dataclass, make_dataclass
+from datetime import datetime
+from typing import Annotated, Callable
+
+import dictgest as dg
+from dictgest import Path, Route, typecast
+from dictgest.cast import convert
+
+
+@dataclass
+class Workload:
+    """A named benchmark: `setup(size)` returns (callable to measure, processed records)"""
+
+    name: str
+    setup: Callable[[int], tuple[Callable[[], object], int]]
+    description: str = ""
+
+
+# -- flat records -----------------------------------------------------------
+
+
+@dataclass
+class Flat:
+    id: int
+    name: str
+    price: float
+    quantity: int
+    active: bool
+    category: str
+    created: datetime
+    rating: float = 0.0
+
+
+def _flat_records(size: int) -> list[dict]:
+    return [
+        {
+            "id": str(idx),
+            "name": f"item {idx}",
+            "price": f"{idx * 1.5}",
+            "quantity": idx % 7,
+            "active": "yes" if idx % 2 else "no",
+            "category": "tools",
+            "created": "2022-01-02T10:20:30",
+            "unused": {"a": [1, 2, 3]},
+        }
+        for idx in range(size)
+    ]
+
+
+def flat_from_dict(size: int):
+    records = _flat_records(size)
+    return (lambda: [dg.from_dict(Flat, record) for record in records]), size
+
+
+def _flat_batch(backend: str, output: str = "items"):
+    def setup(size: int):
+        records = _flat_records(size)
+        return (lambda: dg.from_dicts(Flat, records, backend=backend, output=output)), size
+
+    return setup
+
+
+# -- nested paths with wildcards ----------------------------------------------
+
+
+@dataclass
+class Post:
+    title: Annotated[str, Path("data/post/meta/title")]
+    author: Annotated[str, Path("data/post/meta/author/name")]
+    votes: Annotated[int, Path("data/post/stats/votes")]
+    tags: Annotated[list[str], Path("data/post/tags/*{kind=topic}/name")]
+    reviewers: Annotated[list[str], Path("data/post/reviews/user")]
+
+
+def _nested_records(size: int) -> list[dict]:
+    return [
+        {
+            "data": {
+                "post": {
+                    "meta": {"title": f"post {idx}", "author": {"name": "someone"}},
+                    "stats": {"votes": str(idx)},
+                    "tags": [
+                        {"kind": "topic", "name": "python"},
+                        {"kind": "lang", "name": "en"},
+                        {"kind": "topic", "name": "data"},
+                    ],
+                    "reviews": [{"user": "a", "score": 3}, {"user": "b", "score": 4}],
+                }
+            }
+        }
+        for idx in range(size)
+    ]
+
+
+def nested_paths(size: int):
+    records = _nested_records(size)
+    return (lambda: dg.from_dicts(Post, records)), size
+
+
+def path_extract(size: int):
+    records = _nested_records(size)
+    paths = [
+        Path("data/post/meta/title"),
+        Path("data/post/tags/*{kind=topic}/name"),
+        Path("data/post/reviews/user"),
+    ]
+    return (lambda: [path.extract(record) for record in records for path in paths]), size
+
+
+# -- list[Measurment] typecast nesting -----------------------------------------
+
+
+@typecast
+@dataclass
+class Measurment:
+    temp: float
+    humidity: float
+    date: datetime
+
+
+@dataclass
+class Sensor:
+    name: str
+    uptime: float
+    readings: list[Measurment]
+
+
+def typecast_nesting(size: int):
+    readings = [
+        {"temp": str(20 + idx % 10), "humidity": "0.4", "date": "2022-06-12"}
+        for idx in range(100)
+    ]
+    sensors = max(size // 20, 1)
+    records = [
+        {"name": f"sensor {idx}", "uptime": "39", "readings": readings} for idx in range(sensors)
+    ]
+    return (lambda: dg.from_dicts(Sensor, records)), sensors * len(readings)
+
+
+# -- multi-route Chart ---------------------------------------------------------
+
+
+@typecast
+@dataclass
+class Author:
+    name: str
+    karma: int
+
+
+@dataclass
+class Article:
+    title: str
+    author: Author
+    votes: int
+
+
+def multi_route(size: int):
+    route_a = {
+        Article: Route(title="headline", author="user", votes="stats/votes"),
+        Author: Route(name="login", karma="stats/karma"),
+    }
+    route_b = {
+        Article: Route(title="meta/title", author="meta/by", votes="score"),
+        Author: Route(name="id", karma="points"),
+    }
+    records_a = [
+        {
+            "headline": f"a{idx}",
+            "user": {"login": "x", "stats": {"karma": "5"}},
+            "stats": {"votes": str(idx)},
+        }
+        for idx in range(size // 2)
+    ]
+    records_b = [
+        {"meta": {"title": f"b{idx}", "by": {"id": "y", "points": 3}}, "score": idx}
+        for idx in range(size - size // 2)
+    ]
+
+    def run():
+        return dg.from_dicts(Article, records_a, routing=route_a) + dg.from_dicts(
+            Article, records_b, routing=route_b
+        )
+
+    return run, size
+
+
+# -- convert -------------------------------------------------------------------
+
+
+def convert_containers(size: int):
+    values = [
+        (["1", "2", "3", 4.0], list[int]),
+        ({"a": "1.5", "b": 2}, dict[str, float]),
+        (("1", 2, "3.5"), tuple[int, str, float]),
+        ("2022-01-02", datetime),
+        ("7", int),
+    ]
+
+    def run():
+        for _ in range(size):
+            for val, dtype in values:
+                convert(val, dtype, dg.default_convertor)
+
+    return run, size * len(values)
+
+
+# -- tables --------------------------------------------------------------------
+
+
+@dataclass
+class Row:
+    timestamp: float
+    sensor: str
+    temp: float
+    humidity: float
+    pressure: int
+    ok: bool
+
+
+_WIDE_COLUMNS = 64
+
+
+def long_table(size: int):
+    header = ["timestamp", "sensor", "temp", "humidity", "pressure", "ok"]
+    table = [[idx, "s1", f"{idx % 30}.5", 0.4, "1013", True] for idx in range(size)]
+    return (lambda: list(dg.table_to_items(Row, table, header))), size
+
+
+Wide = make_dataclass("Wide", [(f"c{idx}", float) for idx in range(_WIDE_COLUMNS)])
+
+
+def wide_table(size: int):
+    rows = max(size // 10, 1)
+    header = [f"c{idx}" for idx in range(_WIDE_COLUMNS)]
+    table = [[str(idx)] * _WIDE_COLUMNS for idx in range(rows)]
+    return (lambda: list(dg.table_to_items(Wide, table, header))), rows
+
+
+WORKLOADS = [
+    Workload("flat/from_dict", flat_from_dict, "flat records, one from_dict call each"),
+    Workload("flat/from_dicts", _flat_batch("codegen"), "flat records, codegen batch"),
+    Workload("flat/interpreter", _flat_batch("interpreter"), "flat records, interpreted batch"),
+    Workload("flat/columns", _flat_batch("codegen", "columns"), "flat records, ColumnTable output"),
+    Workload("nested/paths", nested_paths, "deep nested paths with wildcards"),
+    Workload("nested/extract", path_extract, "Path.extract on deep paths"),
+    Workload("typecast/list", typecast_nesting, "list[Measurment] typecast nesting"),
+    Workload("routing/chart", multi_route, "two sources routed with multi-type charts"),
+    Workload("convert/values", convert_containers, "cast.convert on containers and scalars"),
+    Workload("table/long", long_table, "table_to_items on a long table"),
+    Workload("table/wide", wide_table, f"table_to_items on a {_WIDE_COLUMNS} columns table"),
+]
@@ -4,6 +4,7 @@ Package for ingesting dictionary data into python classes.
 
 __all__ = [
     "from_dict",
+    "from_dicts",
     "table_to_item",
     "table_to_items",
     "typecast",
@@ -11,7 +12,15 @@ __all__ = [
     "default_convertor",
     "Route",
     "Chart",
+    "compile_plan",
+    "Plan",
+    "lazy_from_dict",
+    "compact",
+    "TableAccumulator",
 ]
-from .serdes import from_dict, typecast, table_to_item, table_to_items
+from .serdes import compact, from_dict, from_dicts, typecast, table_to_item, table_to_items
 from .routes import Path, Route, Chart
 from .converter import default_convertor
+from .plan import compile_plan, Plan
+from .lazy import lazy_from_dict
+from .accumulate import TableAccumulator
@@ -0,0 +1,309 @@
+"""
+Incremental table ingestion.
+
+A `TableAccumulator` builds the same item as `table_to_item` from a table received
+in chunks (paged APIs, streamed CSV files, cursors), without concatenating the chunks.
+Each chunk is converted when it is added and its values are appended to a buffer
+per target field, the target is built by `TableAccumulator.finalize`.
+
+Fields annotated as list[X] (or set/tuple) and NumPy arrays are converted chunk by chunk.
+Numeric values are stored in typed buffers (`array.array`, 8 bytes per value) which
+grow in amortized constant time, NumPy arrays are then built on the buffer without copy.
+Other fields keep the raw column values and are converted by `finalize`, as `table_to_item` does.
+"""
+from array import array
+from typing import Any, Iterable, Optional, Sequence, Union, get_args
+
+from .cast import TypeConverterMap
+from .columnar import (
+    _column_key,
+    _item_convert,
+    _single_element_iterable,
+    convert_column,
+    float_keys,
+    frame_columns,
+    table_columns,
+)
+from .converter import default_convertor
+from .parallel import chunked
+from .plan import Plan, RoutingType, compile_plan
+from .sources import TableStream, is_cursor, read_cursor
+from .stats import IngestStats, timed, timed_call
+from .stream import root_keys
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+# typed buffers of list[X] (or set/tuple) fields
+_TYPECODES = {float: "d", int: "q"}
+
+
+class _ListBuffer:
+    """Converted values of a list[X] (or set[X], tuple[X, ...]) field.
+
+    Values are stored in a typed array while all of them have exactly the element type,
+    the buffer switches to a list otherwise (eg: None values, ints larger than int64).
+    """
+
+    __slots__ = ("plan", "origin", "element", "values")
+
+    def __init__(self, plan, dtype) -> None:
+        self.plan = plan
+        self.origin = dtype.__origin__
+        self.element = dtype.__args__[0]
+        typecode = None
+        if not (plan.type_mappings and self.element in plan.type_mappings):
+            typecode = _TYPECODES.get(self.element)
+        self.values: Union[array, list] = array(typecode) if typecode else []
+
+    def extend(self, column: Sequence) -> None:
+        """Convert the values of a chunk column and append them"""
+        plan = self.plan
+        values = convert_column(column, self.element, plan.type_mappings, plan.routing)
+        if isinstance(self.values, array):
+            size = len(self.values)
+            if set(map(type, values)) <= {self.element}:
+                try:
+                    self.values.extend(values)
+                    return
+                except OverflowError:
+                    del self.values[size:]
+            self.values = self.values.tolist()
+        self.values.extend(values)
+
+    def build(self):
+        """Field value: a list, set or tuple of the converted values"""
+        values = self.values
+        if isinstance(values, array) and self.origin is list:
+            return values.tolist()
+        return self.origin(values)
+
+
+class _ArrayBuffer:
+    """Values of a NumPy array field (eg: ``NDArray[np.float64]``) in a typed array"""
+
+    __slots__ = ("dtype", "values")
+
+    def __init__(self, dtype, values: array) -> None:
+        self.dtype = dtype
+        self.values = values
+
+    @classmethod
+    def create(cls, dtype) -> Optional["_ArrayBuffer"]:
+        """Buffer of an array annotation, None when the element type has no typed array"""
+        args = get_args(dtype)
+        if np is None or len(args) != 2 or not get_args(args[1]):
+            return None
+        element = get_args(args[1])[0]
+        if not isinstance(element, type) or np.dtype(element).kind not in "iuf":
+            return None
+        element = np.dtype(element)
+        if element.char not in "bBhHiIlLqQfd":
+            return None  # eg: float16
+        return cls(element, array(element.char))
+
+    def extend(self, column: Sequence) -> None:
+        """Append the values of a chunk column, converted to the array dtype"""
+        # same conversion as `convert_ndarray`, applied to the chunk
+        values = np.ascontiguousarray(np.asarray(column, dtype=self.dtype))
+        self.values.frombytes(values.data.cast("B"))
+
+    def build(self):
+        """Field value: a NumPy array sharing the memory of the buffer"""
+        return np.frombuffer(self.values, dtype=self.dtype)
+
+
+def _column_buffer(plan, field):
+    """Incremental buffer of a field, None for the fields converted by `finalize`"""
+    if not plan.convert_types or _column_key(field) is None:
+        return None
+    if field.path is not None and field.path.extractor is not None:
+        return None
+    if _single_element_iterable(field.dtype):
+        return _ListBuffer(plan, field.dtype)
+    return _ArrayBuffer.create(field.dtype)
+
+
+class TableAccumulator:
+    """Builds a target item from a table added chunk by chunk,
+    the result is the one of `table_to_item` on the whole table.
+
+    Parameters
+    ----------
+    target
+        Target conversion type
+    header, optional
+        column names of the chunks, chunks with their own column names
+        (eg: pandas DataFrames) do not need it
+    type_mappings, optional
+        custom conversion mapping for datatypess, by default None
+    routing, optional
+        custom conversion routing for fieldnames, see `Route`
+    convert_types, optional
+        if target fields should be converted to typing hint types.
+    stats, optional
+        collector recording per field counts and timings, see `IngestStats`
+
+    Examples
+    --------
+
+    >>> acc = TableAccumulator(Measurements, header=["time", "value"])
+    >>> for page in pages:
+    ...     acc.add(page)
+    >>> measurements = acc.finalize()
+    """
+
+    # pylint: disable=R0902
+
+    def __init__(
+        self,
+        target: type,
+        header: Optional[Sequence[str]] = None,
+        type_mappings: TypeConverterMap = default_convertor,
+        routing: RoutingType = None,
+        convert_types: bool = True,
+        stats: Optional[IngestStats] = None,
+        # pylint: disable=R0913
+    ) -> None:
+        self.plan: Plan[Any] = compile_plan(
+            target, routing=routing, type_mappings=type_mappings, convert_types=convert_types
+        )
+        self.header = list(header) if header is not None else None
+        self.nrows = 0
+        self._stats = stats.target(self.plan.target) if stats is not None else None
+        self._keys = root_keys(self.plan)
+        self._nan_keys = float_keys(self.plan)
+        self._present: Optional[frozenset[str]] = None
+        self._buffers: dict[str, Any] = {}
+        self._raw: dict[str, list] = {}
+        self._raw_keys: Optional[set[str]] = set()
+        for field in self.plan.fields:
+            buffer = _column_buffer(self.plan, field)
+            if buffer is not None:
+                self._buffers[field.name] = buffer
+            elif self._keys is None:
+                self._raw_keys = None  # eg: Path("") reads the whole table
+            elif self._raw_keys is not None:
+                # plans reading top-level keys only, see `root_keys`
+                self._raw_keys.add(field.name if field.path is None else field.path.program[0][1])
+        self._finalized = False
+
+    def add(self, rows, header: Optional[Sequence[str]] = None) -> "TableAccumulator":
+        """Convert a chunk of the table and append its values to the field buffers.
+
+        Parameters
+        ----------
+        rows
+            rows of the chunk (nested lists or 2d numpy array), or a dataframe like chunk:
+            pandas DataFrame, pyarrow Table/RecordBatch or numpy structured array
+        header, optional
+            column names of the chunk, by default the accumulator header
+
+        Returns
+        -------
+            The accumulator
+        """
+        if self._finalized:
+            raise ValueError("The accumulator is already finalized")
+        header = self.header if header is None else header
+        frame = frame_columns(rows, header, self._keys, self._nan_keys)
+        if frame is None:
+            if header is None:
+                raise ValueError("A header is required for tables without column names")
+            frame = table_columns(rows, header, False)
+        columns, nrows = frame
+        if nrows == 0:
+            return self
+        self._check_columns(columns)
+        for field in self.plan.fields:
+            buffer = self._buffers.get(field.name)
+            key = _column_key(field)
+            if buffer is None or key not in columns:
+                continue
+            if self._stats is None:
+                buffer.extend(columns[key])
+            else:
+                field_stats = self._stats.field(field.name)
+                timed(self._stats, field_stats, "convert", buffer.extend, columns[key])
+        for key, column in columns.items():
+            if self._raw_keys is None or key in self._raw_keys:
+                self._raw.setdefault(key, []).extend(column)
+        self.nrows += nrows
+        return self
+
+    def _check_columns(self, columns: dict[str, Sequence]) -> None:
+        present = frozenset(columns if self._keys is None else self._keys & columns.keys())
+        if self._present is None:
+            self._present = present
+        elif present != self._present:
+            raise ValueError(
+                f"Chunk columns {sorted(present)} differ from the previous chunks columns "
+                f"{sorted(self._present)}"
+            )
+
+    def consume(self, data: Iterable[Sequence], chunksize: int = 4096) -> "TableAccumulator":
+        """Add a streamed table chunk by chunk: a `TableStream` (see `read_csv`),
+        an executed DB-API cursor or an iterator of rows
+
+        Parameters
+        ----------
+        data
+            streamed table, its header is used for `TableStream` and cursors
+        chunksize, optional
+            number of rows converted at a time
+
+        Returns
+        -------
+            The accumulator
+        """
+        if is_cursor(data):
+            data = read_cursor(data)
+        header = data.header if isinstance(data, TableStream) else None
+        for chunk in chunked(data, chunksize):
+            self.add(chunk, header)
+        return self
+
+    def finalize(self):
+        """Build the target item from the accumulated columns.
+        The buffers are released, no chunk can be added afterwards.
+
+        Returns
+        -------
+            The converted datatype
+        """
+        if self._finalized:
+            raise ValueError("The accumulator is already finalized")
+        self._finalized = True
+        plan = self.plan
+        present = self._present or frozenset()
+        target_stats = self._stats
+        kwargs = {}
+        for field in plan.fields:
+            buffer = self._buffers.pop(field.name, None)
+            field_stats = target_stats.field(field.name) if target_stats is not None else None
+            if field_stats is not None:
+                field_stats.count += 1
+            if buffer is not None and _column_key(field) in present:
+                kwargs[field.name] = buffer.build()
+                continue
+            if field_stats is None:
+                val = field.extract(self._raw)
+            else:
+                val = timed(target_stats, field_stats, "extract", field.extract, self._raw)
+            if plan.convert_types and field.dtype is not None:
+                if field_stats is None:
+                    val = _item_convert(plan, field, val)
+                else:
+                    val = timed(
+                        target_stats, field_stats, "convert", _item_convert, plan, field, val
+                    )
+            kwargs[field.name] = val
+        self._raw = {}
+        if target_stats is None:
+            return plan.target(**kwargs)
+        return timed_call(target_stats, plan.target, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"TableAccumulator({self.plan.target.__qualname__}, rows={self.nrows})"
@@ -0,0 +1,164 @@
+"""
+asyncio ingestion.
+
+Converts (async) iterables of dictionaries in chunks, giving control back to the event
+loop between chunks, so that large pages do not block other tasks.
+Chunks can also be offloaded to an executor.
+
+`Path` extractors and `Convertor` entries of the target fields can be coroutine
+functions (eg: enrichment lookups), in which case the records of a chunk
+are converted concurrently.
+"""
+import asyncio
+import inspect
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Iterable, Optional, TypeVar, Union
+
+from .cast import TypeConverterMap
+from .converter import default_convertor
+from .parallel import _convert_chunk, chunked
+from .plan import RoutingType, compile_plan
+
+T = TypeVar("T")
+
+
+def is_async(func: Optional[Callable]) -> bool:
+    """True for coroutine functions and objects with an async ``__call__``"""
+    if func is None:
+        return False
+    return inspect.iscoroutinefunction(func) or inspect.iscoroutinefunction(
+        getattr(func, "__call__", None)
+    )
+
+
+class AsyncPlan:
+    """Ingestion of a `Plan` whose target fields use async `Path` extractors
+    or async converters. Async converters are only used for the target fields,
+    not for container elements or nested types.
+    """
+
+    def __init__(self, plan) -> None:
+        self.plan = plan
+        self.extractors = [
+            field.path is not None and is_async(field.path.extractor) for field in plan.fields
+        ]
+        self.converters = [self._async_converter(field) for field in plan.fields]
+        self.is_async = any(self.extractors) or any(self.converters)
+
+    def _async_converter(self, field) -> Optional[Callable]:
+        mappings = self.plan.type_mappings
+        if not self.plan.convert_types or not mappings or field.dtype not in mappings:
+            return None
+        converter = mappings[field.dtype]
+        return converter if is_async(converter) else None
+
+    async def __call__(self, data: dict):
+        plan = self.plan
+        kwargs = {}
+        for field, async_extract, converter in zip(plan.fields, self.extractors, self.converters):
+            if async_extract:
+                val = field.required(await _extract(field, data))
+            else:
+                val = field.extract(data)
+            if converter is not None:
+                if not _has_type(val, field.dtype):
+                    val = await converter(val)
+            else:
+                val = plan.convert_field(field, val)
+            kwargs[field.name] = val
+        return plan.target(**kwargs)
+
+
+def _has_type(val, dtype) -> bool:
+    """Same check as `convert` before using a converter"""
+    return type(dtype) == type and isinstance(val, dtype)  # pylint: disable=C0123
+
+
+async def _extract(field, data):
+    try:
+        return await field.path.extract(data)
+    except KeyError:
+        return field.default
+
+
+async def _chunks(data: Union[AsyncIterable, Iterable], size: int) -> AsyncIterator[list]:
+    if not isinstance(data, AsyncIterable):
+        for chunk in chunked(data, size):
+            yield chunk
+        return
+    batch: list = []
+    async for item in data:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def from_dicts_async(
+    target: type[T],
+    data: Union[AsyncIterable[dict], Iterable[dict]],
+    type_mappings: TypeConverterMap = default_convertor,
+    routing: RoutingType = None,
+    convert_types: bool = True,
+    chunk_size: int = 256,
+    executor: Optional[Executor] = None,
+    offload_threshold: Optional[int] = None,
+    backend: str = "codegen",
+    # pylint: disable=R0913
+) -> AsyncIterator[T]:
+    """Converts an async iterable (or iterable) of dictionaries to the target type.
+
+    The dictionaries are converted in chunks, between chunks the control is given back
+    to the event loop.
+
+    Examples
+    --------
+
+    >>> async for article in from_dicts_async(Article, fetch_pages()):
+    >>>     ...
+
+    Parameters
+    ----------
+    target
+        Target conversion type
+    data
+        async iterable or iterable of dictionaries to be converted to target type
+    type_mappings, optional
+        custom conversion mapping for datatypes, converters can be coroutine functions
+    routing, optional
+        custom conversion routing for fieldnames, see `Route`.
+        `Path` extractors can be coroutine functions
+    convert_types, optional
+        if target fields should be converted to typing hint types.
+    chunk_size, optional
+        number of dictionaries converted before giving back the control to the event loop
+    executor, optional
+        executor in which chunks are offloaded, by default the event loop default executor
+    offload_threshold, optional
+        chunks of at least this many dictionaries are converted in the executor,
+        by default chunks are converted in the event loop thread.
+        Targets with async extractors/converters are always converted in the event loop
+    backend, optional
+        ingestion plan backend, see `compile_plan`
+
+    Yields
+    ------
+        The converted items
+    """
+    plan = compile_plan(target, routing, type_mappings, convert_types, backend)
+    async_plan = AsyncPlan(plan)
+    loop = asyncio.get_running_loop()
+    async for chunk in _chunks(data, chunk_size):
+        items: Any
+        if async_plan.is_async:
+            items = await asyncio.gather(*map(async_plan, chunk))
+        elif offload_threshold is not None and len(chunk) >= offload_threshold:
+            items = await loop.run_in_executor(executor, partial(_convert_chunk, plan, chunk))
+        else:
+            items = _convert_chunk(plan.ingest, chunk)
+            await asyncio.sleep(0)
+        for item in items:
+            yield item
@@ -1,14 +1,20 @@
 import copy
 import inspect
+import threading
+from enum import Enum
+from functools import partial
 from typing import (  # type: ignore
     Any,
     Callable,
+    Hashable,
     Iterable,
+    Literal,
     Mapping,
     MutableMapping,
     Optional,
     Protocol,
     TypeVar,
+    Union,
     cast,
     get_args,
     get_origin,
@@ -18,6 +24,11 @@ from typing import (  # type: ignore
 
 from dictgest.routes import Chart
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
 T = TypeVar("T")
 M = TypeVar("M", bound=Mapping)
 
@@ -25,6 +36,10 @@ TypeConverterMap = Mapping[type[T], Callable[[Any], T]]
 RouteMap = Mapping[type, Any]
 TypeConvertor = Callable[[Any], T]
 
+# `int | None` unions (python 3.10+) and `Optional[int]`/`Union[int, str]` unions
+_UNION_TYPES = (Union, getattr(types, "UnionType", Union))
+_CONVERSION_ERRORS = (ValueError, TypeError)
+
 
 @runtime_checkable
 class TypeCastable(Protocol):
@@ -45,7 +60,7 @@ def convert_mapping(
     data: Mapping,
     dtype: type[T],
     mappings: TypeConverterMap[T] = None,
-    routing: Chart = None,  # pylint: disable=W0613
+    routing: Chart = None,
 ) -> T:
     """Convert data to sepcified Mapping Annotated type
 
@@ -57,6 +72,8 @@ def convert_mapping(
         Desired Mapping type of the result
     mappings, optional
         Converters for mapping types, by default None
+    routing, optional
+        conversion routing for nested types, see `Chart`
 
     Returns
     -------
@@ -87,8 +104,8 @@ def convert_mapping(
         res = copy.copy(data) if isinstance(data, origin) else {}
     key_type, val_type = args
     for key, val in data.items():
-        key = convert(key, key_type, mappings)
-        val = convert(val, val_type, mappings)
+        key = convert(key, key_type, mappings, routing)
+        val = convert(val, val_type, mappings, routing)
         res[key] = val
     return cast(T, res)
 
@@ -97,7 +114,7 @@ def convert_iterable(
     data,
     dtype: type[T],
     mappings: TypeConverterMap[T] = None,
-    routing: Chart = None,  # pylint: disable=W0613
+    routing: Chart = None,
 ) -> T:
     """Convert data according to the annotated Iterable datatype
 
@@ -109,6 +126,8 @@ def convert_iterable(
         Desired result iterable data type
     mappings, optional
         Predefined conversions, by default None
+    routing, optional
+        conversion routing for nested types, see `Chart`
 
     Returns
     -------
@@ -122,14 +141,32 @@ def convert_iterable(
 
     elements: list[Any] = []
     if len(args) == 1:
-        elements.extend(convert(el, args[0], mappings) for el in data)
+        elements.extend(convert(el, args[0], mappings, routing) for el in data)
     else:
         assert len(args) == len(data)
-        elements.extend(convert(el, dt_val, mappings) for dt_val, el in zip(args, data))
+        elements.extend(
+            convert(el, dt_val, mappings, routing) for dt_val, el in zip(args, data)
+        )
 
     return origin(elements)  # type: ignore
 
 
+def convert_ndarray(data: Any, dtype: Any) -> Any:
+    """Convert data to a numpy array.
+
+    dtype can be `numpy.ndarray` or an annotation like ``numpy.typing.NDArray[np.float64]``,
+    in which case the array is cast in bulk to the annotated element type.
+    Arrays that already have the right element type are returned as they are (no copy).
+    """
+    args = get_args(dtype)
+    element_type = None
+    if len(args) == 2 and get_args(args[1]):
+        element_type = get_args(args[1])[0]
+        if not isinstance(element_type, type):
+            element_type = None  # eg: NDArray[Any]
+    return np.asarray(data, dtype=element_type)
+
+
 def convert_base_type(
     data: Any,
     dtype: type[T],
@@ -143,6 +180,8 @@ def convert_base_type(
     if type_mappings and dtype in type_mappings:
         return type_mappings[dtype](data)
 
+    if np is not None and dtype is np.ndarray:
+        return convert_ndarray(data, dtype)
     # base type
     if issubclass(dtype, TypeCastable):
         # Type has been decorated with the @typecast decorator
@@ -170,6 +209,8 @@ def convert_generic_alias(
 
     origin = get_origin(dtype)
     assert isinstance(origin, type)
+    if np is not None and origin is np.ndarray:
+        return convert_ndarray(data, dtype)
     if issubclass(origin, Mapping):
         if not isinstance(data, Mapping):
             raise TypeError(f"Cannot convert from {type(data)} to : {dtype}")
@@ -181,6 +222,374 @@ def convert_generic_alias(
     return convert_iterable(data, dtype, type_mappings, routing)
 
 
+_EMPTY = inspect.Parameter.empty
+_CACHE_SIZE = 4096
+_converter_cache: dict[Hashable, tuple] = {}
+_cache_lock = threading.Lock()
+
+
+def _identity(data):
+    return data
+
+
+def _unsupported(dtype, data):
+    raise ValueError(f"{type(dtype)}, {dtype}")
+
+
+def _routing_not_set(data):
+    raise ValueError("routing.typecast was not set")
+
+
+def _checked(dtype: type, converter: Callable) -> Callable:
+    def convert_instance(data):
+        if isinstance(data, dtype):
+            return data  # already the right type
+        return converter(data)
+
+    return convert_instance
+
+
+def _resolve_typecast(dtype: type, type_mappings, routing) -> Callable:
+    """Converter of a class with a ``__typecast__`` (eg: decorated with `typecast`)"""
+    typecast = getattr(dtype, "__typecast__")
+    if hasattr(typecast, "resolve"):
+        # compose the plan of the nested type, see `TypecastPlan`
+        return typecast.resolve(type_mappings, routing)
+    return lambda data: typecast(data, type_mappings, routing)
+
+
+def _resolve_routed(dtype: type, type_mappings, routing: Chart) -> Callable:
+    """Converter of a type routed by a `Chart`"""
+    typecast = routing.typecast
+    resolve = getattr(typecast, "resolve", None)
+    if resolve is not None:
+        return resolve(dtype, type_mappings, routing)
+    if typecast:
+        return partial(typecast, dtype, type_mappings=type_mappings, routing=routing)
+    return _routing_not_set
+
+
+def _resolve_base_type(dtype: type, type_mappings, routing) -> Callable:
+    """Resolve once the conversion done by `convert_base_type`"""
+    if type_mappings and dtype in type_mappings:
+        return type_mappings[dtype]
+    if np is not None and dtype is np.ndarray:
+        return partial(convert_ndarray, dtype=dtype)
+    # same check as issubclass(dtype, TypeCastable), without the protocol machinery
+    # which also caches negative results for classes decorated later on
+    if hasattr(dtype, "__typecast__"):
+        return _resolve_typecast(dtype, type_mappings, routing)
+    if routing and dtype in routing:
+        return _resolve_routed(dtype, type_mappings, routing)
+    return dtype
+
+
+_HOMOGENEOUS = (list, set, frozenset)
+_SIZED = (list, tuple, set, frozenset)
+
+
+def _plain_type(dtype) -> Optional[type]:
+    """dtype if values of exactly this type are kept as they are by `convert`"""
+    return dtype if type(dtype) == type else None  # pylint: disable=C0123
+
+
+def _same_type(values, dtype: type) -> bool:
+    return {*map(type, values)} <= {dtype}
+
+
+def _build_iterable(dtype, args: tuple, type_mappings, routing) -> Callable:
+    """Builder for list[X], set[X], frozenset[X], tuple[X, ...]"""
+    origin = get_origin(dtype)
+    converter = resolve_converter(args[0], type_mappings, routing)
+    plain = _plain_type(args[0])
+
+    def build_iterable(data):
+        if not isinstance(data, Iterable):
+            raise TypeError(f"Cannot convert from {type(data)} to : {dtype}")
+        if plain is not None and isinstance(data, _SIZED) and _same_type(data, plain):
+            return origin(data)  # copy, the elements already have the right type
+        return origin(map(converter, data))
+
+    return build_iterable
+
+
+def _build_tuple(dtype, args: tuple, type_mappings, routing) -> Callable:
+    """Builder for tuple[X, Y, ...], with a converter per position"""
+    converters = [resolve_converter(arg, type_mappings, routing) for arg in args]
+
+    def build_tuple(data):
+        if not isinstance(data, Iterable):
+            raise TypeError(f"Cannot convert from {type(data)} to : {dtype}")
+        values = data if isinstance(data, (list, tuple)) else list(data)
+        if len(values) != len(converters):
+            raise ValueError(f"Cannot convert {len(values)} elements to : {dtype}")
+        return tuple(converter(val) for converter, val in zip(converters, values))
+
+    return build_tuple
+
+
+def _build_dict(dtype, args: tuple, type_mappings, routing) -> Callable:
+    """Builder for dict[K, V], keys/values already of the right type are not converted"""
+    key_converter = resolve_converter(args[0], type_mappings, routing)
+    val_converter = resolve_converter(args[1], type_mappings, routing)
+    plain_key = _plain_type(args[0])
+    plain_val = _plain_type(args[1])
+
+    def build_dict(data):
+        if not isinstance(data, Mapping):
+            raise TypeError(f"Cannot convert from {type(data)} to : {dtype}")
+        same_keys = plain_key is not None and _same_type(data, plain_key)
+        if plain_val is not None and _same_type(data.values(), plain_val):
+            if same_keys:
+                return dict(data)
+            return {key_converter(key): val for key, val in data.items()}
+        if same_keys:
+            return {key: val_converter(val) for key, val in data.items()}
+        return {key_converter(key): val_converter(val) for key, val in data.items()}
+
+    return build_dict
+
+
+def _build_mapping(dtype, _args: tuple, type_mappings, routing) -> Callable:
+    """Builder for other Mapping generics, see `convert_mapping`"""
+
+    def build_mapping(data):
+        if not isinstance(data, Mapping):
+            raise TypeError(f"Cannot convert from {type(data)} to : {dtype}")
+        return convert_mapping(data, dtype, type_mappings, routing)
+
+    return build_mapping
+
+
+def _build_other_iterable(dtype, _args: tuple, type_mappings, routing) -> Callable:
+    """Builder for other Iterable generics, see `convert_iterable`"""
+
+    def build_iterable(data):
+        if not isinstance(data, Iterable):
+            raise TypeError(f"Cannot convert from {type(data)} to : {dtype}")
+        return convert_iterable(data, dtype, type_mappings, routing)
+
+    return build_iterable
+
+
+def _build_ndarray(dtype, _args: tuple, _type_mappings, _routing) -> Callable:
+    """Builder for numpy arrays, see `convert_ndarray`"""
+    return partial(convert_ndarray, dtype=dtype)
+
+
+def _is_homogeneous(origin, args: tuple) -> bool:
+    if origin is tuple:
+        return len(args) == 2 and args[1] is Ellipsis
+    return origin in _HOMOGENEOUS and len(args) == 1
+
+
+def _is_subclass(origin, base: type) -> bool:
+    return isinstance(origin, type) and issubclass(origin, base)
+
+
+# (matches(origin, args), builder(dtype, args, type_mappings, routing)), first match wins
+_GENERIC_BUILDERS: list[tuple[Callable[[Any, tuple], bool], Callable[..., Callable]]] = [
+    (lambda origin, args: np is not None and origin is np.ndarray, _build_ndarray),
+    (lambda origin, args: origin is dict and len(args) == 2, _build_dict),
+    (_is_homogeneous, _build_iterable),
+    (lambda origin, args: origin is tuple, _build_tuple),
+    (lambda origin, args: _is_subclass(origin, Mapping), _build_mapping),
+    (lambda origin, args: _is_subclass(origin, Iterable), _build_other_iterable),
+]
+
+
+def _resolve_generic_alias(dtype, type_mappings, routing) -> Callable:
+    """Resolve once the conversion done by `convert_generic_alias`.
+    Builtin containers get specialized builders, with the element conversions resolved once
+    """
+    if type_mappings and dtype in type_mappings:
+        return type_mappings[dtype]
+    origin = get_origin(dtype)
+    args = get_args(dtype)
+    for matches, build in _GENERIC_BUILDERS:
+        if matches(origin, args):
+            return build(dtype, args, type_mappings, routing)
+    return partial(convert_generic_alias, dtype=dtype, type_mappings=type_mappings, routing=routing)
+
+
+def is_special_form(dtype) -> bool:
+    """True for the annotations converted besides types and generic aliases:
+    unions (``Optional[int]``, ``int | str``), ``Literal[...]`` and `Enum` classes
+    """
+    if isinstance(dtype, type):
+        return issubclass(dtype, Enum)
+    return get_origin(dtype) in _UNION_TYPES or get_origin(dtype) is Literal
+
+
+def _build_enum(dtype: type[Enum]) -> Callable:
+    """Enum members are looked up by value, then by name"""
+
+    def convert_enum(data):
+        try:
+            return dtype(data)
+        except ValueError:
+            if isinstance(data, str) and data in dtype.__members__:
+                return dtype[data]
+            raise
+
+    return convert_enum
+
+
+def _build_union(dtype, type_mappings, routing) -> Callable:
+    """Union conversion: a member matching `type(data)` is picked in O(1),
+    otherwise the members conversions are tried in the declared order
+    """
+    members = get_args(dtype)
+    converters = [resolve_converter(member, type_mappings, routing) for member in members]
+    exact: dict[type, Callable] = {}
+    for member, converter in zip(members, converters):
+        if isinstance(member, type):
+            exact.setdefault(member, _identity)
+        elif isinstance(origin := get_origin(member), type):
+            exact.setdefault(origin, converter)  # eg: list for list[int]
+    trials = [conv for member, conv in zip(members, converters) if member is not type(None)]
+
+    def convert_union(data):
+        converter = exact.get(type(data))
+        if converter is _identity:
+            return data
+        if converter is not None:
+            try:
+                return converter(data)
+            except _CONVERSION_ERRORS:
+                pass
+        for converter in trials:
+            try:
+                return converter(data)
+            except _CONVERSION_ERRORS:
+                continue
+        raise ValueError(f"Cannot convert {data!r} to : {dtype}")
+
+    return convert_union
+
+
+def _build_literal(dtype, type_mappings) -> Callable:
+    """Literal conversion: data is converted to the types of the literal values
+    until it matches one of them
+    """
+    values = get_args(dtype)
+    allowed = {(type(val), val) for val in values}
+    value_types = dict.fromkeys(type(val) for val in values)
+    converters = [resolve_converter(value_type, type_mappings) for value_type in value_types]
+
+    def convert_literal(data):
+        try:
+            if (type(data), data) in allowed:
+                return data
+        except TypeError:  # unhashable data
+            pass
+        for converter in converters:
+            try:
+                val = converter(data)
+            except _CONVERSION_ERRORS:
+                continue
+            if (type(val), val) in allowed:
+                return val
+        raise ValueError(f"{data!r} is not one of the {dtype} values")
+
+    return convert_literal
+
+
+def _resolve_special_form(dtype, type_mappings, routing) -> Callable:
+    if type_mappings and dtype in type_mappings:
+        converter = type_mappings[dtype]
+        return _checked(dtype, converter) if isinstance(dtype, type) else converter
+    if isinstance(dtype, type):
+        return _checked(dtype, _build_enum(dtype))
+    if get_origin(dtype) is Literal:
+        return _build_literal(dtype, type_mappings)
+    return _build_union(dtype, type_mappings, routing)
+
+
+def _resolve(dtype, type_mappings, routing) -> Callable:
+    if dtype is None or dtype is _EMPTY:
+        return _identity  # no datatype was specified
+    if type(dtype) == type:  # pylint: disable=C0123
+        return _checked(dtype, _resolve_base_type(dtype, type_mappings, routing))
+    if type(dtype) == types.GenericAlias:  # pylint: disable=C0123
+        return _resolve_generic_alias(dtype, type_mappings, routing)
+    if is_special_form(dtype):
+        return _resolve_special_form(dtype, type_mappings, routing)
+    return partial(_unsupported, dtype)
+
+
+def cacheable_mappings(type_mappings) -> bool:
+    """True if conversions resolved for type_mappings can be cached.
+    That is the case for `Convertor` objects, which signal registrations
+    by incrementing their ``version``, but not for plain dictionaries.
+    """
+    return type_mappings is None or hasattr(type_mappings, "version")
+
+
+def _mappings_key(type_mappings) -> Hashable:
+    """Cache key of the content of type_mappings: the `Convertor` version,
+    or the entries of plain dictionaries, so that changing them invalidates the resolutions.
+    None when the resolutions can not be cached (eg: unhashable converters)
+    """
+    if cacheable_mappings(type_mappings):
+        return getattr(type_mappings, "version", 0)
+    try:
+        return frozenset(type_mappings.items())
+    except (AttributeError, TypeError):
+        return None
+
+
+def resolve_converter(
+    dtype: Any,
+    type_mappings: TypeConverterMap = None,
+    routing: Chart = None,
+) -> Callable[[Any], Any]:
+    """Resolve the conversion `convert` does for dtype into a specialized callable,
+    eg: a registered converter, ``__typecast__``, a routed typecast, a container builder.
+
+    Resolutions are cached per (dtype, type_mappings, routing), registering
+    a new converter in a `Convertor` invalidates the resolutions done with it.
+    Plain dictionaries are keyed by their entries, which costs a copy
+    of their items on each call but still avoids the resolution.
+
+    Parameters
+    ----------
+    dtype
+        Type to convert to
+    type_mappings, optional
+        predefined convertor map for certain data types
+    routing, optional
+        conversion routing for nested types, see `Chart`
+
+    Returns
+    -------
+        Callable converting a value to dtype
+    """
+    mappings_key = _mappings_key(type_mappings)
+    if mappings_key is None:
+        return _resolve(dtype, type_mappings, routing)
+    key = (dtype, id(type_mappings), mappings_key, id(routing))
+    try:
+        entry = _converter_cache.get(key)
+    except TypeError:  # unhashable annotation
+        return _resolve(dtype, type_mappings, routing)
+    if entry is not None and entry[0] is type_mappings and entry[1] is routing:
+        return entry[2]
+
+    converter = _resolve(dtype, type_mappings, routing)
+    with _cache_lock:
+        if len(_converter_cache) >= _CACHE_SIZE:
+            _converter_cache.pop(next(iter(_converter_cache)))
+        _converter_cache[key] = (type_mappings, routing, converter)
+    return converter
+
+
+def clear_converter_cache():
+    """Drop all the cached converter resolutions, see `resolve_converter`"""
+    with _cache_lock:
+        _converter_cache.clear()
+
+
 def convert(
     data: Any,
     dtype: Optional[type[T]],
@@ -197,18 +606,15 @@ def convert(
         Type to convert
     type_mappings, optional
         predefined convertor map for certain data types
+    routing, optional
+        conversion routing for nested types, see `Chart`
 
     Returns
     -------
         The converted datatype
     """
-    empty = inspect.Parameter.empty
-    if dtype is None or dtype is empty:
+    if dtype is None or dtype is _EMPTY:
         return data  # no datatype was specified
-    if type(dtype) == type:  # pylint: disable=C0123
-        if isinstance(data, dtype):
-            return data  # already the right type
-        return convert_base_type(data, dtype, type_mappings, routing)
-    if type(dtype) == types.GenericAlias:  # pylint: disable=C0123
-        return convert_generic_alias(data, dtype, type_mappings, routing)
-    raise ValueError(f"{type(dtype)}, {dtype}")
+    if type(dtype) == type and isinstance(data, dtype):  # pylint: disable=C0123
+        return data  # already the right type
+    return resolve_converter(dtype, type_mappings, routing)(data)
@@ -0,0 +1,244 @@
+"""
+Code generation backend for ingestion plans.
+
+Turns a resolved `Plan` into the source code of a straight-line python function
+(inline key lookups, inlined path traversal, direct calls of the converters
+resolved for each field and a direct call of the target) and compiles it with ``exec``.
+Prefixes shared by several paths are extracted only once.
+"""
+import inspect
+import linecache
+from typing import Any, Callable
+
+from .cast import cacheable_mappings, convert, resolve_converter
+from .routes import OP_KEY
+
+_EMPTY = inspect.Parameter.empty
+
+
+class _SourceWriter:
+    """Accumulates indented source lines and the namespace they reference"""
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+        self.namespace: dict[str, Any] = {}
+
+    def line(self, indent: int, code: str):
+        """Append a line of code at the given indentation level"""
+        self.lines.append("    " * indent + code)
+
+    def bind(self, name: str, value: Any) -> str:
+        """Make value available to the generated code under name"""
+        self.namespace[name] = value
+        return name
+
+    @property
+    def source(self) -> str:
+        """Generated source code"""
+        return "\n".join(self.lines) + "\n"
+
+
+def _is_inlineable(path) -> bool:
+    """Paths made only of plain keys can be traversed with inline lookups"""
+    if path.path == "":
+        return True
+    return all(opcode == OP_KEY for opcode, _ in path.program)
+
+
+def _keys(path) -> tuple[str, ...]:
+    return tuple(key for _, key in path.program if key != "")
+
+
+def _shared_prefixes(fields) -> dict[tuple[str, ...], str]:
+    """Key prefixes shared by the inlineable paths of at least two fields.
+    Each shared prefix is extracted once in a variable of the generated code.
+    """
+    counts: dict[tuple[str, ...], int] = {}
+    for field in fields:
+        if field.path is None or not _is_inlineable(field.path):
+            continue
+        keys = _keys(field.path)
+        for length in range(1, len(keys)):
+            counts[keys[:length]] = counts.get(keys[:length], 0) + 1
+    shared = [prefix for prefix, count in counts.items() if count > 1]
+    return {prefix: f"_n{idx}" for idx, prefix in enumerate(shared)}
+
+
+def _parent(keys: tuple[str, ...], prefixes: dict[tuple[str, ...], str]):
+    """Nearest shared prefix variable of keys and the keys remaining after it"""
+    for length in range(len(keys) - 1, 0, -1):
+        if keys[:length] in prefixes:
+            return prefixes[keys[:length]], keys[length:]
+    return "data", keys
+
+
+def _write_prefix(out: _SourceWriter, var: str, parent: str, key: str):
+    """Extract a shared prefix. When the prefix is missing or is a list
+    (requiring list projection) the prefix is set to `_fallback`,
+    and the fields under it use `Path.get`.
+    """
+    indent = 0
+    if parent != "data":
+        out.line(1, f"if {parent} is _fallback:")
+        out.line(2, f"{var} = _fallback")
+        out.line(1, "else:")
+        indent = 1
+    out.line(indent + 1, "try:")
+    out.line(indent + 2, f"{var} = {parent}[{key!r}]")
+    out.line(indent + 2, f"if isinstance({var}, _seq):")
+    out.line(indent + 3, f"{var} = _fallback")
+    out.line(indent + 1, "except KeyError:")
+    out.line(indent + 2, f"{var} = _fallback")
+
+
+def _write_traversal(
+    out: _SourceWriter,
+    idx: int,
+    field,
+    indent: int,
+    source: str,
+    keys: tuple[str, ...],
+    # pylint: disable=R0913
+):
+    """Inline `Path.extract` for a path containing only plain keys.
+
+    When an intermediate value is a list/tuple the list projection semantics
+    of the path are needed, so the generated code falls back to `Path.extract`.
+    """
+    path = field.path
+    var = f"_v{idx}"
+    if not keys:
+        out.line(indent, f"{var} = {source}")
+    for pos, key in enumerate(keys):
+        if pos == 0:
+            out.line(indent, f"{var} = {source}[{key!r}]")
+            continue
+        out.line(indent, f"if isinstance({var}, _seq):")
+        out.line(indent + 1, f"{var} = {out.bind(f'_p{idx}', path)}.extract(data)")
+        out.line(indent, "else:")
+        indent += 1
+        out.line(indent, f"{var} = {var}[{key!r}]")
+    if path.extractor is not None:
+        out.line(indent, f"{var} = {out.bind(f'_x{idx}', path.extractor)}({var})")
+
+
+def _write_missing(out: _SourceWriter, idx: int, field, indent: int):
+    if field.default is _EMPTY:
+        message = f"Missing parameter {field.name}"
+        out.line(indent, f"raise ValueError({message!r}) from None")
+    else:
+        out.line(indent, f"_v{idx} = {out.bind(f'_d{idx}', field.default)}")
+
+
+def _write_get(out: _SourceWriter, idx: int, field, indent: int, getter: str):
+    """Generic extraction with default, eg: `data.get`, `Path.get`"""
+    var = f"_v{idx}"
+    default = out.bind(f"_d{idx}", field.default)
+    if getter == "data":
+        out.line(indent, f"{var} = data.get({field.name!r}, {default})")
+    else:
+        out.line(indent, f"{var} = {out.bind(getter, field.path)}.get(data, {default})")
+    if field.default is _EMPTY:
+        out.line(indent, f"if {var} is _empty:")
+        _write_missing(out, idx, field, indent + 1)
+
+
+def _write_extraction(out: _SourceWriter, idx: int, field, prefixes):
+    path = field.path
+    if path is None:
+        _write_get(out, idx, field, 1, "data")
+        return
+    if not _is_inlineable(path):
+        _write_get(out, idx, field, 1, f"_p{idx}")
+        return
+    source, keys = _parent(_keys(path), prefixes)
+    indent = 1
+    if source != "data":
+        out.line(1, f"if {source} is _fallback:")
+        _write_get(out, idx, field, 2, f"_p{idx}")
+        out.line(1, "else:")
+        indent = 2
+    out.line(indent, "try:")
+    _write_traversal(out, idx, field, indent + 1, source, keys)
+    out.line(indent, "except KeyError:")
+    _write_missing(out, idx, field, indent + 1)
+
+
+def _write_conversion(out: _SourceWriter, idx: int, field, plan):
+    """Call the converter resolved for the field type (see `resolve_converter`).
+    Conversions for type mappings that can change unnoticed (plain dictionaries)
+    are resolved on each call by `convert`.
+    """
+    var = f"_v{idx}"
+    dtype = out.bind(f"_t{idx}", field.dtype)
+    if not cacheable_mappings(plan.type_mappings):
+        out.line(1, f"{var} = _convert({var}, {dtype}, _type_mappings, _routing)")
+        return
+    converter = out.bind(
+        f"_c{idx}", resolve_converter(field.dtype, plan.type_mappings, plan.routing)
+    )
+    if type(field.dtype) == type:  # pylint: disable=C0123
+        out.line(1, f"if not isinstance({var}, {dtype}):")
+        out.line(2, f"{var} = {converter}({var})")
+    else:
+        out.line(1, f"{var} = {converter}({var})")
+
+
+def generate_source(plan) -> tuple[str, dict[str, Any]]:
+    """Generate the source code of a specialized ingester for plan
+
+    Parameters
+    ----------
+    plan
+        Resolved ingestion `Plan`
+
+    Returns
+    -------
+        The source code of the ``ingest(data)`` function and
+        the namespace the code needs to be executed in
+    """
+    out = _SourceWriter()
+    out.namespace.update(
+        _target=plan.target,
+        _empty=_EMPTY,
+        _seq=(list, tuple),
+        _fallback=object(),
+        _type_mappings=plan.type_mappings,
+        _routing=plan.routing,
+        _convert=convert,
+        _interpret=plan.interpret,
+    )
+    out.line(0, "def ingest(data):")
+    out.line(1, "if isinstance(data, _seq):")
+    out.line(2, "return _interpret(data)")
+    prefixes = _shared_prefixes(plan.fields)
+    for prefix, var in prefixes.items():
+        parent, keys = _parent(prefix, prefixes)
+        _write_prefix(out, var, parent, keys[0])
+    for idx, field in enumerate(plan.fields):
+        _write_extraction(out, idx, field, prefixes)
+        if plan.convert_types and field.dtype is not None:
+            _write_conversion(out, idx, field, plan)
+
+    if plan.positional:
+        args = ", ".join(f"_v{idx}" for idx in range(len(plan.fields)))
+    else:
+        args = ", ".join(f"{field.name}=_v{idx}" for idx, field in enumerate(plan.fields))
+    out.line(1, f"return _target({args})")
+    return out.source, out.namespace
+
+
+def generate_ingester(plan) -> Callable:
+    """Compile a specialized ingester function for plan.
+
+    The generated source is available as the ``__source__`` attribute of the
+    returned function and is registered with `linecache` so tracebacks show it.
+    """
+    source, namespace = generate_source(plan)
+    filename = f"<dictgest ingest {plan.target.__qualname__} at {id(plan):#x}>"
+    exec(compile(source, filename, "exec"), namespace)  # pylint: disable=W0122
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+    ingest = namespace["ingest"]
+    ingest.__source__ = source
+    ingest.__qualname__ = f"ingest_{plan.target.__qualname__}"
+    return ingest
@@ -0,0 +1,432 @@
+"""
+Columnar engine for table ingestion.
+
+Instead of building a dictionary per table row and converting every value
+separately, the table columns are converted once per column using a
+type specialized batch converter, and the rows are then zipped into targets.
+When NumPy is installed it is used to accelerate numeric columns,
+and 2d numpy arrays can be used as tables.
+
+pandas DataFrames, pyarrow Tables/RecordBatches and numpy structured arrays
+are read column by column (see `frame_columns`), only the columns needed by the
+target are read, keeping their native dtypes.
+"""
+import inspect
+import sys
+from datetime import datetime
+from itertools import starmap
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+
+from .cast import TypeConverterMap, convert, resolve_converter
+from .routes import OP_KEY, Chart
+from .stats import IngestStats, timed, timed_call
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+_EMPTY = inspect.Parameter.empty
+_NUMERIC = {int, float}
+_COLUMN_TYPES: tuple[type, ...] = (list, tuple)
+if np is not None:
+    _COLUMN_TYPES += (np.ndarray,)
+
+
+def _numpy_column(values: Sequence, dtype: type, types: set) -> Optional[list]:
+    """Bulk convert a column of python numbers with NumPy.
+    Returns None when the column can not be converted without changing semantics.
+    """
+    if np is None or not types <= _NUMERIC:
+        return None
+    if dtype is float:
+        return np.asarray(values, dtype=np.float64).tolist()
+    if dtype is int and types == {float}:
+        arr = np.asarray(values, dtype=np.float64)
+        # int(val) raises for nan/inf and python ints are unbounded
+        if np.isfinite(arr).all() and np.abs(arr).max() < 2**62:
+            return arr.astype(np.int64).tolist()
+    return None
+
+
+def _ndarray_column(values, dtype: type) -> Optional[list]:
+    """Bulk convert a numpy array column to a list of python values.
+    Returns None when the column can not be converted without changing semantics.
+    """
+    kind = values.dtype.kind
+    if dtype is float and kind in "biuf":
+        return values.astype(np.float64).tolist()
+    if dtype is int and kind in "iu":
+        return values.tolist()
+    if dtype is int and kind == "b":
+        return values.astype(np.int64).tolist()
+    if dtype is int and kind == "f":
+        return _numpy_column(values, int, {float})
+    if (dtype is bool and kind == "b") or (dtype is str and kind == "U"):
+        return values.tolist()
+    return None
+
+
+def convert_column(
+    values: Sequence,
+    dtype: Optional[type],
+    type_mappings: TypeConverterMap = None,
+    routing: Chart = None,
+) -> list:
+    """Convert all the values of a column to dtype.
+
+    Equivalent to calling `convert` on each value, but the conversion
+    is resolved once for the whole column.
+
+    Parameters
+    ----------
+    values
+        Column values
+    dtype
+        Type to convert to
+    type_mappings, optional
+        predefined convertor map for certain data types
+    routing, optional
+        conversion routing for nested types, see `Chart`
+
+    Returns
+    -------
+        List of converted values
+    """
+    if dtype is None or dtype is _EMPTY:
+        return list(values)
+    if np is not None and isinstance(values, np.ndarray):
+        if type(dtype) == type and not (  # pylint: disable=C0123
+            type_mappings and dtype in type_mappings
+        ):
+            converted = _ndarray_column(values, dtype)
+            if converted is not None:
+                return converted
+        if values.dtype.kind == "M":
+            values = values.astype("datetime64[us]")  # type: ignore[assignment]
+        values = values.tolist()  # datetime64[us] values become datetime objects
+    converter = resolve_converter(dtype, type_mappings, routing)
+    if type(dtype) != type:  # pylint: disable=C0123
+        return list(map(converter, values))
+
+    types = set(map(type, values))
+    if types <= {dtype}:
+        return list(values)  # already the right type
+    if not (type_mappings and dtype in type_mappings):
+        converted = _numpy_column(values, dtype, types)
+        if converted is not None:
+            return converted
+    return [val if isinstance(val, dtype) else converter(val) for val in values]
+
+
+def _single_element_iterable(dtype) -> bool:
+    """True for generics like list[float], set[str] or tuple[int, ...]"""
+    origin = getattr(dtype, "__origin__", None)
+    args: tuple = getattr(dtype, "__args__", ())
+    if origin not in (list, set, frozenset, tuple):
+        return False
+    if origin is tuple:
+        return len(args) == 2 and args[1] is Ellipsis
+    return len(args) == 1
+
+
+def _column_key(field) -> Optional[str]:
+    """Name of the table column a field is read from,
+    None when the field path is not a single column lookup
+    """
+    if field.path is None:
+        return field.name
+    if len(field.path.program) == 1 and field.path.program[0][0] == OP_KEY:
+        return field.path.program[0][1]
+    return None
+
+
+def float_keys(plan) -> set[str]:
+    """Names of the table columns read by the float fields of plan,
+    whose missing values can be kept as NaN (see `frame_columns`)"""
+    floats = {_column_key(field) for field in plan.fields if field.dtype is float}
+    others = {_column_key(field) for field in plan.fields if field.dtype is not float}
+    return {key for key in floats - others if key is not None}
+
+
+def _item_convert(plan, field, val):
+    dtype = field.dtype
+    if _single_element_iterable(dtype) and isinstance(val, _COLUMN_TYPES):
+        return dtype.__origin__(
+            convert_column(val, dtype.__args__[0], plan.type_mappings, plan.routing)
+        )
+    return convert(val, dtype, plan.type_mappings, plan.routing)
+
+
+def column_item(plan, columns: dict[str, Sequence], stats: Optional[IngestStats] = None):
+    """Build a single target item from table columns (see `table_to_item`).
+
+    Fields of type list[X] (or set/tuple) are converted with `convert_column`.
+
+    Parameters
+    ----------
+    plan
+        Ingestion `Plan` of the target type
+    columns
+        Mapping between the column name and the column values
+    stats, optional
+        collector recording the counts and timings, see `IngestStats`
+    """
+    target_stats = stats.target(plan.target) if stats is not None else None
+    kwargs = {}
+    for field in plan.fields:
+        convert_field = plan.convert_types and field.dtype is not None
+        if target_stats is None:
+            val = field.extract(columns)
+            if convert_field:
+                val = _item_convert(plan, field, val)
+        else:
+            field_stats = target_stats.field(field.name)
+            field_stats.count += 1
+            val = timed(target_stats, field_stats, "extract", field.extract, columns)
+            if convert_field:
+                val = timed(target_stats, field_stats, "convert", _item_convert, plan, field, val)
+        kwargs[field.name] = val
+    if target_stats is None:
+        return plan.target(**kwargs)
+    return timed_call(target_stats, plan.target, **kwargs)
+
+
+def _column_values(field, columns: dict[str, Sequence], nrows: int) -> Sequence:
+    key = _column_key(field)
+    if key in columns:
+        values = columns[key]
+    elif field.default is _EMPTY:
+        raise ValueError(f"Missing parameter {field.name}")
+    else:
+        values = [field.default] * nrows
+    extractor = field.path.extractor if field.path is not None else None
+    if extractor is not None and key in columns:
+        values = [_extract(extractor, val, field.default) for val in values]
+        if field.default is _EMPTY and any(val is _EMPTY for val in values):
+            raise ValueError(f"Missing parameter {field.name}")
+    return values
+
+
+def _convert_values(plan, field, values: Sequence) -> list:
+    if plan.convert_types:
+        return convert_column(values, field.dtype, plan.type_mappings, plan.routing)
+    return list(values)
+
+
+def _field_column(plan, field, columns: dict[str, Sequence], nrows: int, target_stats) -> list:
+    if target_stats is None:
+        return _convert_values(plan, field, _column_values(field, columns, nrows))
+    field_stats = target_stats.field(field.name)
+    field_stats.count += nrows
+    values = timed(target_stats, field_stats, "extract", _column_values, field, columns, nrows)
+    return timed(target_stats, field_stats, "convert", _convert_values, plan, field, values)
+
+
+def _extract(extractor: Callable, val, default):
+    try:
+        return extractor(val)
+    except KeyError:
+        return default
+
+
+def supports_columns(plan) -> bool:
+    """True if every field of the plan can be read from a single table column"""
+    return all(_column_key(field) is not None for field in plan.fields)
+
+
+def converted_columns(plan, columns: dict[str, Sequence], nrows: int) -> list[list]:
+    """Converted values of each plan field, read from the table columns
+
+    Parameters
+    ----------
+    plan
+        Ingestion `Plan` of the target type, see `supports_columns`
+    columns
+        Mapping between the column name and the column values
+    nrows
+        number of table rows
+    """
+    if nrows == 0:
+        return [[] for _ in plan.fields]
+    return [_field_column(plan, field, columns, nrows, None) for field in plan.fields]
+
+
+def column_items(
+    plan, columns: dict[str, Sequence], nrows: int, stats: Optional[IngestStats] = None
+) -> Iterator:
+    """Build a target item for each table row, from the table columns
+    (see `table_to_items`). Each column is converted only once.
+
+    Parameters
+    ----------
+    plan
+        Ingestion `Plan` of the target type, see `supports_columns`
+    columns
+        Mapping between the column name and the column values
+    nrows
+        number of table rows
+    stats, optional
+        collector recording the counts and timings, see `IngestStats`
+    """
+    if nrows == 0:
+        return
+    target_stats = stats.target(plan.target) if stats is not None else None
+    converted = [
+        _field_column(plan, field, columns, nrows, target_stats) for field in plan.fields
+    ]
+    target = plan.target
+    if target_stats is not None:
+        names = [field.name for field in plan.fields]
+        for values in zip(*converted):
+            yield timed_call(target_stats, target, **dict(zip(names, values)))
+        return
+    if plan.positional:
+        yield from starmap(target, zip(*converted))
+        return
+    names = [field.name for field in plan.fields]
+    for values in zip(*converted):
+        yield target(**dict(zip(names, values)))
+
+
+def as_lists(columns: dict[str, Sequence]) -> dict[str, Sequence]:
+    """Convert columns to lists, numpy arrays are kept as they are"""
+    return {
+        key: column if np is not None and isinstance(column, np.ndarray) else list(column)
+        for key, column in columns.items()
+    }
+
+
+def _datetimes(values: Iterable) -> list:
+    """pandas Timestamp values as datetime objects (nanoseconds are dropped)"""
+    exact = (type(None), datetime)
+    return [val if type(val) in exact else val.to_pydatetime(warn=False) for val in values]
+
+
+def _arrow_column(column, types) -> Sequence:
+    kind = column.type
+    numeric = types.is_integer(kind) or types.is_floating(kind) or types.is_boolean(kind)
+    if numeric and column.null_count == 0:
+        return column.to_numpy(zero_copy_only=False)
+    # nulls would become nan with to_numpy and timestamps datetime64,
+    # python values (None, datetime) are used instead
+    if types.is_timestamp(kind):
+        return _datetimes(column.to_pylist())  # nanosecond columns give pandas Timestamps
+    return column.to_pylist()
+
+
+def _pandas_column(series, keep_nan: bool) -> Sequence:
+    if series.dtype.kind == "M":
+        # NaT values become None, as the missing values of other columns
+        return _datetimes(series.astype(object).where(series.notna(), None))
+    if not series.hasnans or (keep_nan and series.dtype.kind == "f"):
+        return series.to_numpy()
+    if isinstance(series.dtype, np.dtype):
+        # NaN values become None, as with pyarrow: int columns with
+        # missing values are float64 columns in pandas
+        return series.astype(object).where(series.notna(), None).to_numpy()
+    # extension dtypes (eg: Int64, string) missing values are pd.NA
+    return series.to_numpy(dtype=object, na_value=None)
+
+
+def _frame_names(data) -> Optional[tuple[list[str], Callable]]:
+    """Column names of a dataframe like source and the function reading a column"""
+    pandas = sys.modules.get("pandas")
+    if pandas is not None and isinstance(data, pandas.DataFrame):
+        names = [str(name) for name in data.columns]
+        return names, lambda idx, keep_nan: _pandas_column(data.iloc[:, idx], keep_nan)
+    pyarrow = sys.modules.get("pyarrow")
+    if pyarrow is not None and isinstance(data, (pyarrow.Table, pyarrow.RecordBatch)):
+        types = pyarrow.types
+        return list(data.schema.names), lambda idx, _: _arrow_column(data.column(idx), types)
+    if np is not None and isinstance(data, np.ndarray) and data.dtype.names:
+        names = list(data.dtype.names)
+        return names, lambda idx, _: data[names[idx]]
+    return None
+
+
+def frame_columns(
+    data,
+    header: Optional[Sequence[str]],
+    keys: Optional[Iterable[str]] = None,
+    nan_keys: Iterable[str] = (),
+) -> Optional[tuple[dict[str, Sequence], int]]:
+    """Columns of a pandas DataFrame, pyarrow Table/RecordBatch or numpy structured array.
+    Columns are returned as numpy arrays (or lists for columns with nulls), without copy
+    when possible. Missing values (null, NaN, NaT) are None.
+
+    Parameters
+    ----------
+    data
+        dataframe like table
+    header
+        column names to use instead of the ones of data, by default the names of data
+    keys, optional
+        names of the columns to read, by default all
+    nan_keys, optional
+        names of the pandas float columns whose NaN values are kept, see `float_keys`
+
+    Returns
+    -------
+        Mapping between the column names and the columns, and the number of rows.
+        None when data is not a dataframe like table
+    """
+    frame = _frame_names(data)
+    if frame is None:
+        return None
+    names, read_column = frame
+    if header is not None:
+        if len(header) != len(names):
+            raise ValueError(f"Header has {len(header)} elements while table {len(names)}")
+        names = list(header)
+    wanted = None if keys is None else set(keys)
+    nan_keys = set(nan_keys)
+    columns = {
+        name: read_column(idx, name in nan_keys)
+        for idx, name in enumerate(names)
+        if wanted is None or name in wanted
+    }
+    return columns, len(data)
+
+
+def table_columns(
+    data: Iterable[Sequence], header: Sequence[str], transpose: bool
+) -> tuple[dict[str, Sequence], int]:
+    """Split a 2d table into columns, checking it against the header.
+    The columns of a 2d numpy array are zero-copy views.
+
+    Returns
+    -------
+        Mapping between the header names and the columns, and the number of rows
+    """
+    if np is not None and isinstance(data, np.ndarray) and data.ndim == 2:
+        if transpose:
+            data = data.T
+        if data.shape[1] != len(header):
+            raise ValueError(
+                f"Header has {len(header)} elements while table {data.shape[1]}"
+            )
+        return {key: data[:, idx] for idx, key in enumerate(header)}, data.shape[0]
+    if transpose:
+        data = list(data)
+        if len(data) != len(header):
+            raise ValueError(
+                f"Header has {len(header)} elements while table {len(data)}"
+            )
+        columns = dict(zip(header, data))
+        nrows = len(data[0]) if data else 0
+        for idx, column in enumerate(data):
+            if len(column) != nrows:
+                raise ValueError(
+                    f"Table row[{idx}] has {len(column)} elements, expected {nrows}"
+                )
+        return columns, nrows
+
+    rows = list(data)
+    for row_idx, row in enumerate(rows):
+        if len(row) != len(header):
+            raise ValueError(
+                f"Header has {len(header)} elements while table row[{row_idx}] has {len(row)}"
+            )
+    columns = dict(zip(header, zip(*rows))) if rows else {}
+    return columns, len(rows)
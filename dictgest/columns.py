@@ -0,0 +1,205 @@
+"""
+Columnar (struct-of-arrays) ingestion results.
+
+With ``output="columns"`` the batch, table and stream APIs fill a `ColumnTable`,
+one list of converted values per target field, instead of instantiating the
+target for each record. Row views, target items, NumPy arrays and pandas
+DataFrames are built from the columns on demand.
+"""
+from itertools import islice
+from typing import Any, Iterable, Iterator, Optional, Sequence, Union
+from weakref import WeakKeyDictionary
+
+from .codegen import generate_ingester
+from .plan import Plan
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+try:
+    import pandas as pd  # type: ignore
+except ImportError:  # pragma: no cover
+    pd = None
+
+OUTPUTS = ("items", "columns")
+
+# records converted at a time before being split in columns
+_CHUNK_SIZE = 4096
+_NUMPY_TYPES = {int: "int64", float: "float64", bool: "bool"}
+
+_row_plans: "WeakKeyDictionary[Plan, Plan]" = WeakKeyDictionary()
+
+
+def check_output(output: str, **unsupported):
+    """Validate an output mode, raising ValueError when "columns"
+    is combined with one of the (set) unsupported options
+    """
+    if output not in OUTPUTS:
+        raise ValueError(f"Unknown output {output!r}, expected one of {OUTPUTS}")
+    if output == "columns":
+        for name, value in unsupported.items():
+            if value not in (None, False):
+                raise ValueError(f'output="columns" can not be used with {name}')
+
+
+def _values(*args, **kwargs) -> tuple:
+    return args + tuple(kwargs.values())
+
+
+def row_plan(plan: Plan) -> Plan:
+    """Plan with the same fields as plan, returning the tuple
+    of converted field values instead of a target item
+    """
+    rows = _row_plans.get(plan)
+    if rows is None:
+        rows = Plan(
+            _values,  # type: ignore
+            plan.fields,
+            plan.type_mappings,
+            plan.routing,
+            plan.convert_types,
+            plan.backend,
+        )
+        if plan.backend == "codegen":
+            rows.ingest = generate_ingester(rows)
+        _row_plans[plan] = rows
+    return rows
+
+
+class RowView:
+    """Read-only view of a `ColumnTable` row, the fields are read as attributes"""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "ColumnTable", index: int) -> None:
+        self._table = table
+        self._index = index
+
+    def __getattr__(self, name: str):
+        try:
+            return self._table.columns[name][self._index]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Field values of the row"""
+        return {name: column[self._index] for name, column in self._table.columns.items()}
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, RowView):
+            return self.as_dict() == other.as_dict()
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={val!r}" for name, val in self.as_dict().items())
+        return f"RowView({values})"
+
+
+class ColumnTable:
+    """Struct-of-arrays container of ingested records: a list of values per target field.
+
+    Examples
+    --------
+
+    >>> table = from_dicts(Article, records, output="columns")
+    >>> table["views"]            # column of converted values
+    >>> table[0].title            # row view
+    >>> table.item(0)             # Article instance
+    >>> table.to_pandas()
+    """
+
+    def __init__(
+        self,
+        target: type,
+        columns: dict[str, list],
+        dtypes: Optional[dict[str, Optional[type]]] = None,
+    ) -> None:
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+        self.target = target
+        self.columns = columns
+        self.dtypes = dtypes or {name: None for name in columns}
+
+    @classmethod
+    def from_rows(cls, plan: Plan, data: Iterable[dict]) -> "ColumnTable":
+        """Convert dictionaries into columns, following plan (without building target items)"""
+        ingest = row_plan(plan).ingest
+        columns: list[list] = [[] for _ in plan.fields]
+        data = iter(data)
+        while True:
+            rows = [ingest(item) for item in islice(data, _CHUNK_SIZE)]
+            if not rows:
+                break
+            for column, values in zip(columns, zip(*rows)):
+                column.extend(values)
+        return cls.from_plan(plan, columns)
+
+    @classmethod
+    def from_plan(cls, plan: Plan, columns: Sequence[list]) -> "ColumnTable":
+        """Table of the plan target, columns are given in the plan fields order"""
+        names = [field.name for field in plan.fields]
+        dtypes = {field.name: field.dtype for field in plan.fields}
+        return cls(plan.target, dict(zip(names, columns)), dtypes)
+
+    @property
+    def names(self) -> list[str]:
+        """Field names"""
+        return list(self.columns)
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()), ()))
+
+    def __getitem__(self, key: Union[int, str]):
+        """Row view for an integer index, column for a field name"""
+        if isinstance(key, str):
+            return self.columns[key]
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("ColumnTable index out of range")
+        return RowView(self, key)
+
+    def __iter__(self) -> Iterator[RowView]:
+        return (RowView(self, idx) for idx in range(len(self)))
+
+    def item(self, index: int):
+        """Target item of a row"""
+        return self.target(**self[index].as_dict())
+
+    def items(self) -> Iterator:
+        """Target items of all the rows, built on demand"""
+        target = self.target
+        names = self.names
+        for values in zip(*self.columns.values()):
+            yield target(**dict(zip(names, values)))
+
+    def to_numpy(self) -> dict[str, Any]:
+        """Columns as NumPy arrays. Fields annotated as int, float or bool
+        get the matching NumPy dtype, other fields (or columns with values
+        of other types, eg: None) are object arrays
+        """
+        if np is None:
+            raise ImportError("to_numpy requires numpy")
+        arrays = {}
+        for name, column in self.columns.items():
+            pytype = self.dtypes.get(name)
+            dtype = _NUMPY_TYPES.get(pytype, object)  # type: ignore
+            if dtype is not object and not {*map(type, column)} <= {pytype}:
+                dtype = object  # eg: None values, kept as they are
+            try:
+                arrays[name] = np.asarray(column, dtype=dtype)
+            except OverflowError:  # ints larger than int64
+                arrays[name] = np.asarray(column, dtype=object)
+        return arrays
+
+    def to_pandas(self):
+        """Columns as a pandas DataFrame, see `to_numpy` for the column dtypes"""
+        if pd is None:
+            raise ImportError("to_pandas requires pandas")
+        return pd.DataFrame(self.to_numpy(), columns=self.names)
+
+    def __repr__(self) -> str:
+        return f"ColumnTable({self.target.__qualname__}, rows={len(self)}, fields={self.names})"
@@ -1,6 +1,10 @@
+import re
+import threading
 from datetime import datetime
-from typing import Mapping, TypeVar
+from functools import lru_cache
+from typing import Callable, Mapping, Optional, TypeVar
 from dateutil import parser as date_parser
+from dateutil import tz as date_tz
 from dictgest.cast import TypeConvertor
 
 
@@ -11,10 +15,20 @@ class Convertor(Mapping):
     """
     Used to convert data to certain datatypes.
     Conversion mappings need to be registered using the `register` method
+
+    Registrations are copy-on-write: `register` replaces the `mappings` dictionary
+    instead of modifying it, so conversions running in other threads
+    never see a partially updated converter set.
+    Each registration increments `version`, see also `snapshot`.
     """
 
+    # shared by all instances, so that convertors can be pickled
+    _lock = threading.Lock()
+
     def __init__(self):
         self.mappings: dict[type, TypeConvertor] = {}
+        self.version = 0
+        self._snapshot: Optional[tuple[int, "Convertor"]] = None
 
     def register(self, dtype: type[T], converter: TypeConvertor[T]):
         """Registers a convertor for a data type
@@ -26,8 +40,21 @@ class Convertor(Mapping):
         converter
             Callable capable of converting data to dtype
         """
+        with self._lock:
+            self.mappings = {**self.mappings, dtype: converter}
+            self.version += 1
 
-        self.mappings[dtype] = converter
+    def snapshot(self) -> "Convertor":
+        """Convertor holding the current registrations,
+        unaffected by later `register` calls on this convertor.
+        The same snapshot is returned until a new converter is registered.
+        """
+        with self._lock:
+            if self._snapshot is None or self._snapshot[0] != self.version:
+                snapshot = Convertor()
+                snapshot.mappings = self.mappings
+                self._snapshot = (self.version, snapshot)
+            return self._snapshot[1]
 
     def __getitem__(self, key):
         return self.mappings[key]
@@ -69,6 +96,9 @@ def date_convertor(val) -> datetime:
     """Convert value to datetime.
     If the input is numeric it will be treated as unixtime.
     If the input is a string the format will be autodeduced
+
+    This was the default datetime converter before `DateConvertor`, it can be
+    restored with ``default_convertor.register(datetime, date_convertor)``
     """
     if isinstance(val, datetime):
         return val
@@ -81,7 +111,147 @@ def date_convertor(val) -> datetime:
     return date_parser.parse(val)
 
 
+# strings converted by `float`, treated as unix timestamps
+_NUMERIC = re.compile(r"\s*[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?\s*$")
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_SHAPE = str.maketrans("0123456789", "0000000000")
+
+
+def _dateutil_tz(result: datetime) -> datetime:
+    """result with the time zone dateutil gives to numeric offsets: tzutc or tzoffset"""
+    offset = result.utcoffset()
+    if offset is None:
+        return result
+    if not offset:
+        return result.replace(tzinfo=date_tz.UTC)
+    return result.replace(tzinfo=date_tz.tzoffset(None, offset))
+
+
+class DateConvertor:
+    """Convert values to datetime as `date_convertor`, faster.
+
+    - numeric values and strings are treated as unixtime
+    - ISO-8601 strings are parsed with `datetime.fromisoformat`, the time zones of
+      their offsets are the ones of dateutil (`tzutc`, `tzoffset`)
+    - other strings are parsed with dateutil. The first time a string shape
+      (the string with its digits masked, eg: ``00/00/0000``) is seen, a matching
+      `strptime` format is searched among `FORMATS`. The format is kept only if it gives
+      the same result as dateutil, and is used for the next strings of the same shape.
+      Day first numeric formats (eg: ``%d/%m/%Y``) are only trusted when the day is
+      larger than 12, dateutil reads the other strings month first.
+    - parsed strings are kept in an LRU cache
+
+    Formats are learned per convertor (`default_convertor` shares them between
+    all the fields), a string shape is parsed with at most one format.
+    Results only differ from `date_convertor` for UTC strings (eg: ``Z``) when the
+    local time zone is named UTC: dateutil gives them the `tzlocal` time zone,
+    `tzutc` is used instead.
+
+    Parameters
+    ----------
+    cache_size, optional
+        number of parsed strings to cache, 0 disables the cache
+    learn_formats, optional
+        if `strptime` formats should be learned for non ISO strings
+    """
+
+    FORMATS = (
+        "%Y-%m-%d %H:%M:%S",
+        "%Y-%m-%d %H:%M:%S.%f",
+        "%Y/%m/%d",
+        "%Y/%m/%d %H:%M:%S",
+        "%Y%m%dT%H%M%S",
+        "%m/%d/%Y",
+        "%m/%d/%Y %H:%M",
+        "%m/%d/%Y %H:%M:%S",
+        "%m/%d/%Y %I:%M %p",
+        "%m/%d/%Y %I:%M:%S %p",
+        "%d/%m/%Y",
+        "%d.%m.%Y",
+        "%d.%m.%Y %H:%M",
+        "%d.%m.%Y %H:%M:%S",
+        "%d-%b-%Y",
+        "%d %b %Y",
+        "%d %B %Y",
+        "%b %d %Y",
+        "%b %d, %Y",
+        "%B %d, %Y",
+        "%a, %d %b %Y %H:%M:%S %z",
+        "%a, %d %b %Y %H:%M:%S",
+        "%a %b %d %H:%M:%S %Y",
+    )
+    # numeric day before numeric month: ambiguous when the day could be a month
+    DAY_FIRST = frozenset(
+        fmt for fmt in FORMATS if "%m" in fmt and "%d" in fmt and fmt.index("%d") < fmt.index("%m")
+    )
+    # maximum number of string shapes for which formats are learned
+    MAX_SHAPES = 1024
+
+    def __init__(self, cache_size: int = 4096, learn_formats: bool = True) -> None:
+        self.cache_size = cache_size
+        self.learn_formats = learn_formats
+        # learned format per string shape, None if no format matches
+        self.formats: dict[str, Optional[str]] = {}
+        self._parse: Callable[[str], datetime] = self.parse
+        if cache_size:
+            self._parse = lru_cache(cache_size)(self.parse)
+
+    def __reduce__(self):
+        # caches are not shipped (eg: to worker processes)
+        return (DateConvertor, (self.cache_size, self.learn_formats))
+
+    def __call__(self, val) -> datetime:
+        if isinstance(val, datetime):
+            return val
+        if not isinstance(val, str):
+            return date_convertor(val)
+        if _NUMERIC.match(val):
+            return datetime.utcfromtimestamp(float(val))
+        return self._parse(val)
+
+    def parse(self, text: str) -> datetime:
+        """Parse a (non numeric) date string"""
+        if _ISO_DATE.match(text):
+            try:
+                return _dateutil_tz(datetime.fromisoformat(text))
+            except ValueError:
+                pass
+        try:
+            # numeric strings not matched by `_NUMERIC` (eg: 1_000)
+            return datetime.utcfromtimestamp(float(text))
+        except ValueError:
+            pass
+        if not self.learn_formats:
+            return date_parser.parse(text)
+        shape = text.translate(_SHAPE)
+        if shape in self.formats:
+            fmt = self.formats[shape]
+            if fmt is not None:
+                try:
+                    result = datetime.strptime(text, fmt)
+                except ValueError:
+                    pass
+                else:
+                    if result.day > 12 or fmt not in self.DAY_FIRST:
+                        return _dateutil_tz(result)
+            return date_parser.parse(text)
+        result = date_parser.parse(text)
+        if len(self.formats) < self.MAX_SHAPES:
+            self.formats[shape] = self._match_format(text, result)
+        return result
+
+    def _match_format(self, text: str, expected: datetime) -> Optional[str]:
+        for fmt in self.FORMATS:
+            try:
+                parsed = datetime.strptime(text, fmt)
+            except ValueError:
+                continue
+            if parsed == expected and (parsed.tzinfo is None) == (expected.tzinfo is None):
+                return fmt
+        return None
+
+
 default_convertor = Convertor()
 
-default_convertor.register(datetime, date_convertor)
+default_convertor.register(datetime, DateConvertor())
 default_convertor.register(bool, bool_converter)
@@ -0,0 +1,142 @@
+"""
+Error-tolerant batch ingestion.
+
+With ``from_dicts(..., errors="collect")`` a failing record does not abort the batch.
+Records are converted with the regular (fast) ingester, only the failing ones
+are ingested again field by field to find out which field failed, from which
+path and with which value. The batch result holds the converted items and
+a `RecordError` for each failed record.
+"""
+from typing import Any, Callable, Iterable, NamedTuple, Optional
+
+from .routes import Path
+
+ERROR_MODES = ("raise", "collect")
+
+
+class RecordError(NamedTuple):
+    """Failure of a single record of a batch"""
+
+    position: int
+    """position of the record in the batch"""
+    field: Optional[str]
+    """name of the failing target field, None when the target construction failed"""
+    path: Optional[str]
+    """path of the field in the record, None when the target construction failed"""
+    value: Any
+    """offending value, None when the field is missing. When the field path cannot be
+    followed, the value at the deepest path prefix found in the record (None if none)"""
+    exception: Exception
+    """raised exception"""
+
+    def __str__(self) -> str:
+        where = f"field {self.field!r} (path {self.path!r})" if self.field else "target"
+        return f"record[{self.position}] {where}: {type(self.exception).__name__}: {self.exception}"
+
+
+class IngestResult(NamedTuple):
+    """Result of an error-tolerant batch: the converted items and the record errors"""
+
+    items: list
+    errors: list[RecordError]
+
+
+class TooManyErrors(ValueError):
+    """Raised when a batch has more failing records than allowed.
+
+    The partial result (up to and including the failing record) is in `result`.
+    """
+
+    def __init__(self, result: IngestResult, max_errors: int) -> None:
+        super().__init__(
+            f"More than {max_errors} failing records, last error: {result.errors[-1]}"
+        )
+        self.result = result
+
+
+def _prefix_value(path: Optional[Path], data) -> Any:
+    """Value at the deepest prefix of path found in data (extractor excluded), None if none"""
+    if path is None:
+        return None
+    value = None
+    for size in range(1, len(path.parts) + 1):
+        prefix = Path("/".join(path.parts[:size]), flatten_en=path.flatten_en)
+        try:
+            value = prefix.extract(data)
+        except Exception:  # pylint: disable=W0703
+            break
+    return value
+
+
+def diagnose(plan, data, index: int, exception: Exception) -> RecordError:
+    """Find the failing field of a record that could not be ingested by plan.
+
+    The record is ingested again field by field, in the plan order.
+
+    Parameters
+    ----------
+    plan
+        Ingestion `Plan` of the target type
+    data
+        The failing record
+    index
+        position of the record in the batch
+    exception
+        exception raised while ingesting the record
+
+    Returns
+    -------
+        Error describing the failure
+    """
+    for field in plan.fields:
+        path = field.path.path if field.path is not None else field.name
+        try:
+            val = field.lookup(data)
+        except Exception as err:  # pylint: disable=W0703
+            return RecordError(index, field.name, path, _prefix_value(field.path, data), err)
+        try:
+            field.required(val)
+        except ValueError as missing:
+            return RecordError(index, field.name, path, None, missing)
+        try:
+            plan.convert_field(field, val)
+        except Exception as err:  # pylint: disable=W0703
+            return RecordError(index, field.name, path, val, err)
+    return RecordError(index, None, None, data, exception)
+
+
+def ingest_collect(
+    plan,
+    data: Iterable[dict],
+    max_errors: Optional[int] = None,
+    ingest: Optional[Callable] = None,
+) -> IngestResult:
+    """Ingest a batch of records, collecting the failures instead of raising.
+
+    Parameters
+    ----------
+    plan
+        Ingestion `Plan` of the target type
+    data
+        iterable of dictionaries to be converted
+    max_errors, optional
+        maximum number of failing records, `TooManyErrors` is raised
+        when it is exceeded. By default all the failures are collected
+    ingest, optional
+        ingester to use instead of ``plan.ingest``
+
+    Returns
+    -------
+        The converted items and the errors
+    """
+    ingest = ingest or plan.ingest
+    items = []
+    errors = []
+    for index, record in enumerate(data):
+        try:
+            items.append(ingest(record))
+        except Exception as err:  # pylint: disable=W0703
+            errors.append(diagnose(plan, record, index, err))
+            if max_errors is not None and len(errors) > max_errors:
+                raise TooManyErrors(IngestResult(items, errors), max_errors) from err
+    return IngestResult(items, errors)
@@ -0,0 +1,151 @@
+"""
+Lazy ingestion.
+
+`lazy_from_dict` returns a proxy of the target type instead of converting
+the whole dictionary upfront. Each field is extracted (`Path.extract`) and
+converted (`convert`) the first time it is read, and memoized on the instance.
+
+Proxies are instances of a generated subclass of the target, so ``isinstance``
+and the target methods and properties work as usual.
+The target ``__init__`` (and ``__post_init__``) is not called, missing fields
+and conversion errors are raised when the field is read.
+`materialize` builds a regular target instance from a proxy
+(eg: dataclass equality requires both instances to have the same class).
+"""
+from typing import Any, Iterable
+
+from .cast import TypeConverterMap
+from .converter import default_convertor
+from .plan import Plan, RoutingType, compile_plan
+
+# instance attribute holding the source dictionary of a proxy
+_DATA = "_dictgest_data"
+
+
+class _LazyField:
+    """Non data descriptor converting a field on first access.
+
+    The value is then stored in the instance ``__dict__``,
+    which takes precedence over the descriptor on the following reads.
+    """
+
+    __slots__ = ("plan", "field")
+
+    def __init__(self, plan, field) -> None:
+        self.plan = plan
+        self.field = field
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            # class attributes, eg: dataclass defaults
+            return getattr(self.plan.target, self.field.name, self)
+        val = self.plan.convert_field(self.field, self.field.extract(obj.__dict__[_DATA]))
+        obj.__dict__[self.field.name] = val
+        return val
+
+
+def _reduce(self):
+    # proxies are pickled as regular target instances
+    return (_ingest, (self.__dictgest_plan__, self.__dict__[_DATA]))
+
+
+def _ingest(plan, data: dict):
+    return plan(data)
+
+
+def lazy_class(plan) -> type:
+    """Proxy subclass of the plan target, generated once per plan
+
+    Parameters
+    ----------
+    plan
+        Ingestion `Plan` of the target type
+    """
+    if plan.lazy_type is not None:
+        return plan.lazy_type
+    target = plan.target
+    if not isinstance(target, type) or issubclass(target, tuple):
+        raise TypeError(f"Lazy ingestion is not supported for {target}")
+    namespace: dict[str, Any] = {
+        field.name: _LazyField(plan, field) for field in plan.fields
+    }
+    namespace["__dictgest_plan__"] = plan
+    namespace["__reduce__"] = _reduce
+    namespace["__module__"] = target.__module__
+    namespace["__qualname__"] = target.__qualname__
+    namespace["__doc__"] = target.__doc__
+    plan.lazy_type = type(target.__name__, (target,), namespace)
+    return plan.lazy_type
+
+
+def is_lazy(obj) -> bool:
+    """True if obj is a proxy created by `lazy_from_dict`"""
+    return _DATA in getattr(obj, "__dict__", ())
+
+
+def materialize(obj):
+    """Regular target instance with the values of a proxy, other objects are returned as is"""
+    if not is_lazy(obj):
+        return obj
+    plan = obj.__dictgest_plan__
+    return plan.target(**{field.name: getattr(obj, field.name) for field in plan.fields})
+
+
+def _proxy(cls: type, data: dict):
+    obj: Any = object.__new__(cls)
+    obj.__dict__[_DATA] = data
+    return obj
+
+
+def lazy_from_dict(
+    target: type,
+    data: dict,
+    type_mappings: TypeConverterMap = default_convertor,
+    routing: RoutingType = None,
+    convert_types: bool = True,
+) -> Any:
+    """Lazy equivalent of `from_dict`: returns a proxy of the target type
+    converting each field on first access, see the module documentation.
+
+    Parameters
+    ----------
+    target
+        Target conversion type
+    data
+        dictionary data to be converted to target type. It is referenced by the proxy,
+        changes made to it before a field is read are visible
+    type_mappings, optional
+        custom conversion mapping for datatypess, by default None
+    routing, optional
+        custom conversion routing for fieldnames, see `Route`
+    convert_types, optional
+        if target fields should be converted to typing hint types.
+
+    Returns
+    -------
+        Instance of a subclass of target
+    """
+    plan: Plan[Any] = compile_plan(
+        target, routing=routing, type_mappings=type_mappings, convert_types=convert_types
+    )
+    return _proxy(lazy_class(plan), data)
+
+
+def lazy_from_dicts(
+    target: type,
+    data: Iterable[dict],
+    type_mappings: TypeConverterMap = default_convertor,
+    routing: RoutingType = None,
+    convert_types: bool = True,
+) -> list:
+    """Batch equivalent of `lazy_from_dict`, the proxy class is resolved once
+
+    Returns
+    -------
+        List of proxies
+    """
+    plan: Plan[Any] = compile_plan(
+        target, routing=routing, type_mappings=type_mappings, convert_types=convert_types
+    )
+    cls = lazy_class(plan)
+    return [_proxy(cls, item) for item in data]
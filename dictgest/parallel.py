@@ -0,0 +1,194 @@
+"""
+Parallel batch ingestion.
+
+The records are split in chunks that are converted by a pool of workers.
+
+With worker processes, the ingestion plan (target, routing `Chart` and converter
+registrations) is pickled once and shipped to each worker when it starts,
+afterwards only the chunks of records and the converted items are sent between processes.
+
+Worker threads share the plan without any copy. They only run in parallel
+on free-threaded python builds (3.13t+), otherwise they are limited by the GIL.
+"""
+import pickle
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from functools import partial
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+
+# state of the worker process: the plan ingester, set by `_init_worker`
+_WORKER: dict[str, Callable] = {}
+
+# number of chunks submitted ahead for each worker
+_PREFETCH = 2
+
+_PICKLE_ERRORS = (pickle.PicklingError, AttributeError, TypeError)
+
+EXECUTORS = ("process", "thread")
+
+
+def _init_worker(payload: bytes):
+    _WORKER["ingest"] = pickle.loads(payload).ingest
+
+
+def _convert_chunk(ingest: Callable, chunk: list) -> list:
+    return [ingest(item) for item in chunk]
+
+
+def _ingest_chunk(chunk: list) -> list:
+    return _convert_chunk(_WORKER["ingest"], chunk)
+
+
+def _picklable(obj) -> bool:
+    try:
+        pickle.dumps(obj)
+    except _PICKLE_ERRORS:
+        return False
+    return True
+
+
+def _plan_parts(plan) -> Iterator[tuple[str, object]]:
+    """Description and value of the plan parts that need to be pickled"""
+    yield "target type", plan.target
+    for field in plan.fields:
+        if field.path is not None:
+            yield f"Path extractor of field {field.name!r}", field.path.extractor
+    if plan.routing is not None:
+        for dtype, route in plan.routing.routes.items():
+            for name, path in route.mapping.items():
+                yield f"Path extractor of {dtype.__qualname__}.{name} route", path.extractor
+    if plan.type_mappings:
+        for dtype in plan.type_mappings:
+            yield f"converter registered for {dtype!r}", plan.type_mappings[dtype]
+
+
+def dump_plan(plan) -> bytes:
+    """Pickle a plan in order to ship it to worker processes.
+
+    Raises
+    ------
+    TypeError
+        If a part of the plan can not be pickled (eg: a lambda used as `Path` extractor),
+        naming the offending part
+    """
+    try:
+        return pickle.dumps(plan)
+    except _PICKLE_ERRORS as err:
+        for name, part in _plan_parts(plan):
+            if not _picklable(part):
+                raise TypeError(
+                    f"Unable to ship the ingestion plan of {plan.target.__qualname__} "
+                    f"to worker processes, the {name} ({part!r}) can not be pickled. "
+                    "Lambdas and locally defined functions/classes are not supported, "
+                    "use module level definitions instead"
+                ) from err
+        raise
+
+
+def chunked(data: Iterable, size: int) -> Iterator[list]:
+    """Split an iterable in lists of (at most) size elements"""
+    if size < 1:
+        raise ValueError(f"Chunk size must be at least 1, got {size}")
+    iterator = iter(data)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _ordered(pool: Executor, func: Callable, chunks: Iterator, window: int):
+    pending: deque[Future] = deque()
+    for chunk in chunks:
+        pending.append(pool.submit(func, chunk))
+        if len(pending) >= window:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+
+def _unordered(pool: Executor, func: Callable, chunks: Iterator, window: int):
+    pending: set[Future] = set()
+    for chunk in chunks:
+        pending.add(pool.submit(func, chunk))
+        if len(pending) >= window:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+    for future in _as_completed(pending):
+        yield from future.result()
+
+
+def _as_completed(pending: set[Future]) -> Iterator[Future]:
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        yield from done
+
+
+def ingest_parallel(
+    plan,
+    data: Iterable[dict],
+    workers: int,
+    chunksize: int = 1000,
+    ordered: bool = True,
+    executor: str = "process",
+    # pylint: disable=R0913
+) -> Iterator:
+    """Convert dictionaries with a plan, using a pool of worker processes or threads.
+
+    At most ``2 * workers`` chunks are in flight at a time,
+    so data can be an arbitrarily large iterable.
+
+    Parameters
+    ----------
+    plan
+        Ingestion `Plan` of the target type
+    data
+        iterable of dictionaries to be converted
+    workers
+        number of workers
+    chunksize, optional
+        number of dictionaries sent to a worker at a time
+    ordered, optional
+        if True the items are yielded in the order of data,
+        otherwise chunks are yielded as soon as they are converted
+    executor, optional
+        "process" (default) or "thread"
+
+    Returns
+    -------
+        Generator of the converted items
+    """
+    # validation happens eagerly, before the first item is requested
+    if workers < 1:
+        raise ValueError(f"Number of workers must be at least 1, got {workers}")
+    if chunksize < 1:
+        raise ValueError(f"Chunk size must be at least 1, got {chunksize}")
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor {executor!r}, expecting one of {EXECUTORS}")
+    make_pool: Callable[[], Executor]
+    func: Callable[[list], list]
+    if executor == "thread":
+        make_pool = partial(ThreadPoolExecutor, workers)
+        func = partial(_convert_chunk, plan.ingest)
+    else:
+        payload = dump_plan(plan)
+        make_pool = partial(
+            ProcessPoolExecutor, workers, initializer=_init_worker, initargs=(payload,)
+        )
+        func = _ingest_chunk
+    return _run(make_pool, func, chunked(data, chunksize), _PREFETCH * workers, ordered)
+
+
+def _run(make_pool: Callable, func: Callable, chunks: Iterator, window: int, ordered: bool):
+    run = _ordered if ordered else _unordered
+    pool = make_pool()
+    try:
+        yield from run(pool, func, chunks, window)
+    finally:
+        pool.shutdown(cancel_futures=True)
@@ -0,0 +1,415 @@
+"""
+Compiled ingestion plans.
+
+A plan holds everything `from_dict` needs to know about a target type
+(signature, annotations, paths, routing) resolved once, so that ingesting
+many dictionaries into the same type does not redo the reflection work.
+"""
+import inspect
+import threading
+from typing import (  # type: ignore
+    Any,
+    Callable,
+    Generic,
+    Hashable,
+    Mapping,
+    Optional,
+    TypeVar,
+    Union,
+    types,
+    _AnnotatedAlias,
+)
+
+from dictgest.routes import Chart, Path, Route
+
+from .cast import TypeConverterMap, convert, is_special_form
+from .codegen import generate_ingester
+from .converter import default_convertor
+from .trie import PathTrie
+
+T = TypeVar("T")
+
+RoutingType = Union[Route, dict[type, Route], Chart, None]
+
+BACKENDS = ("interpreter", "codegen")
+
+_EMPTY = inspect.Parameter.empty
+_CACHE_SIZE = 1024
+_plan_cache: dict[Hashable, "Plan"] = {}
+_cache_lock = threading.Lock()
+
+
+def _get_dtype_from_anot(anot) -> Optional[type]:
+    dtype: Optional[type] = None
+    if type(anot) in [type, types.GenericAlias] or is_special_form(anot):
+        dtype = anot
+    elif type(anot) == _AnnotatedAlias:  # pylint: disable=C0123
+        dtype = anot.__origin__
+    if dtype is _EMPTY:
+        dtype = None
+    return dtype
+
+
+def _get_path_from_anot(anot):
+    _path = None
+    if hasattr(anot, "__metadata__"):
+        for meta in anot.__metadata__:
+            if isinstance(meta, Path):
+                _path = meta
+                break
+    return _path
+
+
+def _get_route_path(anot, name: str, route_template: Optional[Route]):
+    anot_path = _get_path_from_anot(anot)
+    template_path = route_template[name] if route_template else None
+
+    if anot_path and template_path:
+        raise ValueError(
+            f"For field {name}, the path was found in both the template and destination path"
+        )
+
+    return template_path or anot_path
+
+
+def _construct_routing(dtype: type, routing: RoutingType) -> Optional[Chart]:
+    chart = None
+    if routing:
+        if isinstance(routing, Chart):
+            chart = routing
+        elif isinstance(routing, Route):
+            chart = Chart({dtype: routing})
+        else:
+            chart = Chart(routing)
+        chart.typecast = routed_typecast
+    return chart
+
+
+def nested_ingester(
+    target: type, type_mappings: TypeConverterMap = None, routing: Optional[Chart] = None
+) -> Callable[[dict], Any]:
+    """Ingester of a nested (typecast or routed) type, calling its plan ingester directly.
+    The plan is compiled on first use, so that self referencing types can be resolved.
+    """
+    ingest: Optional[Callable] = None
+
+    def ingest_nested(data):
+        nonlocal ingest
+        if ingest is None:
+            ingest = compile_plan(
+                target, routing=routing, type_mappings=type_mappings, backend="codegen"
+            ).ingest
+        return ingest(data)
+
+    return ingest_nested
+
+
+class TypecastPlan:
+    """``__typecast__`` of the classes decorated with `typecast`.
+
+    Calling it is equivalent to `from_dict`, while `resolve` lets `resolve_converter`
+    compose the plan of the class into the plans of the types containing it.
+    """
+
+    __slots__ = ("target",)
+
+    def __init__(self, target: type) -> None:
+        self.target = target
+
+    def __call__(
+        self,
+        data: dict,
+        type_mappings: TypeConverterMap = default_convertor,
+        routing: RoutingType = None,
+    ):
+        return compile_plan(self.target, routing=routing, type_mappings=type_mappings)(data)
+
+    def resolve(self, type_mappings: TypeConverterMap, routing: Optional[Chart]) -> Callable:
+        """Converter of dictionaries to the class, see `nested_ingester`"""
+        return nested_ingester(self.target, type_mappings, routing)
+
+    def __reduce__(self):
+        return (TypecastPlan, (self.target,))
+
+
+class RoutedTypecast:
+    """Typecast used by `Chart` objects for nested routed types"""
+
+    def __call__(
+        self,
+        dtype: type,
+        data: dict,
+        type_mappings: TypeConverterMap = None,
+        routing: Optional[Chart] = None,
+    ):
+        return compile_plan(dtype, routing=routing, type_mappings=type_mappings)(data)
+
+    @staticmethod
+    def resolve(dtype: type, type_mappings: TypeConverterMap, routing: Optional[Chart]):
+        """Converter of dictionaries to dtype, see `nested_ingester`"""
+        return nested_ingester(dtype, type_mappings, routing)
+
+
+routed_typecast = RoutedTypecast()
+
+
+class FieldPlan:
+    """Pre-resolved ingestion information for a single target field"""
+
+    __slots__ = ("name", "dtype", "path", "default", "kind", "slot")
+
+    def __init__(
+        self,
+        name: str,
+        dtype: Optional[type],
+        path: Optional[Path],
+        default: Any,
+        kind=inspect.Parameter.POSITIONAL_OR_KEYWORD,
+        # pylint: disable=R0913
+    ) -> None:
+        self.name = name
+        self.dtype = dtype
+        self.path = path
+        self.default = default
+        self.kind = kind
+        # index of the path in the plan `PathTrie`, -1 when the plan has no trie
+        self.slot = -1
+
+    def lookup(self, data: dict) -> Any:
+        """Value of the field in data, its default (possibly `inspect.Parameter.empty`)
+        when it is absent"""
+        if self.path is not None:
+            return self.path.get(data, self.default)
+        return data.get(self.name, self.default)
+
+    def required(self, val: Any) -> Any:
+        """Returns val, raises ValueError when it is a missing value without default"""
+        if val is _EMPTY:
+            raise ValueError(f"Missing parameter {self.name}")
+        return val
+
+    def extract(self, data: dict) -> Any:
+        """Value of the field in data or its default, see `lookup` and `required`"""
+        return self.required(self.lookup(data))
+
+    def __repr__(self) -> str:
+        path = self.path.path if self.path else self.name
+        return f"FieldPlan({self.name!r}, dtype={self.dtype!r}, path={path!r})"
+
+
+class Plan(Generic[T]):
+    """Reusable ingester for a target type.
+
+    Created by `compile_plan`. Calling the plan with a dictionary
+    is equivalent to calling `from_dict` with the options the plan was compiled with.
+
+    The actual work is done by the `ingest` attribute: by default `interpret`,
+    which loops generically over the fields, or a code generated function
+    when the plan was compiled with ``backend="codegen"`` (see `source`).
+
+    When several field paths share a prefix, they are extracted
+    together using a `PathTrie`, walking each shared prefix only once.
+    """
+
+    # pylint: disable=R0902
+
+    def __init__(
+        self,
+        target: type[T],
+        fields: list[FieldPlan],
+        type_mappings: Optional[TypeConverterMap] = default_convertor,
+        routing: Optional[Chart] = None,
+        convert_types: bool = True,
+        backend: str = "interpreter",
+        # pylint: disable=R0913
+    ) -> None:
+        self.target = target
+        self.fields = fields
+        self.type_mappings = type_mappings
+        self.routing = routing
+        self.convert_types = convert_types
+        self.backend = backend
+        self.trie: Optional[PathTrie] = None
+        paths = [field.path for field in fields if field.path is not None]
+        trie = PathTrie(paths)
+        if trie.shares_prefixes:
+            self.trie = trie
+            for slot, field in enumerate(f for f in fields if f.path is not None):
+                field.slot = slot
+        self.ingest: Callable[[dict], T] = self.interpret
+        # proxy subclass of the target, see `dictgest.lazy.lazy_class`
+        self.lazy_type: Optional[type] = None
+
+    def __call__(self, data: dict) -> T:
+        return self.ingest(data)
+
+    @property
+    def source(self) -> Optional[str]:
+        """Source code of the generated ingester, None for interpreted plans"""
+        return getattr(self.ingest, "__source__", None)
+
+    def interpret(self, data: dict) -> T:
+        """Generic ingestion of data, looping over the plan fields"""
+        type_mappings = self.type_mappings
+        routing = self.routing
+        values = None
+        if self.trie is not None:
+            try:
+                values = self.trie.extract(data, _EMPTY)
+            except Exception:  # pylint: disable=W0703
+                # the paths are extracted one by one instead, raising the error
+                # of the first failing field (eg: missing) as without the trie
+                values = None
+        kwargs = {}
+        for field in self.fields:
+            name = field.name
+            if field.path is None:
+                val = data.get(name, field.default)
+            elif values is not None and field.slot >= 0:
+                val = values[field.slot]
+                if val is _EMPTY:
+                    val = field.default
+            else:
+                val = field.path.get(data, field.default)
+            if val is _EMPTY:
+                raise ValueError(f"Missing parameter {name}")
+            if field.dtype is not None and self.convert_types:
+                val = convert(val, field.dtype, type_mappings, routing)
+            kwargs[name] = val
+        return self.target(**kwargs)  # type: ignore
+
+    def convert_field(self, field: FieldPlan, val: Any) -> Any:
+        """Convert an extracted value to the field type, when types are converted"""
+        if self.convert_types and field.dtype is not None:
+            return convert(val, field.dtype, self.type_mappings, self.routing)
+        return val
+
+    @property
+    def positional(self) -> bool:
+        """True if the target can be called with the field values as positional arguments"""
+        return all(
+            field.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD for field in self.fields
+        )
+
+    def __reduce__(self):
+        # generated code and bound methods can not be pickled,
+        # plans are rebuilt from their compile arguments instead
+        return (
+            build_plan,
+            (self.target, self.routing, self.type_mappings, self.convert_types, self.backend),
+        )
+
+    def __repr__(self) -> str:
+        return f"Plan({self.target.__qualname__}, fields={self.fields!r})"
+
+
+def build_plan(
+    target: type[T],
+    routing: RoutingType = None,
+    type_mappings: Optional[TypeConverterMap] = default_convertor,
+    convert_types: bool = True,
+    backend: str = "interpreter",
+) -> Plan[T]:
+    """Resolve the ingestion plan of target, bypassing the plan cache.
+    See `compile_plan` for details.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expecting one of {BACKENDS}")
+    chart = _construct_routing(target, routing)
+    router = chart[target] if chart and target in chart else None
+
+    fields = []
+    for name, prop in inspect.signature(target).parameters.items():
+        anot = prop.annotation
+        fields.append(
+            FieldPlan(
+                name,
+                _get_dtype_from_anot(anot),
+                _get_route_path(anot, name, router),
+                prop.default,
+                prop.kind,
+            )
+        )
+    plan = Plan(target, fields, type_mappings, chart, bool(convert_types), backend)
+    if backend == "codegen":
+        plan.ingest = generate_ingester(plan)
+    return plan
+
+
+def _routing_key(routing: RoutingType) -> Hashable:
+    if isinstance(routing, Mapping):
+        return frozenset(routing.items())
+    return routing
+
+
+def compile_plan(
+    target: type[T],
+    routing: RoutingType = None,
+    type_mappings: Optional[TypeConverterMap] = default_convertor,
+    convert_types: bool = True,
+    backend: str = "interpreter",
+) -> Plan[T]:
+    """Compile a reusable ingester for the target type.
+
+    The signature, annotations and routing of the target are resolved once.
+    Plans are cached per (target, routing, type_mappings), so calling `compile_plan`
+    repeatedly with the same arguments returns the same plan.
+    The cache can be used concurrently from several threads.
+    Registering a new converter in type_mappings (see `Convertor.register`)
+    invalidates the plans compiled with it, codegen plans compiled before
+    keep using the converters resolved at compile time.
+
+    Examples
+    --------
+
+    >>> ingest = compile_plan(Article, routing=article_route)
+    >>> articles = [ingest(record) for record in records]
+
+    Parameters
+    ----------
+    target
+        Target conversion type
+    routing, optional
+        custom conversion routing for fieldnames, see `Route`
+    type_mappings, optional
+        custom conversion mapping for datatypes
+    convert_types, optional
+        if target fields should be converted to typing hint types.
+    backend, optional
+        "interpreter" (default) or "codegen". The codegen backend
+        generates and compiles a specialized python function for the target,
+        its source can be inspected with `Plan.source`
+
+    Returns
+    -------
+        Callable plan converting a dictionary to the target type
+    """
+    key = (
+        target,
+        _routing_key(routing),
+        id(type_mappings),
+        getattr(type_mappings, "version", None),
+        bool(convert_types),
+        backend,
+    )
+    plan = _plan_cache.get(key)
+    if plan is not None and plan.type_mappings is type_mappings:
+        return plan
+
+    # plans are built outside of the lock, concurrent builds of the same plan
+    # are harmless and the first one stored is returned to every caller
+    plan = build_plan(target, routing, type_mappings, convert_types, backend)
+    with _cache_lock:
+        cached = _plan_cache.get(key)
+        if cached is not None and cached.type_mappings is type_mappings:
+            return cached
+        if len(_plan_cache) >= _CACHE_SIZE:
+            _plan_cache.pop(next(iter(_plan_cache)))
+        _plan_cache[key] = plan
+    return plan
+
+
+def clear_cache():
+    """Drop all cached plans"""
+    with _cache_lock:
+        _plan_cache.clear()
@@ -3,6 +3,58 @@ from typing import Any, Callable, Iterable, Mapping, Optional, Union
 
 from dictgest.utils import flatten
 
+# Path traversal opcodes, see `compile_path`
+OP_KEY = 0
+OP_SKIP = 1
+OP_WILDCARD = 2
+
+Opcode = tuple[int, Any]
+
+
+def _parse_wildcard(part: str) -> Union[tuple[str, str], str, None]:
+    """Parse the `{name=val}` filter of a wildcard part.
+    Returns None for wildcards without a filter and the
+    unparsed part for invalid filters
+    """
+    if "{" not in part:
+        return None
+    condition = part.split("{", 1)[1].split("}", 1)[0].split("=")
+    if len(condition) != 2:
+        return part
+    name, val = condition
+    return name, val
+
+
+def compile_path(parts: list[str]) -> tuple[Opcode, ...]:
+    """Compile the parts of a path into a sequence of typed opcodes:
+
+    - ``(OP_KEY, key)``: dictionary key lookup, or a list projection
+      (followed by flattening) if the data is a list
+    - ``(OP_SKIP, "")``: empty part, only projects lists
+    - ``(OP_WILDCARD, condition)``: list wildcard with a pre-parsed
+      ``(name, val)`` filter (None when no filter is used)
+    """
+    program: list[Opcode] = []
+    for part in parts:
+        if part.startswith("*"):
+            program.append((OP_WILDCARD, _parse_wildcard(part)))
+        elif part == "":
+            program.append((OP_SKIP, part))
+        else:
+            program.append((OP_KEY, part))
+    return tuple(program)
+
+
+def _wildcard_extract(data: Iterable, condition) -> Iterable:
+    if not isinstance(data, (list, tuple)):
+        raise TypeError()
+    if condition is None:
+        return data
+    if isinstance(condition, str):
+        raise ValueError(f"Invalid wildcard filter {condition}, expecting *{{name=val}}")
+    name, val = condition
+    return [el for el in data if name in el and str(el[name]) == val]
+
 
 class Path:
     """Data type annotation for class attributes that can signal:
@@ -51,15 +103,7 @@ class Path:
         self.parts = path.split("/")
         self.extractor = extractor
         self.flatten_en = flatten_en
-
-    @staticmethod
-    def _wildcard_extract(data: Iterable, part: str):
-        if not isinstance(data, (list, tuple)):
-            raise TypeError()
-        if "{" in part:
-            name, val = part.split("{", 1)[1].split("}", 1)[0].split("=")
-            data = [el for el in data if name in el and str(el[name]) == val]
-        return data
+        self.program = compile_path(self.parts)
 
     def _iterable_extract(self, data: Iterable, part: str) -> list:
         data = [o[part] for o in data if part in o]
@@ -80,18 +124,20 @@ class Path:
             Extracted value
 
         """
-        for part in self.parts:
-
-            if part.startswith("*"):
-                data = Path._wildcard_extract(data, part)
-            elif isinstance(data, (list, tuple)):
-                data = self._iterable_extract(data, part)
-
-            elif part != "":
-                data = data[part]
+        value: Any = data
+        for opcode, arg in self.program:
+            if opcode == OP_KEY:
+                if isinstance(value, (list, tuple)):
+                    value = self._iterable_extract(value, arg)
+                else:
+                    value = value[arg]
+            elif opcode == OP_WILDCARD:
+                value = _wildcard_extract(value, arg)
+            elif isinstance(value, (list, tuple)):
+                value = self._iterable_extract(value, arg)
         if self.extractor is not None:
-            data = self.extractor(data)
-        return data
+            value = self.extractor(value)
+        return value
 
     def get(self, data: dict, default):
         """`extract` with default value in case of failure"""
@@ -1,21 +1,46 @@
+import dataclasses
 import inspect
-from typing import (  # type: ignore
-    Iterable,
-    Optional,
-    TypeVar,
-    Union,
-    types,
-    _AnnotatedAlias,
-)  # type: ignore
+import weakref
+from collections import namedtuple
+from typing import Iterable, Iterator, Optional, Sequence, TypeVar, Union
 from functools import partial
 
-from dictgest.routes import Chart, Path, Route
-
-from .cast import TypeConverterMap, convert
-from .converter import default_convertor
+from dictgest.routes import Chart, Route
+
+from .accumulate import TableAccumulator
+from .cast import TypeConverterMap, clear_converter_cache
+from .columnar import (
+    as_lists,
+    column_item,
+    column_items,
+    converted_columns,
+    float_keys,
+    frame_columns,
+    supports_columns,
+    table_columns,
+)
+from .columns import ColumnTable, check_output
+from .converter import Convertor, default_convertor
+from .errors import ERROR_MODES, IngestResult, ingest_collect
+from .parallel import chunked, ingest_parallel
+from .plan import TypecastPlan, compile_plan
+from .stats import IngestStats, instrument
+from .sources import TableStream, is_cursor, read_cursor
+from .stream import root_keys
 
 T = TypeVar("T", bound=type)
 
+COMPACT_KINDS = ("slots", "tuple")
+
+# class attributes not copied to compact classes
+_INSTANCE_ATTRS = ("__dict__", "__weakref__")
+# attribute of the original class holding its compact variant of each kind
+_COMPACT_ATTRS = {"slots": "Compact", "tuple": "CompactTuple"}
+# classes created by `compact`, other values of the attributes above are not overwritten
+_COMPACT_CLASSES: "weakref.WeakSet[type]" = weakref.WeakSet()
+# methods of the original class that do not apply to tuple based instances
+_TUPLE_EXCLUDED = ("__init__", "__post_init__", "__setattr__", "__delattr__")
+
 
 def typecast(cls):
     """
@@ -39,54 +64,118 @@ def typecast(cls):
     -------
         The decorated class
     """
-    cls.__typecast__ = partial(from_dict, cls)
+    cls.__typecast__ = TypecastPlan(cls)
+    # conversions to cls resolved before it was decorated are stale
+    clear_converter_cache()
     return cls
 
 
-def _get_dtype_from_anot(anot) -> Optional[type]:
-    dtype: Optional[type] = None
-    if type(anot) in [type, types.GenericAlias]:
-        dtype = anot
-    elif type(anot) == _AnnotatedAlias:
-        dtype = anot.__origin__
-    return dtype
+def _tuple_new(base: type, signature: inspect.Signature, cls: type):
+    """``__new__`` of tuple based classes, calling the dataclass default factories"""
+    names = list(signature.parameters)
+    factories = [
+        (names.index(field.name), signature.parameters[field.name].default, field.default_factory)
+        for field in (dataclasses.fields(cls) if dataclasses.is_dataclass(cls) else ())
+        if field.name in signature.parameters and field.default_factory is not dataclasses.MISSING
+    ]
 
+    def __new__(tuple_cls, *args, **kwargs):
+        self = base.__new__(tuple_cls, *args, **kwargs)
+        if not any(self[idx] is marker for idx, marker, _ in factories):
+            return self
+        values = list(self)
+        for idx, marker, factory in factories:
+            if values[idx] is marker:
+                values[idx] = factory()
+        return tuple.__new__(tuple_cls, values)
 
-def _get_path_from_anot(anot):
-    _path = None
-    if hasattr(anot, "__metadata__"):
-        for meta in anot.__metadata__:
-            if isinstance(meta, Path):
-                _path = meta
-                break
-    return _path
+    return __new__ if factories else None
 
 
-def _get_route_path(anot, name: str, route_template: Optional[Route]):
-    anot_path = _get_path_from_anot(anot)
-    template_path = route_template[name] if route_template else None
+def _is_compact(val) -> bool:
+    return isinstance(val, type) and val in _COMPACT_CLASSES
 
-    if anot_path and template_path:
-        raise ValueError(
-            f"For field {name}, the path was found in both the template and destination path"
-        )
 
-    return template_path or anot_path
+def compact(cls=None, *, kind: str = "slots"):
+    """
+    Creates a memory compact variant of a python class(including dataclass),
+    without a per instance ``__dict__``. The variant has the same name, signature
+    and methods, and can be used as an ingestion target like the original class.
+    Can be used as a class decorator.
+
+    The variant is stored as the ``Compact`` (``CompactTuple`` for kind="tuple") attribute
+    of cls and its qualified name is ``<cls qualname>.Compact``, so that its instances
+    can be pickled (eg: sent to `from_dicts` workers). The same variant is returned
+    by the following calls with the same class and kind. A ValueError is raised
+    when cls already defines this attribute for something else.
+
+    Examples
+    --------
+
+    >>> @compact
+    >>> @dataclass
+    >>> class MyClass:
+    >>> ...
 
+    >>> CompactTuple = compact(MyClass, kind="tuple")
 
-def _construct_routing(
-    dtype: type, routing: Union[Route, dict[type, Route], Chart, None]
-) -> Optional[Chart]:
-    chart = None
-    if routing:
-        if isinstance(routing, Chart):
-            chart = routing
-        elif isinstance(routing, Route):
-            chart = Chart({dtype: routing})
-        else:
-            chart = Chart(routing)
-        chart.typecast = from_dict
-    return chart
+    Parameters
+    ----------
+    cls
+        Class to create the compact variant of. All the attributes set on instances
+        must be parameters of its signature
+    kind, optional
+        "slots" (default): a copy of cls using ``__slots__``.
+        "tuple": an immutable ``namedtuple`` based class, its instances are also tuples.
+        The ``__init__``/``__post_init__`` of cls are not called
+
+    Returns
+    -------
+        The compact class, which is not a subclass of cls
+    """
+    if cls is None:
+        return partial(compact, kind=kind)
+    if kind not in COMPACT_KINDS:
+        raise ValueError(f"Unknown compact kind {kind!r}, expected one of {COMPACT_KINDS}")
+    attr = _COMPACT_ATTRS[kind]
+    if attr in cls.__dict__:
+        if _is_compact(cls.__dict__[attr]):
+            return cls.__dict__[attr]
+        raise ValueError(f"{cls.__qualname__}.{attr} is already defined, it is not overwritten")
+    signature = inspect.signature(cls)
+    names = tuple(signature.parameters)
+    namespace = {
+        key: val
+        for key, val in cls.__dict__.items()
+        if key not in _INSTANCE_ATTRS and key not in names and not _is_compact(val)
+    }
+    namespace["__qualname__"] = f"{cls.__qualname__}.{attr}"
+    namespace["__signature__"] = signature
+    if kind == "slots":
+        namespace["__slots__"] = names
+        compact_cls = type(cls)(cls.__name__, cls.__bases__, namespace)
+    else:
+        defaults = [
+            param.default
+            for param in signature.parameters.values()
+            if param.default is not inspect.Parameter.empty
+        ]
+        for key in _TUPLE_EXCLUDED:
+            namespace.pop(key, None)
+        namespace["__slots__"] = ()
+        base = namedtuple(cls.__name__, names, defaults=defaults)  # type: ignore
+        new = _tuple_new(base, signature, cls)
+        if new is not None:
+            namespace["__new__"] = new
+        compact_cls = type(cls.__name__, (base,), namespace)
+    # the variant is found from cls (``X = compact(cls)``) and from itself, when it
+    # replaces cls in its module (``@compact`` decorator)
+    setattr(cls, attr, compact_cls)
+    setattr(compact_cls, attr, compact_cls)
+    _COMPACT_CLASSES.add(compact_cls)
+    if "__typecast__" in namespace:
+        typecast(compact_cls)
+    return compact_cls
 
 
 def from_dict(
@@ -95,6 +184,8 @@ def from_dict(
     type_mappings: TypeConverterMap = default_convertor,
     routing: Union[Route, dict[type, Route], Chart] = None,
     convert_types: bool = True,
+    stats: Optional[IngestStats] = None,
+    # pylint: disable=R0913
 ) -> T:
     """Converts a dictionary to the desired target type.
 
@@ -110,50 +201,217 @@ def from_dict(
         custom conversion routing for fieldnames, see `Route`
     convert_types, optional
         if target fields should be converted to typing hint types.
+    stats, optional
+        collector recording per field counts and timings, see `IngestStats`
 
     Returns
     -------
         The converted datatype
 
     """
-    empty = inspect.Parameter.empty
-    params = inspect.signature(target).parameters
+    plan = compile_plan(
+        target, routing=routing, type_mappings=type_mappings, convert_types=convert_types
+    )
+    if stats is not None:
+        return instrument(plan, stats)(data)
+    return plan(data)
 
-    routing = _construct_routing(target, routing)
-    router = routing[target] if routing and target in routing else None
 
-    kwargs = {}
-    for name, prop in params.items():
-        anot = prop.annotation
+def from_dicts(
+    target: type[T],
+    data: Iterable[dict],
+    type_mappings: TypeConverterMap = default_convertor,
+    routing: Union[Route, dict[type, Route], Chart] = None,
+    convert_types: bool = True,
+    lazy: bool = False,
+    backend: str = "codegen",
+    workers: Optional[int] = None,
+    chunksize: int = 1000,
+    ordered: bool = True,
+    executor: str = "process",
+    stats: Optional[IngestStats] = None,
+    errors: str = "raise",
+    max_errors: Optional[int] = None,
+    output: str = "items",
+    # pylint: disable=R0913
+) -> Union[list[T], Iterator[T], IngestResult, ColumnTable]:
+    """Converts an iterable of dictionaries to the desired target type.
+    The routing is validated and the ingestion plan is built only once
+    for the whole batch, see `compile_plan`.
 
-        dtype = _get_dtype_from_anot(anot)
-        _path = _get_route_path(anot, name, router)
-        val = _path.get(data, prop.default) if _path else data.get(name, prop.default)
-        if val == empty:
-            raise ValueError(f"Missing parameter {name}")
-        if convert_types:
-            val = convert(val, dtype, type_mappings, routing)
-        kwargs[name] = val
+    Parameters
+    ----------
+    target
+        Target conversion type
+    data
+        iterable of dictionaries to be converted to target type
+    type_mappings, optional
+        custom conversion mapping for datatypess, by default None
+    routing, optional
+        custom conversion routing for fieldnames, see `Route`
+    convert_types, optional
+        if target fields should be converted to typing hint types.
+    lazy, optional
+        if True a generator converting the dictionaries on demand is returned,
+        otherwise the whole batch is converted to a list
+    backend, optional
+        ingestion plan backend, see `compile_plan`
+    workers, optional
+        number of workers converting the dictionaries in parallel,
+        by default the conversion is done in the current thread.
+        The whole batch is converted with a `Convertor.snapshot` of type_mappings,
+        converters registered meanwhile are not used
+    chunksize, optional
+        number of dictionaries sent at a time to a worker
+    ordered, optional
+        when using workers, if the items should keep the order of data.
+        If False the items are returned in the order they are converted
+    executor, optional
+        "process" (default): the workers are processes, the target type, routing
+        and type_mappings must be picklable (eg: no lambdas as `Path` extractors).
+        "thread": the workers are threads, suited for free-threaded python builds
+    stats, optional
+        collector recording per field counts and timings, see `IngestStats`.
+        Not supported with workers
+    errors, optional
+        "raise" (default): the first failing record raises.
+        "collect": the failing records are skipped and an `IngestResult`
+        (items, errors) is returned, see `dictgest.errors`.
+        Not supported with lazy or workers
+    max_errors, optional
+        with errors="collect", maximum number of failing records,
+        `TooManyErrors` is raised when it is exceeded
+    output, optional
+        "items" (default): target items are built.
+        "columns": the converted field values are stored in a `ColumnTable`
+        without building target items. Not supported with lazy, workers, stats
+        or errors="collect"
 
-    return target(**kwargs)  # type: ignore
+    Returns
+    -------
+        List (or generator when lazy) of converted items,
+        an `IngestResult` when errors="collect", a `ColumnTable` when output="columns"
+    """
+    check_output(output, lazy=lazy, workers=workers, stats=stats, errors=errors == "collect")
+    if errors not in ERROR_MODES:
+        raise ValueError(f"Unknown errors mode {errors!r}, expected one of {ERROR_MODES}")
+    if errors == "collect" and (lazy or workers is not None):
+        raise ValueError('errors="collect" can not be used with lazy or workers')
+    if workers is not None and stats is not None:
+        raise ValueError("stats can not be collected with workers")
+    if workers is not None and isinstance(type_mappings, Convertor):
+        type_mappings = type_mappings.snapshot()
+    return _ingest_batch(
+        compile_plan(target, routing, type_mappings, convert_types, backend),
+        data,
+        lazy,
+        workers,
+        chunksize,
+        ordered,
+        executor,
+        stats,
+        errors,
+        max_errors,
+        output,
+    )
 
 
-def _get_row(data: list[list], transpose: bool):
+def _ingest_batch(
+    plan,
+    data: Iterable[dict],
+    lazy: bool,
+    workers: Optional[int],
+    chunksize: int,
+    ordered: bool,
+    executor: str,
+    stats: Optional[IngestStats],
+    errors: str,
+    max_errors: Optional[int],
+    output: str,
+    # pylint: disable=R0913
+):
+    """Ingestion of a batch with a compiled plan, see `from_dicts` for the options"""
+    if workers is not None:
+        items = ingest_parallel(plan, data, workers, chunksize, ordered, executor)
+        return items if lazy else list(items)
+    if output == "columns":
+        return ColumnTable.from_rows(plan, data)
+    ingest = plan.ingest if stats is None else instrument(plan, stats)
+    if errors == "collect":
+        return ingest_collect(plan, data, max_errors, ingest)
+    if lazy:
+        return (ingest(item) for item in data)
+    return [ingest(item) for item in data]
+
+
+def _get_row(data: Iterable[Sequence], transpose: bool):
     if transpose:
-        for idx in range(len(data[0])):
-            yield [row[idx] for row in data]
+        columns = list(data)
+        for idx in range(len(columns[0])):
+            yield [column[idx] for column in columns]
     else:
         yield from data
 
 
+def _row_dicts(data: Iterable[Sequence], header: Sequence[str], transpose: bool) -> Iterator[dict]:
+    for row_idx, row in enumerate(_get_row(data, transpose)):
+        if len(row) != len(header):
+            raise ValueError(
+                f"Header has {len(header)} elements while table row[{row_idx}] has {len(row)}"
+            )
+        yield {key: item for item, key in zip(row, header)}
+
+
+def _table_stream(data, header: Optional[list[str]], transpose: bool) -> Optional[TableStream]:
+    """Streamed tables (`TableStream`, DB-API cursors and row iterators), None for other tables"""
+    if is_cursor(data):
+        data = read_cursor(data)
+    if isinstance(data, TableStream):
+        stream = data if header is None else TableStream(header, data.rows)
+    elif isinstance(data, Iterator):
+        if header is None:
+            raise ValueError("A header is required for row iterators")
+        stream = TableStream(header, data)
+    else:
+        return None
+    if transpose:
+        raise ValueError("transpose is not supported for streamed tables")
+    return stream
+
+
+def _frame_columns(plan, data, header: Optional[list[str]], transpose: bool):
+    """Columns and number of rows of dataframe like tables, see `frame_columns`.
+    Only the columns read by plan are kept
+    """
+    frame = frame_columns(data, header, root_keys(plan), float_keys(plan))
+    if frame is None:
+        if header is None:
+            raise ValueError("A header is required for tables without column names")
+        return None
+    if transpose:
+        raise ValueError("transpose is not supported for dataframes")
+    return frame
+
+
+def _table_rows(data, header, transpose: bool, frame) -> Iterator[dict]:
+    if frame is None:
+        return _row_dicts(data, header, transpose)
+    columns, _ = frame
+    values = [
+        column.tolist() if hasattr(column, "tolist") else column for column in columns.values()
+    ]
+    return (dict(zip(columns, row)) for row in zip(*values))
+
+
 def table_to_item(
     target: type[T],
     data: list[list],
-    header: list[str],
+    header: Optional[list[str]] = None,
     transpose: bool = False,
     type_mappings: TypeConverterMap = default_convertor,
     routing: Union[Route, dict[type, Route], Chart] = None,
     convert_types: bool = True,
+    stats: Optional[IngestStats] = None,
     # pylint: disable=R0913
 ) -> T:
     """Converts a table (2d structure) to the desired target type.
@@ -164,9 +422,14 @@ def table_to_item(
     target
         Target conversion type
     data
-        2d table (nested lists) that will be converted
+        2d table (nested lists or 2d numpy array) that will be converted,
+        or a dataframe like table: pandas DataFrame, pyarrow Table/RecordBatch
+        or numpy structured array, read column by column.
+        Streamed tables are also accepted: `TableStream` (see `read_csv`),
+        executed DB-API cursors and row iterators, converted chunk by chunk
+        (see `TableAccumulator`)
     header
-        column names of the 2d table
+        column names of the 2d table, by default the column names of dataframe like tables
     transpose
         switch rows with columns(eg: first row becomes first column and viceversa)
     type_mappings, optional
@@ -175,47 +438,42 @@ def table_to_item(
         custom conversion routing for fieldnames, see `Route`
     convert_types, optional
         if target fields should be converted to typing hint types.
+    stats, optional
+        collector recording per field counts and timings, see `IngestStats`
 
     Returns
     -------
         The converted datatype
 
     """
-
-    if transpose:
-        if len(data) != len(header):
-            raise ValueError(
-                f"Header has {len(header)} elements while table {len(data)}"
-            )
-        dict_of_lists = {key: item for item, key in zip(data, header)}
-    else:
-        if len(data[0]) != len(header):
-            raise ValueError(
-                f"Header has {len(header)} elements while table {len(data[0])}"
-            )
-        dict_of_lists = {
-            key: [row[col_idx] for row in data] for col_idx, key in enumerate(header)
-        }
-
-    return from_dict(
-        target,
-        dict_of_lists,
-        type_mappings=type_mappings,
-        routing=routing,
-        convert_types=convert_types,
+    stream = _table_stream(data, header, transpose)
+    if stream is not None:
+        accumulator = TableAccumulator(
+            target, stream.header, type_mappings, routing, convert_types, stats
+        )
+        return accumulator.consume(stream).finalize()
+    plan = compile_plan(
+        target, routing=routing, type_mappings=type_mappings, convert_types=convert_types
     )
+    frame = _frame_columns(plan, data, header, transpose)
+    # header is checked by _frame_columns for tables without column names
+    columns, _ = frame or table_columns(data, header, transpose)  # type: ignore
+    return column_item(plan, as_lists(columns), stats)
 
 
 def table_to_items(
     target: type[T],
     data: list[list],
-    header: list[str],
+    header: Optional[list[str]] = None,
     transpose: bool = False,
     type_mappings: TypeConverterMap = default_convertor,
     routing: Union[Route, dict[type, Route], Chart] = None,
     convert_types: bool = True,
+    stats: Optional[IngestStats] = None,
+    output: str = "items",
+    chunksize: int = 4096,
     # pylint: disable=R0913
-) -> Iterable[T]:
+) -> Union[Iterator[T], ColumnTable]:
     """Converts a table (2d structure) to a list of items of the desired target type.
         Each table row is regarded as an item to be converted.
         The field names are given in the header parameter.
@@ -225,9 +483,13 @@ def table_to_items(
     target
         Target conversion type
     data
-        2d table (nested lists) that will be converted
+        2d table (nested lists or 2d numpy array) that will be converted,
+        or a dataframe like table: pandas DataFrame, pyarrow Table/RecordBatch
+        or numpy structured array, read column by column.
+        Streamed tables are also accepted: `TableStream` (see `read_csv`),
+        executed DB-API cursors and row iterators
     header
-        column names of the 2d table
+        column names of the 2d table, by default the column names of dataframe like tables
     transpose
         switch rows with columns(eg: first row becomes first column and viceversa)
     type_mappings, optional
@@ -236,23 +498,71 @@ def table_to_items(
         custom conversion routing for fieldnames, see `Route`
     convert_types, optional
         if target fields should be converted to typing hint types.
+    stats, optional
+        collector recording per field counts and timings, see `IngestStats`
+    output, optional
+        "items" (default): target items are built.
+        "columns": the converted field values are stored in a `ColumnTable`
+        without building target items. Not supported with stats
+    chunksize, optional
+        number of rows converted at a time for streamed tables
 
     Returns
     -------
-        The converted datatype
+        Generator of converted items, or a `ColumnTable` when output="columns"
 
     """
-    for row_idx, row in enumerate(_get_row(data, transpose)):
-        if len(row) != len(header):
-            raise ValueError(
-                f"Header has {len(header)} elements while table row[{row_idx}] has {len(data)}"
-            )
-        dict_to_convert = {key: item for item, key in zip(row, header)}
-
-        yield from_dict(
-            target,
-            dict_to_convert,
-            type_mappings=type_mappings,
-            routing=routing,
-            convert_types=convert_types,
-        )
+    check_output(output, stats=stats)
+    plan = compile_plan(
+        target, routing=routing, type_mappings=type_mappings, convert_types=convert_types
+    )
+    stream = _table_stream(data, header, transpose)
+    if stream is not None:
+        if output == "columns":
+            return _stream_columns(plan, stream, chunksize)
+        return _stream_items(plan, stream, chunksize, stats)
+    frame = _frame_columns(plan, data, header, transpose)
+    if output == "columns":
+        if supports_columns(plan):
+            # header is checked by _frame_columns for tables without column names
+            columns, nrows = frame or table_columns(data, header, transpose)  # type: ignore
+            return ColumnTable.from_plan(plan, converted_columns(plan, columns, nrows))
+        return ColumnTable.from_rows(plan, _table_rows(data, header, transpose, frame))
+    return _table_items(plan, data, header, transpose, stats, frame)
+
+
+def _stream_items(
+    plan, stream: TableStream, chunksize: int, stats: Optional[IngestStats]
+) -> Iterator:
+    for chunk in chunked(stream, chunksize):
+        yield from _table_items(plan, chunk, stream.header, False, stats, None)
+
+
+def _stream_columns(plan, stream: TableStream, chunksize: int) -> ColumnTable:
+    if not supports_columns(plan):
+        return ColumnTable.from_rows(plan, _row_dicts(stream, stream.header, False))
+    columns: list[list] = [[] for _ in plan.fields]
+    for chunk in chunked(stream, chunksize):
+        chunk_columns, nrows = table_columns(chunk, stream.header, False)
+        for column, values in zip(columns, converted_columns(plan, chunk_columns, nrows)):
+            column.extend(values)
+    return ColumnTable.from_plan(plan, columns)
+
+
+def _table_items(
+    plan,
+    data,
+    header,
+    transpose: bool,
+    stats: Optional[IngestStats],
+    frame,
+    # pylint: disable=R0913
+) -> Iterator:
+    if supports_columns(plan):
+        columns, nrows = frame or table_columns(data, header, transpose)
+        yield from column_items(plan, columns, nrows, stats)
+        return
+
+    ingest = plan.ingest if stats is None else instrument(plan, stats)
+    for row in _table_rows(data, header, transpose, frame):
+        yield ingest(row)
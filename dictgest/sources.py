@@ -0,0 +1,143 @@
+"""
+Streaming table sources.
+
+`read_csv` and `read_cursor` return a `TableStream`: the table header and an
+iterator over its rows, read on demand. `table_to_items` consumes streamed tables
+chunk by chunk, so memory stays bounded whatever the number of rows.
+The files opened by `read_csv` are closed once all their rows are read,
+or with `TableStream.close` (eg: in a ``with`` block).
+DB-API cursors (eg: `sqlite3.Cursor`) can also be passed directly to `table_to_items`.
+"""
+import csv
+import os
+from typing import IO, Callable, Collection, Iterable, Iterator, Optional, Sequence, Union
+
+CsvSource = Union[IO[str], str, os.PathLike]
+
+
+class TableStream:
+    """Table read row by row: the column names and an iterator over the rows
+
+    Parameters
+    ----------
+    header
+        column names
+    rows
+        rows of the table, each row has a value per header column
+    close, optional
+        function releasing the resources of the rows (eg: closing their file)
+    """
+
+    def __init__(
+        self,
+        header: Sequence[str],
+        rows: Iterable[Sequence],
+        close: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.header = list(header)
+        self.rows = iter(rows)
+        self._close = close
+
+    def __iter__(self) -> Iterator[Sequence]:
+        return self.rows
+
+    def close(self) -> None:
+        """Release the resources of the rows, the remaining rows are not read"""
+        if self._close is not None:
+            self._close()
+
+    def __enter__(self) -> "TableStream":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"TableStream(header={self.header!r})"
+
+
+def _csv_rows(
+    reader: Iterator[list[str]], null_values: frozenset[str], close: Optional[Callable]
+) -> Iterator[list]:
+    try:
+        if not null_values:
+            yield from reader
+            return
+        for row in reader:
+            yield [None if cell in null_values else cell for cell in row]
+    finally:
+        if close is not None:
+            close()
+
+
+def read_csv(
+    source: CsvSource,
+    header: Optional[Sequence[str]] = None,
+    null_values: Collection[str] = (),
+    **fmtparams,
+) -> TableStream:
+    """Stream the rows of a CSV file.
+
+    Parameters
+    ----------
+    source
+        text stream, or path of the file to read. The file is closed once all the
+        rows are read, or by closing the returned stream (eg: with a ``with`` block)
+    header, optional
+        column names, by default the first row of the file
+    null_values, optional
+        cell values read as None (eg: ``("", "NA")`` for the missing values of
+        `Optional` fields), by default none: empty cells are empty strings
+    fmtparams, optional
+        formatting parameters of `csv.reader` (eg: delimiter)
+
+    Returns
+    -------
+        The header and the rows (lists of strings) of the file
+    """
+    close: Optional[Callable] = None
+    file: IO[str]
+    if isinstance(source, (str, os.PathLike)):
+        # the file is owned by the returned stream, see `TableStream.close`
+        file = open(source, newline="", encoding="utf-8")  # pylint: disable=R1732
+        close = file.close
+    else:
+        file = source
+    try:
+        reader = csv.reader(file, **fmtparams)
+        names = next(reader, []) if header is None else header
+    except BaseException:
+        if close is not None:
+            close()
+        raise
+    return TableStream(names, _csv_rows(reader, frozenset(null_values), close), close)
+
+
+def is_cursor(data) -> bool:
+    """True for DB-API cursors"""
+    return hasattr(data, "fetchmany") and hasattr(data, "description")
+
+
+def _fetch(cursor, size: int) -> Iterator[Sequence]:
+    while rows := cursor.fetchmany(size):
+        yield from rows
+
+
+def read_cursor(cursor, chunksize: int = 1000) -> TableStream:
+    """Stream the result rows of an executed DB-API cursor
+
+    Parameters
+    ----------
+    cursor
+        cursor on which a query was executed
+    chunksize, optional
+        number of rows fetched at a time (`fetchmany`)
+
+    Returns
+    -------
+        The header (from ``cursor.description``) and the rows of the result
+    """
+    if cursor.description is None:
+        raise ValueError("The cursor has no result set, execute a query first")
+    header = [column[0] for column in cursor.description]
+    return TableStream(header, _fetch(cursor, chunksize))
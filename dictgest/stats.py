@@ -0,0 +1,199 @@
+"""
+Ingestion instrumentation.
+
+An `IngestStats` collector can be passed with the ``stats`` argument of `from_dict`,
+the batch, stream and table APIs. It records per target and per field counts and
+cumulative times spent in extraction (`Path.extract` and custom extractors),
+conversion (`convert`, `Convertor` entries) and construction (the target call),
+as well as failures.
+
+Without a collector the regular (uninstrumented) ingestion is used, so disabled
+instrumentation costs nothing. Instrumented ingestion extracts each field separately,
+so it is slower than the regular one. Nested types are accounted
+in the conversion time of the parent field.
+"""
+from time import perf_counter
+from typing import Any, Callable
+
+from .cast import convert
+
+
+class FieldStats:
+    """Counters of a single target field"""
+
+    __slots__ = ("count", "extract_time", "convert_time", "failures")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.extract_time = 0.0
+        self.convert_time = 0.0
+        self.failures = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Counters as a dictionary"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class TargetStats:
+    """Counters of a target type and of its fields"""
+
+    __slots__ = ("records", "construct_time", "failures", "fields")
+
+    def __init__(self) -> None:
+        self.records = 0
+        self.construct_time = 0.0
+        self.failures = 0
+        self.fields: dict[str, FieldStats] = {}
+
+    def field(self, name: str) -> FieldStats:
+        """Counters of a field, created on first use"""
+        if name not in self.fields:
+            self.fields[name] = FieldStats()
+        return self.fields[name]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Counters as a dictionary"""
+        return {
+            "records": self.records,
+            "construct_time": self.construct_time,
+            "failures": self.failures,
+            "fields": {name: field.as_dict() for name, field in self.fields.items()},
+        }
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class IngestStats:
+    """Collector of ingestion counts and timings, see the module documentation.
+
+    Examples
+    --------
+
+    >>> stats = IngestStats()
+    >>> articles = from_dicts(Article, records, stats=stats)
+    >>> stats.as_dict()["Article"]["fields"]["title"]["convert_time"]
+    >>> print(stats.to_prometheus())
+    """
+
+    def __init__(self) -> None:
+        self.targets: dict[str, TargetStats] = {}
+
+    def target(self, target: type) -> TargetStats:
+        """Counters of a target type, created on first use"""
+        name = target.__qualname__
+        if name not in self.targets:
+            self.targets[name] = TargetStats()
+        return self.targets[name]
+
+    def reset(self):
+        """Drop all the counters"""
+        self.targets.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Counters as a dictionary, indexed by the target names"""
+        return {name: target.as_dict() for name, target in self.targets.items()}
+
+    def to_prometheus(self, prefix: str = "dictgest") -> str:
+        """Counters in the Prometheus text exposition format"""
+        target_metrics = [
+            ("records_total", "records", "Records ingested"),
+            ("failures_total", "failures", "Records that failed to be ingested"),
+            ("construct_seconds_total", "construct_time", "Time spent calling the target"),
+        ]
+        field_metrics = [
+            ("field_values_total", "count", "Field values extracted"),
+            ("field_extract_seconds_total", "extract_time", "Time spent extracting fields"),
+            ("field_convert_seconds_total", "convert_time", "Time spent converting fields"),
+            ("field_failures_total", "failures", "Field extraction/conversion failures"),
+        ]
+        lines = []
+        for metric, attr, doc in target_metrics:
+            lines += [f"# HELP {prefix}_{metric} {doc}", f"# TYPE {prefix}_{metric} counter"]
+            for name, target in self.targets.items():
+                value = getattr(target, attr)
+                lines.append(f'{prefix}_{metric}{{target="{_label(name)}"}} {value}')
+        for metric, attr, doc in field_metrics:
+            lines += [f"# HELP {prefix}_{metric} {doc}", f"# TYPE {prefix}_{metric} counter"]
+            for name, target in self.targets.items():
+                for field_name, field in target.fields.items():
+                    labels = f'target="{_label(name)}",field="{_label(field_name)}"'
+                    lines.append(f"{prefix}_{metric}{{{labels}}} {getattr(field, attr)}")
+        return "\n".join(lines) + "\n"
+
+
+def timed(target_stats: TargetStats, field_stats: FieldStats, phase: str, func: Callable, *args):
+    """Call ``func(*args)`` adding its duration to the ``{phase}_time`` counter of field_stats,
+    failures are counted for the field and the target
+    """
+    start = perf_counter()
+    try:
+        return func(*args)
+    except Exception:
+        field_stats.failures += 1
+        target_stats.failures += 1
+        raise
+    finally:
+        attr = f"{phase}_time"
+        setattr(field_stats, attr, getattr(field_stats, attr) + perf_counter() - start)
+
+
+def timed_call(target_stats: TargetStats, target: Callable, *args, **kwargs):
+    """Build an item of the target, adding its duration to the construction time"""
+    start = perf_counter()
+    try:
+        item = target(*args, **kwargs)
+    except Exception:
+        target_stats.failures += 1
+        raise
+    finally:
+        target_stats.construct_time += perf_counter() - start
+    target_stats.records += 1
+    return item
+
+
+def instrument(plan, stats: IngestStats) -> Callable[[dict], Any]:
+    """Instrumented equivalent of ``plan.ingest``, recording counts and timings in stats
+
+    Parameters
+    ----------
+    plan
+        Ingestion `Plan` of the target type
+    stats
+        Collector in which the counters are recorded
+    """
+    target_stats = stats.target(plan.target)
+    fields = [(field, target_stats.field(field.name)) for field in plan.fields]
+    target = plan.target
+    convert_types = plan.convert_types
+    type_mappings = plan.type_mappings
+    routing = plan.routing
+
+    def ingest(data: dict):
+        kwargs = {}
+        for field, field_stats in fields:
+            field_stats.count += 1
+            start = perf_counter()
+            try:
+                val = field.extract(data)
+            except Exception:
+                field_stats.failures += 1
+                target_stats.failures += 1
+                raise
+            finally:
+                extracted = perf_counter()
+                field_stats.extract_time += extracted - start
+            if convert_types and field.dtype is not None:
+                try:
+                    val = convert(val, field.dtype, type_mappings, routing)
+                except Exception:
+                    field_stats.failures += 1
+                    target_stats.failures += 1
+                    raise
+                finally:
+                    field_stats.convert_time += perf_counter() - extracted
+            kwargs[field.name] = val
+        return timed_call(target_stats, target, **kwargs)
+
+    return ingest
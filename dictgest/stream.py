@@ -0,0 +1,316 @@
+"""
+Streaming ingestion of JSON data.
+
+Reads NDJSON (one JSON document per line) or a top-level JSON array
+from a file or (binary) stream, yielding converted target objects
+while keeping in memory only the records of one read chunk at a time.
+
+Top-level keys that are not referenced by the target type (or its routing)
+are dropped right after decoding. Without the optional `pysimdjson` package,
+records are fully decoded by `json` before being pruned: no parsing time is saved,
+only the memory held by the dropped values. When `pysimdjson` is installed, records
+(NDJSON lines and the objects of a JSON array) are parsed lazily and the subtrees
+of unreferenced keys are skipped without being converted to python objects.
+The objects of a JSON array are parsed in batches, up to the last object separator
+of the read buffer.
+"""
+import codecs
+import json
+import os
+import re
+from typing import IO, Iterator, Optional, TypeVar, Union
+
+try:
+    import simdjson  # type: ignore
+except ImportError:  # pragma: no cover
+    simdjson = None
+
+from .cast import TypeConverterMap
+from .columns import ColumnTable, check_output
+from .converter import default_convertor
+from .plan import RoutingType, compile_plan
+from .routes import OP_KEY
+from .stats import IngestStats, instrument
+
+T = TypeVar("T")
+
+Source = Union[IO, str, os.PathLike]
+
+_WHITESPACE = re.compile(r"\s*")
+# last separator of two objects in a JSON array text (or in a nested list)
+_LAST_SEPARATOR = re.compile(r"(.*\})\s*(,)\s*\{", re.S)
+_decoder = json.JSONDecoder()
+
+
+def root_keys(plan) -> Optional[frozenset[str]]:
+    """Top-level dictionary keys read by a plan.
+    None if the whole dictionary is needed (eg: for `Path("")`).
+    """
+    keys = set()
+    for field in plan.fields:
+        if field.path is None:
+            keys.add(field.name)
+            continue
+        opcode, key = field.path.program[0]
+        if opcode != OP_KEY:
+            return None
+        keys.add(key)
+    return frozenset(keys)
+
+
+def _prune(document, keys: Optional[frozenset[str]]):
+    if keys is None or not isinstance(document, dict):
+        return document
+    return {key: val for key, val in document.items() if key in keys}
+
+
+def _materialize(value):
+    if isinstance(value, simdjson.Object):
+        return value.as_dict()
+    if isinstance(value, simdjson.Array):
+        return value.as_list()
+    return value
+
+
+class _RecordDecoder:
+    """Decodes JSON records, keeping only the top-level keys of interest.
+
+    With `simdjson` installed, records are parsed lazily and only the values
+    of the keys of interest are materialized, the other subtrees are never
+    converted to python objects.
+    """
+
+    def __init__(self, keys: Optional[frozenset[str]]) -> None:
+        self.keys = keys
+        self.parser = simdjson.Parser() if simdjson is not None and keys else None
+        # batches not tried for the next `pending` objects, see `decode_many`
+        self.pending = 0
+        self.backoff = 1
+
+    def _select(self, document):
+        if not isinstance(document, simdjson.Object) or self.keys is None:
+            return _materialize(document)
+        return {key: _materialize(document[key]) for key in self.keys if key in document}
+
+    def __call__(self, line: Union[str, bytes]):
+        if self.parser is None:
+            return _prune(json.loads(line), self.keys)
+        document = self.parser.parse(line)
+        result = self._select(document)
+        del document  # the parser can be reused only when its documents are released
+        return result
+
+    def decode(self, text: str, idx: int) -> tuple:
+        """Decode the JSON value starting at idx of text, returns it with its end index"""
+        value, end = _decoder.raw_decode(text, idx)
+        return _prune(value, self.keys), end
+
+    def decode_many(self, text: str, idx: int) -> Optional[tuple[list, int]]:
+        """With `simdjson`, decode in a single parse the objects of a JSON array text
+        starting at idx, up to the last object separator of text.
+
+        Returns
+        -------
+            The decoded objects and the index of the separator following them,
+            None when the objects should be decoded one by one (see `decode`)
+        """
+        if self.parser is None:
+            return None
+        if self.pending:
+            self.pending -= 1
+            return None
+        match = _LAST_SEPARATOR.match(text, idx)
+        if match is None:
+            return None
+        try:
+            array = self.parser.parse(f"[{text[idx:match.end(1)]}]")
+        except ValueError:
+            # the separator is the one of a list nested in the objects (or the JSON
+            # is invalid), the next objects are decoded one by one with a growing backoff
+            self.pending = self.backoff
+            self.backoff *= 2
+            return None
+        self.backoff = 1
+        values = [self._select(element) for element in array]
+        del array
+        return values, match.start(2)
+
+
+class _TextReader:
+    """Text reader over text or binary streams"""
+
+    def __init__(self, stream: IO, chunk_size: int) -> None:
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.eof = False
+
+    def read(self, size: int) -> str:
+        """Read at least a character (unless at the end of the stream)"""
+        while not self.eof:
+            data = self.stream.read(size)
+            if not data:
+                self.eof = True
+            text = data if isinstance(data, str) else self.decoder.decode(data, self.eof)
+            if text or self.eof:
+                return text
+        return ""
+
+    def lines(self) -> Iterator[Union[str, bytes]]:
+        """Iterate over the (undecoded) lines of the stream"""
+        yield from self.stream
+
+
+def _iter_array(reader: _TextReader, buffer: str, decoder: _RecordDecoder) -> Iterator:
+    """Iterate over the elements of a top-level JSON array, buffer starts after `[`"""
+    idx = 0
+    size = reader.chunk_size
+    expect_value = True  # after `[` or `,`
+    first = True
+    while True:
+        idx = _WHITESPACE.match(buffer, idx).end()  # type: ignore
+        complete = False
+        if idx < len(buffer):
+            char = buffer[idx]
+            if char == "]" and (first or not expect_value):
+                return
+            if not expect_value:
+                if char != ",":
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buffer, idx)
+                idx += 1
+                expect_value = True
+                continue
+            batch = decoder.decode_many(buffer, idx)
+            if batch is not None:
+                values, idx = batch
+                expect_value = first = False
+                yield from values
+                continue
+            try:
+                value, end = decoder.decode(buffer, idx)
+                # a value ending with the buffer might be truncated (eg: numbers)
+                complete = end < len(buffer) or reader.eof
+            except json.JSONDecodeError:
+                if reader.eof:
+                    raise
+        if not complete:
+            if reader.eof:
+                raise json.JSONDecodeError("Unterminated array", buffer, idx)
+            # read more data, doubling the read size on consecutive misses
+            # to avoid quadratic re-parsing of large elements
+            buffer = buffer[idx:] + reader.read(size)
+            idx = 0
+            size *= 2
+            continue
+        idx = end
+        size = reader.chunk_size
+        expect_value = first = False
+        yield value
+
+
+def _iter_lines(reader: _TextReader, buffer: str) -> Iterator[Union[str, bytes]]:
+    """Iterate over the lines of the stream, starting with the already read buffer"""
+    *complete, tail = buffer.split("\n")
+    yield from complete
+    for line in reader.lines():
+        if tail:
+            line = tail + (line if isinstance(line, str) else reader.decoder.decode(line))
+            tail = ""
+        yield line
+    if tail:
+        yield tail
+
+
+def iter_json(
+    source: Source,
+    keys: Optional[frozenset[str]] = None,
+    chunk_size: int = 1 << 16,
+) -> Iterator:
+    """Iterate over the JSON documents of a NDJSON stream or over
+    the elements of a top-level JSON array. The format is auto-detected.
+
+    Parameters
+    ----------
+    source
+        text/binary stream, or path of the file to read
+    keys, optional
+        top-level keys to keep, the other keys of each record are dropped.
+        By default all keys are kept
+    chunk_size, optional
+        read size when reading a JSON array
+
+    Yields
+    ------
+        The decoded documents
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as stream:
+            yield from iter_json(stream, keys, chunk_size)
+        return
+
+    reader = _TextReader(source, chunk_size)
+    buffer = ""
+    while not reader.eof and not buffer.strip():
+        buffer += reader.read(chunk_size)
+    buffer = buffer.lstrip()
+    decoder = _RecordDecoder(keys)
+    if buffer.startswith("["):
+        yield from _iter_array(reader, buffer[1:], decoder)
+        return
+
+    for line in _iter_lines(reader, buffer):
+        if line.strip():
+            yield decoder(line)
+
+
+def from_json_stream(
+    target: type[T],
+    source: Source,
+    type_mappings: TypeConverterMap = default_convertor,
+    routing: RoutingType = None,
+    convert_types: bool = True,
+    prune: bool = True,
+    backend: str = "codegen",
+    stats: Optional[IngestStats] = None,
+    output: str = "items",
+    # pylint: disable=R0913
+) -> Union[Iterator[T], ColumnTable]:
+    """Converts the records of a NDJSON stream (or a JSON array) to the target type.
+
+    The records are read, decoded and converted one at a time, keeping memory bounded.
+
+    Parameters
+    ----------
+    target
+        Target conversion type
+    source
+        text/binary stream, or path of the file to read
+    type_mappings, optional
+        custom conversion mapping for datatypess, by default None
+    routing, optional
+        custom conversion routing for fieldnames, see `Route`
+    convert_types, optional
+        if target fields should be converted to typing hint types.
+    prune, optional
+        drop the top-level keys not used by the target type or its routing,
+        with `pysimdjson` installed their values are not decoded
+    backend, optional
+        ingestion plan backend, see `compile_plan`
+    stats, optional
+        collector recording per field counts and timings, see `IngestStats`
+    output, optional
+        "items" (default): a generator of target items is returned.
+        "columns": the whole stream is read into a `ColumnTable`,
+        without building target items. Not supported with stats
+
+    Returns
+    -------
+        Generator of the converted records, or a `ColumnTable` when output="columns"
+    """
+    check_output(output, stats=stats)
+    plan = compile_plan(target, routing, type_mappings, convert_types, backend)
+    keys = root_keys(plan) if prune else None
+    if output == "columns":
+        return ColumnTable.from_rows(plan, iter_json(source, keys))
+    ingest = plan.ingest if stats is None else instrument(plan, stats)
+    return (ingest(record) for record in iter_json(source, keys))
@@ -0,0 +1,120 @@
+"""
+Shared-prefix trie over the paths of a target type.
+
+Paths with a common prefix (eg: ``details/content``, ``details/votes``)
+are walked only once, fanning out at the branch points.
+"""
+from typing import Any, Optional, Sequence
+
+from dictgest.routes import OP_KEY, OP_WILDCARD, Path, _wildcard_extract
+from dictgest.utils import flatten
+
+# child key: opcode, argument and list flattening (None when it does not apply)
+_EdgeKey = tuple[int, Any, Optional[bool]]
+
+
+class _Node:
+    __slots__ = ("children", "leaves", "edges", "extractors")
+
+    def __init__(self) -> None:
+        self.children: dict[_EdgeKey, "_Node"] = {}
+        self.leaves: list[int] = []
+        # flattened view of children/leaves used while walking, see `_freeze`
+        self.edges: list[tuple] = []
+        self.extractors: list[tuple[int, Any]] = []
+
+
+def _step(data, opcode: int, arg, flatten_en: bool):
+    """Apply a single path opcode, see `Path.extract`"""
+    if opcode == OP_WILDCARD:
+        return _wildcard_extract(data, arg)
+    if isinstance(data, (list, tuple)):
+        data = [o[arg] for o in data if arg in o]
+        return flatten(data) if flatten_en else data
+    if opcode == OP_KEY:
+        return data[arg]
+    return data
+
+
+class PathTrie:
+    """Prefix tree over a sequence of `Path` objects.
+
+    `extract` returns the values of all paths, in the order the paths were given.
+    Each shared prefix is walked only once.
+    List projection and flattening follow the semantics of `Path.extract`.
+    """
+
+    def __init__(self, paths: Sequence[Path]) -> None:
+        self.paths = list(paths)
+        self.root = _Node()
+        self.size = 0
+        for idx, path in enumerate(self.paths):
+            node = self.root
+            for opcode, arg in path.program:
+                # flattening only changes the result of list projections
+                key = (opcode, arg, None if opcode == OP_WILDCARD else path.flatten_en)
+                if key not in node.children:
+                    node.children[key] = _Node()
+                    self.size += 1
+                node = node.children[key]
+            node.leaves.append(idx)
+        self._freeze(self.root)
+
+    def _freeze(self, node: _Node):
+        node.extractors = [(idx, self.paths[idx].extractor) for idx in node.leaves]
+        node.edges = []
+        for (opcode, arg, flatten_en), child in node.children.items():
+            self._freeze(child)
+            # children without descendants and extractors are plain value slots
+            plain = not child.children and not any(
+                extractor for _, extractor in child.extractors
+            )
+            slots = child.leaves if plain else None
+            node.edges.append((opcode, arg, flatten_en, child, slots))
+
+    @property
+    def shares_prefixes(self) -> bool:
+        """True if walking the trie saves steps compared to walking each path"""
+        return self.size < sum(len(path.program) for path in self.paths)
+
+    def extract(self, data, default: Any = None) -> list:
+        """Extract the values of all paths from data.
+
+        Parameters
+        ----------
+        data
+            Dictionary from which to extract the values
+        default, optional
+            Value used for paths that are not present in data
+
+        Returns
+        -------
+            List with the extracted value for each path
+        """
+        out = [default] * len(self.paths)
+        self._walk(self.root, data, out)
+        return out
+
+    def _walk(self, node: _Node, data, out: list):
+        for idx, extractor in node.extractors:
+            if extractor is None:
+                out[idx] = data
+                continue
+            try:
+                out[idx] = extractor(data)
+            except KeyError:
+                pass
+        is_list = isinstance(data, (list, tuple))
+        for opcode, arg, flatten_en, child, slots in node.edges:
+            try:
+                if opcode == OP_KEY and not is_list:
+                    value = data[arg]
+                else:
+                    value = _step(data, opcode, arg, flatten_en)
+            except KeyError:
+                continue
+            if slots is None:
+                self._walk(child, value, out)
+            else:
+                for idx in slots:
+                    out[idx] = value
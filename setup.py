@@ -14,7 +14,7 @@ setuptools.setup(
     description=("Advanced dictionary ingestion into python objects"),
     long_description=long_description,
     long_description_content_type="text/markdown",
-    packages=setuptools.find_packages(exclude=("tests",)),
+    packages=setuptools.find_packages(exclude=("tests", "benchmarks", "benchmarks.*")),
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -22,5 +22,11 @@ setuptools.setup(
     ],
     python_requires=">=3.9",
     install_requires=requirements,
+    extras_require={
+        "numpy": ["numpy"],
+        "simdjson": ["pysimdjson"],
+        "pandas": ["pandas"],
+        "pyarrow": ["pyarrow"],
+    },
     url="https://github.com/bmsan/DictGest",
 )
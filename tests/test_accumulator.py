@@ -0,0 +1,141 @@
+import io
+import tracemalloc
+from dataclasses import dataclass
+from typing import Annotated
+import pytest
+from dictgest import Path, TableAccumulator, table_to_item
+from dictgest.sources import read_csv
+from dictgest.stats import IngestStats
+
+np = pytest.importorskip("numpy")
+npt = pytest.importorskip("numpy.typing")
+
+
+@dataclass
+class Series:
+    time: list[int]
+    value: list[float]
+    tags: set[str]
+    unit: str = "m"
+
+
+@dataclass
+class Readings:
+    value: npt.NDArray[np.float32]
+    sensor: Annotated[tuple[int, ...], Path("id")]
+    first: Annotated[str, Path("name", extractor=lambda names: names[0])] = "?"
+
+
+header = ["time", "value", "tags"]
+table = [[1, "1.5", "a"], [2, 2, "b"], [3, 3.25, "a"], [4, 4, "c"], [5, 5.5, "b"]]
+
+
+def accumulate(target, rows, header, size, **kwargs):
+    acc = TableAccumulator(target, header, **kwargs)
+    for start in range(0, len(rows), size):
+        acc.add(rows[start : start + size])
+    return acc.finalize()
+
+
+@pytest.mark.parametrize("size", [1, 2, 5])
+def test_chunks_match_table_to_item(size):
+    result = accumulate(Series, table, header, size)
+    assert result == table_to_item(Series, table, header)
+    assert result == Series([1, 2, 3, 4, 5], [1.5, 2.0, 3.25, 4.0, 5.5], {"a", "b", "c"})
+    assert type(result.time[0]) is int and type(result.value[1]) is float
+
+    rows = [[0.5, 1, "ab"], [1.5, 2, "cd"], [2.5, 3, "ef"]]
+    expected = table_to_item(Readings, rows, ["value", "id", "name"])
+    result = accumulate(Readings, rows, ["value", "id", "name"], size)
+    assert result.value.dtype == np.float32
+    assert result.value.tolist() == expected.value.tolist() == [0.5, 1.5, 2.5]
+    assert result.sensor == expected.sensor == (1, 2, 3)
+    assert result.first == expected.first == "ab"
+
+
+def test_chunk_kinds():
+    acc = TableAccumulator(Series, header)
+    acc.add(table[:2])
+    acc.add(np.array([[3, 3.25, "a"]], dtype=object))
+    pd = pytest.importorskip("pandas")
+    acc.add(pd.DataFrame({"time": [4, 5], "value": [4.0, 5.5], "tags": ["c", "b"]}))
+    assert acc.nrows == 5
+    assert repr(acc) == "TableAccumulator(Series, rows=5)"
+    assert acc.finalize() == table_to_item(Series, table, header)
+
+    acc = TableAccumulator(Readings, ["value", "id"])
+    acc.add(np.array([[0.5, 1], [1.5, 2]]))
+    acc.add(np.array([[2.5, 3]]))
+    result = acc.finalize()
+    assert result.value.tolist() == [0.5, 1.5, 2.5]
+    assert result.sensor == (1, 2, 3)
+    assert result.first == "?"
+
+
+def test_list_buffer_fallback():
+    @dataclass
+    class Values:
+        value: list[int]
+
+    big = 2**70
+    result = accumulate(Values, [[1], [2], [big], [True]], ["value"], 1)
+    assert result.value == [1, 2, big, True]
+    assert type(result.value[-1]) is bool
+
+
+def test_consume_stream():
+    stream = read_csv(io.StringIO("time,value,tags\n1,1.5,a\n2,2,b\n3,3.25,a\n"))
+    result = TableAccumulator(Series).consume(stream, chunksize=2).finalize()
+    assert result == Series([1, 2, 3], [1.5, 2.0, 3.25], {"a", "b"})
+
+    stream = read_csv(io.StringIO("time,value,tags\n1,1.5,a\n"))
+    assert table_to_item(Series, stream) == Series([1], [1.5], {"a"})
+
+
+def test_stats():
+    stats = IngestStats()
+    accumulate(Series, table, header, 2, stats=stats)
+    target_stats = stats.target(Series)
+    assert target_stats.records == 1
+    assert target_stats.fields["value"].count == 1
+    assert target_stats.fields["value"].convert_time > 0
+
+
+def test_errors():
+    acc = TableAccumulator(Series)
+    with pytest.raises(ValueError, match="header"):
+        acc.add(table)
+    acc = TableAccumulator(Series, header)
+    acc.add(table[:2])
+    with pytest.raises(ValueError, match="differ"):
+        acc.add([[3, 3.0]], header[:2])
+    with pytest.raises(ValueError, match="Header"):
+        acc.add([[3, 3.0]])
+    acc.finalize()
+    with pytest.raises(ValueError, match="finalized"):
+        acc.add(table)
+    with pytest.raises(ValueError, match="finalized"):
+        acc.finalize()
+    with pytest.raises(ValueError, match="Missing parameter"):
+        TableAccumulator(Series, header).finalize()
+
+
+@dataclass
+class Large:
+    value: npt.NDArray[np.float64]
+    label: str = "x"
+
+
+def test_peak_memory():
+    nrows, size = 200_000, 10_000
+    tracemalloc.start()
+    acc = TableAccumulator(Large, ["value"])
+    for start in range(0, nrows, size):
+        acc.add(np.arange(start, start + size, dtype=np.float64).reshape(-1, 1))
+    result = acc.finalize()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert result.value.tolist() == list(map(float, range(nrows)))
+    assert result.label == "x"
+    # final array, buffer over-allocation and a chunk, far from concatenated chunks + result
+    assert peak < 1.5 * result.value.nbytes
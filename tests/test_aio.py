@@ -0,0 +1,104 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Annotated
+import pytest
+from dictgest import Path, Route, from_dicts
+from dictgest.aio import AsyncPlan, from_dicts_async
+from dictgest.converter import Convertor, date_convertor
+from dictgest.plan import compile_plan
+
+
+@dataclass
+class Article:
+    author: str
+    title: Annotated[str, Path("meta/headline")]
+    views: int = 0
+
+
+records = [
+    {"author": f"a{idx}", "meta": {"headline": f"t{idx}"}, "views": str(idx)}
+    for idx in range(100)
+]
+
+
+async def _pages(count=10, size=10):
+    for page in range(count):
+        await asyncio.sleep(0)
+        for record in records[page * size : (page + 1) * size]:
+            yield record
+
+
+async def _collect(aiter):
+    return [item async for item in aiter]
+
+
+def test_from_dicts_async():
+    expected = from_dicts(Article, records)
+    assert asyncio.run(_collect(from_dicts_async(Article, _pages(), chunk_size=7))) == expected
+    assert asyncio.run(_collect(from_dicts_async(Article, records))) == expected
+
+    with ThreadPoolExecutor(2) as pool:
+        result = from_dicts_async(
+            Article, _pages(), chunk_size=8, executor=pool, offload_threshold=8
+        )
+        assert asyncio.run(_collect(result)) == expected
+
+
+def test_event_loop_not_blocked():
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(ticker())
+        await asyncio.sleep(0)
+        start = ticks
+        result = await _collect(from_dicts_async(Article, records, chunk_size=10))
+        task.cancel()
+        assert len(result) == 100
+        return ticks - start
+
+    assert asyncio.run(main()) >= 10
+
+
+async def _lookup_author(name: str) -> str:
+    await asyncio.sleep(0)
+    if name == "missing":
+        raise KeyError(name)
+    return name.upper()
+
+
+async def _async_date(val) -> datetime:
+    await asyncio.sleep(0)
+    return date_convertor(val)
+
+
+@dataclass
+class Event:
+    author: str
+    date: datetime
+    views: int = 0
+
+
+def test_async_extractors_and_converters():
+    mappings = Convertor()
+    mappings.register(datetime, _async_date)
+    route = Route(author=Path("user/name", extractor=_lookup_author))
+    plan = compile_plan(Event, routing=route, type_mappings=mappings)
+    assert AsyncPlan(plan).is_async
+    assert not AsyncPlan(compile_plan(Article)).is_async
+
+    data = [{"user": {"name": "x"}, "date": "2022-01-02", "views": "3"}] * 5
+    result = from_dicts_async(Event, data, mappings, route, chunk_size=2)
+    assert asyncio.run(_collect(result)) == [Event("X", datetime(2022, 1, 2), 3)] * 5
+
+    # already converted values are kept, KeyError in extractors means missing
+    data = [{"user": {"name": "missing"}, "date": datetime(2022, 1, 2)}]
+    with pytest.raises(ValueError, match="Missing parameter author"):
+        asyncio.run(_collect(from_dicts_async(Event, data, mappings, route)))
@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+from typing import Annotated
+import types
+import pytest
+from dictgest import Path, Route, from_dict, from_dicts
+
+
+@dataclass
+class Article:
+    author: str
+    title: Annotated[str, Path("headline")]
+    views: int = 0
+
+
+records = [
+    {"author": "a", "headline": "first", "views": "10"},
+    {"author": "b", "headline": "second"},
+    {"author": "c", "headline": "third", "views": 3.2},
+]
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_from_dicts(backend):
+    result = from_dicts(Article, records, backend=backend)
+    assert isinstance(result, list)
+    assert result == [from_dict(Article, record) for record in records]
+    assert [article.views for article in result] == [10, 0, 3]
+
+    result = from_dicts(Article, iter(records), lazy=True, backend=backend)
+    assert isinstance(result, types.GeneratorType)
+    assert list(result) == from_dicts(Article, records)
+
+    assert from_dicts(Article, [], backend=backend) == []
+
+
+def test_from_dicts_routing():
+    @dataclass
+    class Item:
+        name: str
+        value: float
+
+    route = Route(name="meta/name", value="v")
+    data = ({"meta": {"name": idx}, "v": str(idx)} for idx in range(5))
+    result = from_dicts(Item, data, routing={Item: route})
+    assert result == [Item(str(idx), float(idx)) for idx in range(5)]
+
+    # routing is validated before the first item is requested
+    with pytest.raises(ValueError):
+        from_dicts(Item, records, routing=Route(missing="x"), lazy=True)
+
+    gen = from_dicts(Item, [{"v": 1}], lazy=True)
+    with pytest.raises(ValueError):
+        next(gen)
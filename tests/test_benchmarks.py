@@ -0,0 +1,24 @@
+import json
+from benchmarks import run
+from benchmarks.workloads import WORKLOADS
+
+quick = ["--size", "20", "--repeat", "1"]
+
+
+def test_workloads(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    assert run.main(quick + ["--save", str(baseline)]) == 0
+    results = json.loads(baseline.read_text())["results"]
+    assert set(results) == {workload.name for workload in WORKLOADS}
+    assert all(result["records_per_s"] > 0 for result in results.values())
+    assert all(result["peak_bytes_per_record"] > 0 for result in results.values())
+    assert all(result["blocks_per_record"] > 0 for result in results.values())
+
+    assert run.main(quick + ["-k", "flat", "--compare", str(baseline)]) in (0, 1)
+    assert "baseline rec/s" in capsys.readouterr().out
+
+    # an impossibly fast baseline is reported as a regression
+    for result in results.values():
+        result["records_per_s"] = 1e12
+    baseline.write_text(json.dumps({"results": results}))
+    assert run.main(quick + ["-k", "table", "--compare", str(baseline)]) == 1
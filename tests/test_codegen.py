@@ -0,0 +1,81 @@
+from dataclasses import dataclass
+from typing import Annotated, Any
+import pytest
+import dictgest as dg
+from dictgest import Path, Route, typecast
+from .utils import check_fields
+
+
+news_api_data = {
+    "author": "H.O. Ward",
+    "headline": "Will statically typed python become a thing?",
+    "details": {
+        "content": "Over the past 10 years ...[+]",
+        "views": "32",
+        "comments": [{"user": "a", "likes": 3}, {"user": "b", "likes": 10}],
+    },
+    "seo": {"tags": ["python", "programming"]},
+}
+
+
+@dataclass
+class ArticleStats:
+    views: Annotated[int, Path("details/views")]
+    likes: Annotated[list[int], Path("details/comments/likes")]
+    first: Annotated[list[str], Path("details/comments/*{likes=3}/user")]
+    num_tags: Annotated[int, Path("seo/tags", extractor=len)]
+    missing: Annotated[int, Path("details/missing")] = 0
+    extra: Any = None
+
+
+@typecast
+@dataclass
+class Stats:
+    views: int
+    comments: list
+
+
+@dataclass
+class Article:
+    author: str
+    title: str
+    stats: Stats
+
+
+def test_codegen_equivalence():
+    interpreted = dg.compile_plan(ArticleStats)
+    generated = dg.compile_plan(ArticleStats, backend="codegen")
+    assert interpreted.source is None
+    assert generated.source.startswith("def ingest(data):")
+    ref = interpreted(news_api_data)
+    assert generated(news_api_data) == ref
+    check_fields(
+        ref, {"views": 32, "likes": [3, 10], "first": ["a"], "num_tags": 2}
+    )
+
+
+def test_codegen_route():
+    route = Route(title="headline", stats="details")
+    ingest = dg.compile_plan(Article, routing=route, backend="codegen")
+    article = ingest(news_api_data)
+    assert article.title == news_api_data["headline"]
+    assert article.stats.views == 32
+    assert "data['headline']" in ingest.source
+
+
+def test_codegen_missing():
+    ingest = dg.compile_plan(ArticleStats, backend="codegen")
+    with pytest.raises(ValueError, match="Missing parameter views"):
+        ingest({"details": {}})
+
+    with pytest.raises(ValueError, match="Missing parameter title"):
+        dg.compile_plan(Article, backend="codegen")({"author": "x"})
+
+    with pytest.raises(ValueError):
+        dg.compile_plan(Article, backend="unknown")
+
+
+def test_codegen_no_conversion():
+    ingest = dg.compile_plan(ArticleStats, convert_types=False, backend="codegen")
+    assert ingest(news_api_data).views == "32"
+    assert "_convert" not in ingest.source
@@ -0,0 +1,98 @@
+import datetime
+from dataclasses import dataclass
+from typing import Annotated
+import pytest
+import dictgest as dg
+from dictgest import Path, Route, from_dict
+from dictgest import columnar
+from dictgest.columnar import convert_column
+
+
+def test_convert_column():
+    assert convert_column([1, 2.5, "3"], float) == [1.0, 2.5, 3.0]
+    assert convert_column([1, 2.5, True], float) == [1.0, 2.5, 1.0]
+    assert convert_column([1.7, -2.5], int) == [1, -2]
+    assert convert_column([1, True, "3"], int) == [1, True, 3]
+    assert convert_column(["1", 2], str) == ["1", "2"]
+    assert convert_column([[1, "2"]], list[int]) == [[1, 2]]
+    assert convert_column(["yes", 0], bool, dg.default_convertor) == [True, False]
+    assert convert_column([1, 2], None) == [1, 2]
+
+    with pytest.raises(ValueError):
+        convert_column([1.0, float("nan")], int)
+
+
+def test_convert_column_no_numpy(monkeypatch):
+    monkeypatch.setattr(columnar, "np", None)
+    assert convert_column([1, 2.5, "3"], float) == [1.0, 2.5, 3.0]
+    assert convert_column([1.7, -2.5], int) == [1, -2]
+
+
+@dataclass
+class Reading:
+    timestamp: datetime.datetime
+    temperature: float
+    humidity: Annotated[float, Path("hum", extractor=lambda val: val / 100)]
+    sensor: str = "default"
+
+
+header = ["hum", "temperature", "timestamp"]
+table = [
+    [40, "7.4", "1Dec2022"],
+    [60, 5, "2Dec2022"],
+    [55.5, 6.1, 1640988000],
+]
+
+
+def test_table_to_items():
+    rows = [dict(zip(header, row)) for row in table]
+    result = list(dg.table_to_items(Reading, table, header))
+    assert result == [from_dict(Reading, row) for row in rows]
+    assert result[0].humidity == 0.4
+    assert result[1].temperature == 5.0
+    assert result[2].sensor == "default"
+
+    transposed = [list(column) for column in zip(*table)]
+    assert list(dg.table_to_items(Reading, transposed, header, transpose=True)) == result
+
+    assert list(dg.table_to_items(Reading, [], header)) == []
+
+    with pytest.raises(ValueError, match="Missing parameter temperature"):
+        list(dg.table_to_items(Reading, [[1, 2]], ["hum", "timestamp"]))
+
+    with pytest.raises(ValueError):
+        list(dg.table_to_items(Reading, table + [[1, 2]], header))
+
+
+def test_table_to_items_nested_route():
+    @dataclass
+    class Item:
+        a: int
+        b: str
+
+    route = Route(a="x/y")
+    result = dg.table_to_items(Item, [[{"y": "1"}, 2]], ["x", "b"], routing=route)
+    assert list(result) == [Item(1, "2")]
+
+
+def test_table_to_item_columns():
+    @dataclass
+    class Readings:
+        timestamp: list[datetime.datetime]
+        temperature: tuple[float, ...]
+        hum: Annotated[float, Path("hum", extractor=sum)]
+
+    result = dg.table_to_item(Readings, table, header)
+    assert result.temperature == (7.4, 5.0, 6.1)
+    assert result.hum == 155.5
+    assert result.timestamp[0] == datetime.datetime(2022, 12, 1)
+
+
+def test_table_to_items_keyword_only():
+    class Item:
+        def __init__(self, a: int, *, b: str) -> None:
+            self.a = a
+            self.b = b
+
+    (item,) = dg.table_to_items(Item, [["1", 2]], ["a", "b"])
+    assert (item.a, item.b) == (1, "2")
@@ -0,0 +1,120 @@
+import io
+import json
+from dataclasses import dataclass
+from typing import Annotated, Optional
+import numpy as np
+import pytest
+from dictgest import Path, from_dicts, table_to_items
+from dictgest.columns import ColumnTable, RowView
+from dictgest.stream import from_json_stream
+
+
+@dataclass
+class Trade:
+    symbol: str
+    price: Annotated[float, Path("quote/price")]
+    size: int
+    buy: bool
+    venue: Optional[str] = None
+
+
+@dataclass
+class Row:
+    symbol: str
+    price: float
+    size: int
+
+
+records = [
+    {"symbol": f"s{idx}", "quote": {"price": f"{idx}.5"}, "size": str(idx), "buy": idx % 2 == 0}
+    for idx in range(10)
+]
+records[3]["venue"] = "x"
+
+
+@pytest.mark.parametrize("backend", ["codegen", "interpreter"])
+def test_from_dicts_columns(backend):
+    table = from_dicts(Trade, records, output="columns", backend=backend)
+    assert isinstance(table, ColumnTable)
+    assert len(table) == 10
+    assert table.names == ["symbol", "price", "size", "buy", "venue"]
+    assert table["price"] == [idx + 0.5 for idx in range(10)]
+    assert table["size"] == list(range(10))
+    assert table["venue"][3] == "x"
+    assert list(table.items()) == from_dicts(Trade, records)
+    assert table.item(-1) == from_dicts(Trade, records)[-1]
+
+
+def test_row_views():
+    table = from_dicts(Trade, records, output="columns")
+    row = table[2]
+    assert isinstance(row, RowView)
+    assert (row.symbol, row.price, row.size, row.buy) == ("s2", 2.5, 2, True)
+    assert row.as_dict()["venue"] is None
+    assert [row.size for row in table] == list(range(10))
+    assert "symbol='s2'" in repr(row)
+    with pytest.raises(AttributeError):
+        _ = row.missing
+    with pytest.raises(IndexError):
+        _ = table[10]
+
+
+def test_chunked_rows(monkeypatch):
+    monkeypatch.setattr("dictgest.columns._CHUNK_SIZE", 3)
+    table = from_dicts(Trade, records, output="columns")
+    assert table["symbol"] == [f"s{idx}" for idx in range(10)]
+    empty = from_dicts(Trade, [], output="columns")
+    assert len(empty) == 0 and empty.names == table.names
+
+
+def test_to_numpy_and_pandas():
+    table = from_dicts(Trade, records, output="columns")
+    arrays = table.to_numpy()
+    assert arrays["price"].dtype == np.float64
+    assert arrays["size"].dtype == np.int64
+    assert arrays["buy"].dtype == np.bool_
+    assert arrays["symbol"].dtype == object
+    # None values are kept in object arrays
+    assert arrays["venue"].dtype == object and arrays["venue"][0] is None
+
+    pd = pytest.importorskip("pandas")
+    frame = table.to_pandas()
+    assert isinstance(frame, pd.DataFrame)
+    assert list(frame.columns) == table.names
+    assert frame["size"].sum() == 45
+
+
+def test_table_to_items_columns():
+    header = ["symbol", "price", "size"]
+    data = [[f"s{idx}", str(idx), float(idx)] for idx in range(5)]
+    table = table_to_items(Row, data, header, output="columns")
+    assert table["price"] == [float(idx) for idx in range(5)]
+    assert table["size"] == list(range(5))
+    assert list(table.items()) == list(table_to_items(Row, data, header))
+
+    transposed = table_to_items(Row, list(map(list, zip(*data))), header, True, output="columns")
+    assert transposed.columns == table.columns
+
+    # row-wise fallback for paths that are not a single column
+    header = ["symbol", "quote", "size", "buy"]
+    table = table_to_items(Trade, [["s", {"price": "1"}, "2", True]], header, output="columns")
+    assert table.item(0) == Trade("s", 1.0, 2, True)
+
+    empty = table_to_items(Row, [], ["symbol", "price", "size"], output="columns")
+    assert len(empty) == 0
+
+
+def test_stream_columns():
+    text = "\n".join(json.dumps(record) for record in records)
+    table = from_json_stream(Trade, io.StringIO(text), output="columns")
+    assert table.columns == from_dicts(Trade, records, output="columns").columns
+
+
+def test_output_validation():
+    with pytest.raises(ValueError):
+        from_dicts(Trade, records, output="frame")
+    for kwargs in [{"lazy": True}, {"workers": 2}, {"errors": "collect"}]:
+        with pytest.raises(ValueError):
+            from_dicts(Trade, records, output="columns", **kwargs)
+    with pytest.raises(ValueError):
+        ColumnTable(Row, {"symbol": [1], "price": []})
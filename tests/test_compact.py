@@ -0,0 +1,156 @@
+import pickle
+from dataclasses import asdict, dataclass, field
+from typing import Annotated
+import pytest
+from dictgest import Path, compact, compile_plan, from_dict, from_dicts, typecast
+
+
+@dataclass
+class Article:
+    title: Annotated[str, Path("meta/headline")]
+    views: int
+    tags: list[str] = field(default_factory=list)
+    rating: float = 0.0
+
+    @property
+    def popular(self):
+        return self.views > 10
+
+
+class Plain:
+    def __init__(self, name: str, count: int = 1):
+        self.name = name
+        self.count = count
+
+    def describe(self):
+        return f"{self.name}x{self.count}"
+
+
+@typecast
+@dataclass
+class Author:
+    name: str
+    karma: int
+
+
+@dataclass
+class Post:
+    author: Author
+    title: str
+
+
+record = {"meta": {"headline": "news"}, "views": "12", "tags": ["a", 1]}
+
+
+@pytest.mark.parametrize("kind", ["slots", "tuple"])
+@pytest.mark.parametrize("backend", ["codegen", "interpreter"])
+def test_compact_dataclass(kind, backend):
+    CompactArticle = compact(Article, kind=kind)
+    assert CompactArticle.__name__ == "Article"
+    attr = "Compact" if kind == "slots" else "CompactTuple"
+    assert CompactArticle.__qualname__ == f"Article.{attr}"
+    assert getattr(Article, attr) is CompactArticle
+    assert compact(Article, kind=kind) is CompactArticle
+    item = compile_plan(CompactArticle, backend=backend)(record)
+    assert not hasattr(item, "__dict__")
+    assert isinstance(item, CompactArticle)
+    assert (item.title, item.views, item.tags, item.rating) == ("news", 12, ["a", "1"], 0.0)
+    assert item.popular
+    assert item == CompactArticle("news", 12, ["a", "1"])
+    assert repr(item) == repr(from_dict(Article, record)).replace("Article", f"Article.{attr}")
+    assert asdict(item) == asdict(from_dict(Article, record))
+
+
+def test_compact_slots_plain_class():
+    CompactPlain = compact(Plain)
+    items = from_dicts(CompactPlain, [{"name": "a", "count": "3"}, {"name": "b"}])
+    assert [item.describe() for item in items] == ["ax3", "bx1"]
+    assert not hasattr(items[0], "__dict__")
+    items[0].count = 5
+    assert items[0].count == 5
+    with pytest.raises(AttributeError):
+        items[0].other = 1
+
+
+def test_compact_tuple():
+    CompactArticle = compact(Article, kind="tuple")
+    item = from_dict(CompactArticle, record)
+    assert isinstance(item, tuple)
+    assert tuple(item) == ("news", 12, ["a", "1"], 0.0)
+    assert CompactArticle("x", 1) == ("x", 1, [], 0.0)
+    assert CompactArticle("x", 1).tags is not CompactArticle("y", 2).tags
+    with pytest.raises(AttributeError):
+        item.views = 3
+
+
+def test_compact_decorator_and_typecast():
+    @compact
+    @dataclass
+    class Point:
+        x: float
+        y: float
+
+    assert not hasattr(from_dict(Point, {"x": "1", "y": 2}), "__dict__")
+
+    CompactAuthor = compact(Author, kind="tuple")
+    assert CompactAuthor.__typecast__.target is CompactAuthor
+
+    @dataclass
+    class CompactPost:
+        author: CompactAuthor
+        title: str
+
+    post = from_dict(CompactPost, {"author": {"name": "x", "karma": "3"}, "title": "t"})
+    assert post.author == CompactAuthor("x", 3)
+    assert isinstance(post.author, CompactAuthor)
+
+
+@pytest.mark.parametrize("kind", ["slots", "tuple"])
+def test_compact_pickle(kind):
+    CompactArticle = compact(Article, kind=kind)
+    item = from_dict(CompactArticle, record)
+    copy = pickle.loads(pickle.dumps(item))
+    assert type(copy) is CompactArticle
+    assert copy == item
+
+    items = from_dicts(CompactArticle, [record] * 5, workers=2, chunksize=2)
+    assert items == [item] * 5
+    assert all(type(result) is CompactArticle for result in items)
+
+
+@compact
+@dataclass
+class Decorated:
+    name: str
+    count: int = 0
+
+
+def test_compact_decorator_pickle():
+    item = from_dict(Decorated, {"name": "x", "count": "2"})
+    assert pickle.loads(pickle.dumps(item)) == item
+    assert from_dicts(Decorated, [{"name": "x", "count": "2"}], workers=2) == [item]
+
+
+def test_compact_positional_codegen():
+    source = compile_plan(compact(Article), backend="codegen").source
+    assert "return _target(_v0, _v1, _v2, _v3)" in source
+
+
+def test_compact_kind_validation():
+    with pytest.raises(ValueError):
+        compact(Article, kind="struct")
+
+
+def test_compact_existing_attribute():
+    @dataclass
+    class Shape:
+        name: str
+        Compact = "user value"
+
+    with pytest.raises(ValueError, match="Shape.Compact is already defined"):
+        compact(Shape)
+    assert Shape.Compact == "user value"
+    # the other kind is stored in its own attribute, the user value is kept
+    CompactShape = compact(Shape, kind="tuple")
+    assert Shape.CompactTuple is CompactShape and CompactShape.Compact == "user value"
+    assert compact(CompactShape, kind="tuple") is CompactShape
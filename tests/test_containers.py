@@ -0,0 +1,42 @@
+from collections import OrderedDict
+import pytest
+from dictgest.cast import convert
+
+
+def test_iterables():
+    values = [1, 2, 3]
+    result = convert(values, list[int])
+    assert result == values and result is not values
+    assert convert(["1", 2.0, True], list[int]) == [1, 2, True]
+    assert convert(("1", "2", "2"), set[int]) == {1, 2}
+    assert convert(["1", "2"], frozenset[float]) == frozenset({1.0, 2.0})
+    assert convert(iter(["1", "2"]), list[int]) == [1, 2]
+    assert convert(["1", 2, 3.5], tuple[float, ...]) == (1.0, 2.0, 3.5)
+    assert convert([["1"], [2]], list[list[int]]) == [[1], [2]]
+    assert convert([], list[int]) == []
+
+    with pytest.raises(TypeError):
+        convert(1, list[int])
+    with pytest.raises(ValueError):
+        convert(["x"], list[int])
+
+
+def test_tuples():
+    assert convert(["1", 2, "3.5"], tuple[int, str, float]) == (1, "2", 3.5)
+    assert convert(iter(["1", 2]), tuple[int, str]) == (1, "2")
+    with pytest.raises(ValueError, match="Cannot convert 3 elements"):
+        convert([1, 2, 3], tuple[int, str])
+
+
+def test_dicts():
+    data = {"a": 1, "b": 2}
+    result = convert(data, dict[str, int])
+    assert result == data and result is not data
+    assert convert({1: "1", "b": 2.0}, dict[str, int]) == {"1": 1, "b": 2}
+    assert convert({"a": "1"}, dict[str, int]) == {"a": 1}
+    assert convert({1: 2}, dict[str, int]) == {"1": 2}
+    assert convert({"a": ["1"]}, dict[str, list[float]]) == {"a": [1.0]}
+    assert convert(OrderedDict(a="1"), dict[str, int]) == {"a": 1}
+
+    with pytest.raises(TypeError):
+        convert([1], dict[str, int])
@@ -0,0 +1,98 @@
+from datetime import datetime
+import pickle
+import pytest
+from dateutil import tz
+from dictgest.converter import DateConvertor, date_convertor, default_convertor
+
+
+samples = [
+    "2022-01-02",
+    "2022-01-02T10:20:30",
+    "2022-01-02 10:20:30.123",
+    "2022-01-02T10:20:30+02:00",
+    "2022-01-02T10:20:30Z",
+    "2022/01/02 10:20:30",
+    "01/02/2022",
+    "13/02/2022",
+    "02.01.2022 10:20",
+    "2 Jan 2022",
+    "Jan 2, 2022",
+    "Sun, 02 Jan 2022 10:20:30 +0000",
+    "January 2 2022 10:20",
+    "1641118830",
+    " 1641118830.5 ",
+    "-1e3",
+    "1_641_118_830",
+    1641118830,
+    1641118830.25,
+]
+
+
+@pytest.mark.parametrize("cache_size", [0, 16])
+def test_same_as_dateutil(cache_size):
+    conv = DateConvertor(cache_size=cache_size)
+    for _ in range(2):  # the second round uses learned formats/cache
+        for sample in samples:
+            assert conv(sample) == date_convertor(sample), sample
+
+    legacy = DateConvertor(learn_formats=False)
+    assert [legacy(sample) for sample in samples] == [conv(sample) for sample in samples]
+    date = datetime(2022, 1, 2)
+    assert conv(date) is date
+    with pytest.raises(ValueError):
+        conv("not a date")
+
+
+@pytest.mark.parametrize("cache_size", [0, 16])
+def test_time_zones(cache_size):
+    conv = DateConvertor(cache_size=cache_size)
+    offsets = [
+        "2022-01-02T10:20:30+02:00",
+        "2022-01-02T10:20:30.5-05:30",
+        "Sun, 02 Jan 2022 10:20:30 +0200",
+        "Mon, 03 Jan 2022 10:20:30 -0100",
+    ]
+    for _ in range(2):
+        for sample in offsets:
+            result, expected = conv(sample), date_convertor(sample)
+            assert (result, result.tzinfo) == (expected, expected.tzinfo), sample
+    # dateutil gives UTC strings tzutc, or tzlocal if the local time zone is named UTC
+    for sample in ["2022-01-02T10:20:30+00:00", "Sun, 02 Jan 2022 10:20:30 +0000"] * 2:
+        result = conv(sample)
+        assert result == date_convertor(sample) and result.utcoffset().total_seconds() == 0
+        assert result.tzinfo in (tz.UTC, tz.tzlocal())
+
+
+def test_learned_formats():
+    conv = DateConvertor(cache_size=0)
+    assert conv("01/02/2022") == datetime(2022, 1, 2)
+    assert conv.formats["00/00/0000"] == "%m/%d/%Y"
+    # same shape, not matching the learned format: dateutil is used
+    assert conv("13/02/2022") == datetime(2022, 2, 13)
+    assert conv("02/15/2022") == datetime(2022, 2, 15)
+
+    conv("January 2 2022 10:20")
+    assert conv.formats["January 0 0000 00:00"] is None
+    assert "0000-00-00" not in conv.formats  # ISO strings need no format
+
+
+@pytest.mark.parametrize(
+    "first, second, expected",
+    [
+        ("13.03.2020", "12.03.2020", datetime(2020, 12, 3)),
+        ("13/02/2020", "01/02/2020", datetime(2020, 1, 2)),
+    ],
+)
+def test_day_first_formats(first, second, expected):
+    conv = DateConvertor(cache_size=0)
+    assert conv(first) == date_convertor(first)
+    assert conv.formats[first.translate(str.maketrans("0123456789", "0" * 10))] in conv.DAY_FIRST
+    # a learned day first format does not apply to strings dateutil reads month first
+    assert conv(second) == date_convertor(second) == expected
+
+
+def test_pickle_and_default():
+    conv = pickle.loads(pickle.dumps(DateConvertor(cache_size=8, learn_formats=False)))
+    assert (conv.cache_size, conv.learn_formats) == (8, False)
+    assert conv("2022-01-02") == datetime(2022, 1, 2)
+    assert isinstance(default_convertor[datetime], DateConvertor)
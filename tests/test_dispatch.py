@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+from datetime import datetime
+import pytest
+from dictgest import from_dict, from_dicts, typecast
+from dictgest.cast import convert, resolve_converter
+from dictgest.converter import Convertor, date_convertor
+
+
+def _mappings() -> Convertor:
+    mappings = Convertor()
+    mappings.register(datetime, date_convertor)
+    return mappings
+
+
+class Unit:
+    def __init__(self, val) -> None:
+        self.val = val
+
+
+class Hex:
+    __hash__ = None  # type: ignore
+
+    def __call__(self, val):
+        return int(val, 16)
+
+
+def test_resolve_cache():
+    mappings = _mappings()
+    conv = resolve_converter(list[int], mappings)
+    assert conv is resolve_converter(list[int], mappings)
+    assert conv(["1", 2.0]) == [1, 2]
+    assert resolve_converter(list[int], _mappings()) is not conv
+    assert resolve_converter(datetime, mappings)("2022-01-02") == datetime(2022, 1, 2)
+    assert resolve_converter(None)("x") == "x"
+
+    # plain dictionaries are keyed by their entries, changing them invalidates the cache
+    plain = {datetime: date_convertor}
+    conv = resolve_converter(list[int], plain)
+    assert resolve_converter(list[int], plain) is conv
+    plain[int] = lambda val: 42
+    assert resolve_converter(list[int], plain) is not conv
+    assert convert("1", int, plain) == 42
+    assert convert(["1"], list[int], plain) == [42]
+    del plain[int]
+    assert convert(["1"], list[int], plain) == [1]
+    # mappings with unhashable converters are resolved on each call
+    unhashable = {int: Hex()}
+    assert resolve_converter(list[int], unhashable) is not resolve_converter(
+        list[int], unhashable
+    )
+    assert convert(["ff"], list[int], unhashable) == [255]
+
+    with pytest.raises(TypeError):
+        resolve_converter(dict[str, int])([1])
+    with pytest.raises(ValueError):
+        convert(1, "int")
+
+
+def test_register_invalidates():
+    mappings = _mappings()
+    conv = resolve_converter(int, mappings)
+    assert conv("3") == 3
+    mappings.register(int, lambda val: 42)
+    assert resolve_converter(int, mappings) is not conv
+    assert convert("3", int, mappings) == 42
+    assert convert(["3"], list[int], mappings) == [42]
+
+
+@dataclass
+class Reading:
+    unit: Unit
+    value: int
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_plans_follow_registrations(backend):
+    mappings = _mappings()
+    data = [{"unit": "m", "value": "3"}]
+    assert from_dicts(Reading, data, mappings, backend=backend)[0].value == 3
+    mappings.register(int, lambda val: 42)
+    assert from_dicts(Reading, data, mappings, backend=backend)[0].value == 42
+
+
+def test_typecast_invalidates():
+    @dataclass
+    class Inner:
+        value: int
+
+    @dataclass
+    class Outer:
+        inner: Inner
+
+    # without @typecast the dictionary is passed to the constructor as it is
+    assert from_dict(Outer, {"inner": {"value": "1"}}).inner == Inner({"value": "1"})
+    typecast(Inner)
+    assert from_dict(Outer, {"inner": {"value": "1"}}).inner == Inner(1)
@@ -0,0 +1,132 @@
+from dataclasses import dataclass
+from typing import Annotated
+import pytest
+from dictgest import Path, from_dicts, typecast
+from dictgest.errors import IngestResult, RecordError, TooManyErrors
+from dictgest.stats import IngestStats
+
+
+@typecast
+@dataclass
+class Author:
+    name: str
+    karma: int
+
+
+@dataclass
+class Article:
+    title: Annotated[str, Path("meta/headline")]
+    views: int
+    author: Author
+
+    def __post_init__(self):
+        if self.views < 0:
+            raise ValueError("negative views")
+
+
+def _record(idx, views=None, **extra):
+    record = {
+        "meta": {"headline": f"t{idx}"},
+        "views": str(idx) if views is None else views,
+        "author": {"name": "x", "karma": "3"},
+    }
+    record.update(extra)
+    return record
+
+
+def _bad_records():
+    records = [_record(idx) for idx in range(6)]
+    records[1] = _record(1, views="many")
+    del records[3]["meta"]["headline"]
+    records[4] = _record(4, author={"name": "y", "karma": "lots"})
+    records[5] = _record(5, views=-1)
+    return records
+
+
+@pytest.mark.parametrize("backend", ["codegen", "interpreter"])
+def test_collect_errors(backend):
+    result = from_dicts(Article, _bad_records(), errors="collect", backend=backend)
+    assert isinstance(result, IngestResult)
+    items, errors = result
+    assert [item.title for item in items] == ["t0", "t2"]
+    assert [err.position for err in errors] == [1, 3, 4, 5]
+
+    views, missing, nested, target = errors
+    assert views.field == "views" and views.path == "views"
+    assert views.value == "many"
+    assert isinstance(views.exception, ValueError)
+
+    assert missing.field == "title" and missing.path == "meta/headline"
+    assert missing.value is None
+    assert "Missing parameter title" in str(missing.exception)
+
+    assert nested.field == "author"
+    assert nested.value == {"name": "y", "karma": "lots"}
+
+    assert target.field is None and target.path is None
+    assert target.value["views"] == -1
+    assert str(target.exception) == "negative views"
+    assert str(target).startswith("record[5] target: ValueError")
+
+
+@dataclass
+class Votes:
+    title: Annotated[str, Path("meta/headline")]
+    votes: Annotated[int, Path("meta/votes", extractor=lambda val: val["up"])]
+
+
+@pytest.mark.parametrize("backend", ["codegen", "interpreter"])
+def test_collect_path_errors(backend):
+    records = [
+        {"meta": "flat"},  # the path cannot go through a string
+        {"meta": {"headline": "t", "votes": 3}},  # the extractor fails
+    ]
+    _, errors = from_dicts(Votes, records, errors="collect", backend=backend)
+    flat, extractor = errors
+    assert flat.field == "title" and flat.path == "meta/headline"
+    assert flat.value == "flat" and isinstance(flat.exception, TypeError)
+    assert extractor.field == "votes" and extractor.value == 3
+
+
+def test_collect_without_errors():
+    records = [_record(idx) for idx in range(3)]
+    items, errors = from_dicts(Article, records, errors="collect")
+    assert items == from_dicts(Article, records)
+    assert errors == []
+
+
+def test_max_errors():
+    records = _bad_records()
+    items, errors = from_dicts(Article, records, errors="collect", max_errors=4)
+    assert len(errors) == 4
+
+    with pytest.raises(TooManyErrors) as exc_info:
+        from_dicts(Article, records, errors="collect", max_errors=1)
+    items, errors = exc_info.value.result
+    assert [item.title for item in items] == ["t0", "t2"]
+    assert [err.position for err in errors] == [1, 3]
+    assert isinstance(exc_info.value, ValueError)
+
+
+def test_collect_with_stats():
+    stats = IngestStats()
+    items, errors = from_dicts(Article, _bad_records(), errors="collect", stats=stats)
+    assert len(items) == 2 and len(errors) == 4
+    assert stats.target(Article).records == 2
+    assert stats.target(Article).field("views").failures == 1
+
+
+def test_error_mode_validation():
+    with pytest.raises(ValueError):
+        from_dicts(Article, [], errors="ignore")
+    with pytest.raises(ValueError):
+        from_dicts(Article, [], errors="collect", lazy=True)
+    with pytest.raises(ValueError):
+        from_dicts(Article, [], errors="collect", workers=2)
+    with pytest.raises(ValueError):
+        from_dicts(Article, _bad_records())
+
+
+def test_record_error_str():
+    err = RecordError(3, "views", "stats/views", "x", ValueError("bad"))
+    assert str(err) == "record[3] field 'views' (path 'stats/views'): ValueError: bad"
@@ -0,0 +1,155 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Annotated, Optional
+import numpy as np
+import pytest
+from dictgest import Path, Route, table_to_item, table_to_items
+from dictgest.columnar import frame_columns
+
+pd = pytest.importorskip("pandas")
+pa = pytest.importorskip("pyarrow")
+
+
+@dataclass
+class Trade:
+    symbol: str
+    price: float
+    size: int
+    buy: bool
+
+
+@dataclass
+class Series:
+    price: list[float]
+    size: list[int]
+
+
+@dataclass
+class Event:
+    name: str
+    date: datetime
+    count: Optional[int] = None
+
+
+@dataclass
+class Nested:
+    symbol: str
+    meta: Annotated[str, Path("info/source")]
+
+
+columns = {
+    "symbol": ["a", "b", "c"],
+    "price": [1.5, 2.0, 3.25],
+    "size": [10, 20, 30],
+    "buy": [True, False, True],
+    "unused": ["x", "y", "z"],
+}
+expected = [Trade("a", 1.5, 10, True), Trade("b", 2.0, 20, False), Trade("c", 3.25, 30, True)]
+
+
+def _sources():
+    frame = pd.DataFrame(columns)
+    table = pa.table(columns)
+    structured = np.array(
+        list(zip(*columns.values())),
+        dtype=[("symbol", "U1"), ("price", "f8"), ("size", "i8"), ("buy", "?"), ("unused", "U1")],
+    )
+    return [frame, table, table.to_batches()[0], structured]
+
+
+@pytest.mark.parametrize("source", _sources(), ids=["pandas", "arrow", "batch", "structured"])
+def test_frame_sources(source):
+    items = list(table_to_items(Trade, source))
+    assert items == expected
+    assert [type(item.size) for item in items] == [int] * 3
+    assert [type(item.price) for item in items] == [float] * 3
+    assert table_to_items(Trade, source, output="columns")["size"] == [10, 20, 30]
+
+    item = table_to_item(Series, source)
+    assert item == Series([1.5, 2.0, 3.25], [10, 20, 30])
+
+
+def test_frame_only_needed_columns(monkeypatch):
+    read = []
+    original = pd.DataFrame.iloc.fget
+
+    def iloc(frame):
+        read.append(frame)
+        return original(frame)
+
+    frame = pd.DataFrame(columns)
+    monkeypatch.setattr(pd.DataFrame, "iloc", property(iloc))
+    list(table_to_items(Trade, frame))
+    assert len(read) == 4  # "unused" is not read
+
+
+def test_frame_header_and_routing():
+    frame = pd.DataFrame({"s": ["a"], "p": ["1.5"], "n": [10], "b": [1]})
+    items = list(table_to_items(Trade, frame, header=["symbol", "price", "size", "buy"]))
+    assert items == [Trade("a", 1.5, 10, True)]
+
+    route = Route(symbol="s", price="p", size="n", buy="b")
+    assert list(table_to_items(Trade, pa.table(frame), routing=route)) == items
+
+    with pytest.raises(ValueError):
+        list(table_to_items(Trade, frame, header=["symbol"]))
+    with pytest.raises(ValueError):
+        list(table_to_items(Trade, frame, transpose=True))
+    with pytest.raises(ValueError):
+        list(table_to_items(Trade, [["a", 1, 1, True]]))
+
+
+def test_frame_nulls_and_dates():
+    dates = [datetime(2022, 1, 2, 3, 4, 5), datetime(2023, 5, 6)]
+    frame = pd.DataFrame(
+        {
+            "name": ["x", "y"],
+            "date": dates,
+            "count": pd.array([1, None], dtype="Int64"),
+        }
+    )
+    expected_events = [Event("x", dates[0], 1), Event("y", dates[1], None)]
+    assert list(table_to_items(Event, frame)) == expected_events
+    assert list(table_to_items(Event, pa.table(frame))) == expected_events
+    events = list(table_to_items(Event, pa.table(frame)))
+    assert type(events[0].date) is datetime and events[1].count is None
+
+
+@dataclass
+class Reading:
+    value: float
+    count: Optional[int] = None
+    label: Optional[str] = None
+
+
+def test_frame_missing_numbers():
+    # pandas stores int columns with missing values as float64 NaN
+    frame = pd.DataFrame({"value": [1.5, None], "count": [1, None], "label": ["a", None]})
+    assert frame["count"].dtype == np.float64
+    readings = list(table_to_items(Reading, frame))
+    assert readings[0] == Reading(1.5, 1, "a")
+    assert np.isnan(readings[1].value) and readings[1].count is None
+    assert readings[1].label is None
+    assert type(readings[0].count) is int
+    optional = frame.fillna({"value": 0.0})
+    assert list(table_to_items(Reading, optional)) == list(
+        table_to_items(Reading, pa.table(optional))
+    )
+    columns, _ = frame_columns(frame, None)
+    assert list(columns["value"]) == [1.5, None]
+
+
+def test_frame_nanosecond_timestamps():
+    dates = pd.Series([datetime(2022, 1, 2, 3, 4, 5), None], dtype="datetime64[ns]")
+    frame = pd.DataFrame({"date": dates})
+    for source in (frame, pa.table(frame)):
+        columns, _ = frame_columns(source, None)
+        assert columns["date"] == [datetime(2022, 1, 2, 3, 4, 5), None]
+        assert type(columns["date"][0]) is datetime
+
+
+def test_frame_row_fallback():
+    frame = pd.DataFrame({"symbol": ["a", "b"], "info": [{"source": "x"}, {"source": "y"}]})
+    assert list(table_to_items(Nested, frame)) == [Nested("a", "x"), Nested("b", "y")]
+    table = table_to_items(Nested, pa.table(frame), output="columns")
+    assert table["meta"] == ["x", "y"]
@@ -0,0 +1,117 @@
+import pickle
+from dataclasses import dataclass
+from typing import Annotated
+import pytest
+from dictgest import Path, Route, from_dict, lazy_from_dict, typecast
+from dictgest.converter import Convertor
+from dictgest.lazy import is_lazy, lazy_from_dicts, materialize
+
+
+@typecast
+@dataclass
+class Reading:
+    value: float
+    unit: str
+
+
+@dataclass
+class Record:
+    name: str
+    count: Annotated[int, Path("stats/count")]
+    readings: list[Reading]
+    label: str = "none"
+
+    @property
+    def total(self):
+        return sum(reading.value for reading in self.readings)
+
+
+@dataclass(frozen=True)
+class Point:
+    x: float
+    y: float
+
+
+data = {
+    "name": "sensor",
+    "stats": {"count": "3"},
+    "readings": [{"value": "1.5", "unit": "C"}, {"value": 2, "unit": "C"}],
+}
+
+
+def _counting_mappings():
+    calls = []
+    mappings = Convertor()
+
+    def to_int(val):
+        calls.append(val)
+        return int(val)
+
+    mappings.register(int, to_int)
+    return mappings, calls
+
+
+def test_lazy_values():
+    obj = lazy_from_dict(Record, data)
+    assert isinstance(obj, Record)
+    assert is_lazy(obj)
+    assert obj.name == "sensor"
+    assert obj.count == 3
+    assert obj.readings == [Reading(1.5, "C"), Reading(2.0, "C")]
+    assert obj.label == "none"
+    assert obj.total == 3.5
+    assert materialize(obj) == from_dict(Record, data)
+    assert type(materialize(obj)) is Record
+    assert repr(obj) == repr(from_dict(Record, data))
+
+
+def test_lazy_on_access_and_memoized():
+    mappings, calls = _counting_mappings()
+    obj = lazy_from_dict(Record, data, type_mappings=mappings)
+    assert obj.name == "sensor"
+    assert not calls
+    assert "readings" not in obj.__dict__
+    assert obj.count == 3
+    assert obj.count == 3
+    assert calls == ["3"]
+    assert "readings" not in obj.__dict__
+
+
+def test_lazy_errors_on_access():
+    obj = lazy_from_dict(Record, {"name": "x", "readings": []})
+    assert obj.name == "x"
+    with pytest.raises(ValueError):
+        _ = obj.count
+    bad = lazy_from_dict(Record, {**data, "stats": {"count": "many"}})
+    with pytest.raises(ValueError):
+        _ = bad.count
+
+
+def test_lazy_routing_and_assignment():
+    route = Route(name="id", label="meta/label")
+    record = {"id": "a", "meta": {"label": "x"}, "stats": {"count": 4}, "readings": []}
+    obj = lazy_from_dict(Record, record, routing=route)
+    assert (obj.name, obj.label, obj.count) == ("a", "x", 4)
+    obj.count = 5
+    assert obj.count == 5
+
+
+def test_lazy_frozen_and_pickle():
+    # a picklable convertor, the default one is modified by other tests
+    mappings = Convertor()
+    point = lazy_from_dict(Point, {"x": "1", "y": 2}, type_mappings=mappings)
+    assert point.x == 1.0
+    assert point == lazy_from_dict(Point, {"x": 1, "y": "2"}, type_mappings=mappings)
+    with pytest.raises(AttributeError):
+        point.x = 3
+    restored = pickle.loads(pickle.dumps(point))
+    assert type(restored) is Point
+    assert restored == Point(1.0, 2.0)
+
+
+def test_lazy_batch():
+    items = lazy_from_dicts(Point, [{"x": idx, "y": 0} for idx in range(3)])
+    assert [item.x for item in items] == [0.0, 1.0, 2.0]
+    assert len({type(item) for item in items}) == 1
+    assert materialize(Point(1, 2)) == Point(1, 2)
+    assert not is_lazy(Point(1, 2))
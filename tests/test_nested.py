@@ -0,0 +1,125 @@
+from dataclasses import dataclass
+from typing import Annotated, Optional
+import pytest
+from dictgest import Chart, Path, Route, from_dict, from_dicts, typecast
+from dictgest.cast import resolve_converter
+from dictgest.converter import Convertor
+from dictgest.plan import TypecastPlan, clear_cache
+
+
+@typecast
+@dataclass
+class Reading:
+    value: float
+    unit: str = "C"
+
+
+@dataclass
+class Sensor:
+    name: str
+    readings: list[Reading]
+    by_kind: dict[str, Reading]
+    pair: tuple[Reading, Reading]
+
+
+@typecast
+@dataclass
+class Node:
+    name: str
+    children: list["Node"]
+
+
+# forward references are not evaluated by the plans
+Node.__init__.__annotations__["children"] = list[Node]
+
+
+@dataclass
+class Author:
+    name: str
+    karma: int
+
+
+@dataclass
+class Article:
+    title: str
+    authors: list[Author]
+    editors: dict[str, Author]
+    main: Optional[Author] = None
+
+
+sensor = {
+    "name": "s1",
+    "readings": [{"value": "1.5"}, {"value": 2, "unit": "F"}],
+    "by_kind": {"temp": {"value": "3"}},
+    "pair": [{"value": 1}, {"value": "2"}],
+}
+
+
+def test_typecast_in_containers():
+    item = from_dict(Sensor, sensor)
+    assert item.readings == [Reading(1.5), Reading(2.0, "F")]
+    assert item.by_kind == {"temp": Reading(3.0)}
+    assert item.pair == (Reading(1.0), Reading(2.0))
+
+
+def test_typecast_plan_callable():
+    assert isinstance(Reading.__typecast__, TypecastPlan)
+    assert Reading.__typecast__({"value": "4"}) == Reading(4.0)
+    route = Route(value="v")
+    assert Reading.__typecast__({"v": "4"}, routing=route) == Reading(4.0)
+
+
+def test_nested_plan_resolved_once(monkeypatch):
+    mappings = Convertor()
+    converter = resolve_converter(list[Reading], mappings)
+    assert converter([{"value": 1}]) == [Reading(1.0)]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("plan compiled again")
+
+    # the sub plan is resolved on first use and then called directly
+    monkeypatch.setattr("dictgest.plan.compile_plan", fail)
+    monkeypatch.setattr("dictgest.plan.build_plan", fail)
+    assert converter([{"value": "2"}, {"value": 3}]) == [Reading(2.0), Reading(3.0)]
+
+
+def test_self_referencing_type():
+    clear_cache()
+    leaf = {"name": "c", "children": []}
+    tree = {"name": "a", "children": [{"name": "b", "children": [leaf]}]}
+    node = from_dict(Node, tree)
+    assert node.children[0].children[0] == Node("c", [])
+
+
+def test_routing_carried_through_containers():
+    chart = Chart(
+        {
+            Article: Route(title="headline", authors="by", editors="eds", main="owner"),
+            Author: Route(name="login", karma="stats/karma"),
+        }
+    )
+    data = {
+        "headline": "t",
+        "by": [{"login": "x", "stats": {"karma": "3"}}, {"login": "y", "stats": {"karma": 4}}],
+        "eds": {"chief": {"login": "z", "stats": {"karma": "1"}}},
+        "owner": {"login": "w", "stats": {"karma": "2"}},
+    }
+    articles = [from_dict(Article, data, routing=chart)]
+    articles += from_dicts(Article, [data], routing=chart)
+    for article in articles:
+        assert article.authors == [Author("x", 3), Author("y", 4)]
+        assert article.editors == {"chief": Author("z", 1)}
+        assert article.main == Author("w", 2)
+
+
+def test_routed_typecast_in_list_with_annotations():
+    @dataclass
+    class Feed:
+        items: Annotated[list[Reading], Path("data/items")]
+
+    routing = {Reading: Route(value="val", unit="u")}
+    feed = from_dict(Feed, {"data": {"items": [{"val": "1", "u": "K"}]}}, routing=routing)
+    assert feed.items == [Reading(1.0, "K")]
+
+    with pytest.raises(ValueError):
+        from_dict(Feed, {"data": {"items": [{"val": "x", "u": "K"}]}}, routing=routing)
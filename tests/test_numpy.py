@@ -0,0 +1,68 @@
+from dataclasses import dataclass
+import pytest
+import dictgest as dg
+from dictgest.cast import convert
+from dictgest.columnar import convert_column
+
+np = pytest.importorskip("numpy")
+npt = pytest.importorskip("numpy.typing")
+
+
+def test_convert_ndarray():
+    arr = np.arange(4, dtype=np.float64)
+    assert convert(arr, npt.NDArray[np.float64]) is arr
+    assert convert(arr, np.ndarray) is arr
+
+    res = convert(["1.5", 2, 3], npt.NDArray[np.float64])
+    assert res.dtype == np.float64
+    assert res.tolist() == [1.5, 2.0, 3.0]
+
+    res = convert(arr, npt.NDArray[np.int32])
+    assert res.dtype == np.int32
+    assert convert([1, 2], np.ndarray).tolist() == [1, 2]
+
+
+@dataclass
+class SenzorData:
+    temperatures: npt.NDArray[np.float64]
+    humidity: npt.NDArray[np.float32]
+    ids: list[int]
+
+
+def test_table_to_item_ndarray():
+    header = ["temperatures", "humidity", "ids"]
+    table = np.array([[7.4, 0.4, 1], [5.4, 0.6, 2], [6.1, 0.5, 3]])
+    result = dg.table_to_item(SenzorData, table, header)
+    assert np.shares_memory(result.temperatures, table)
+    assert result.temperatures.tolist() == [7.4, 5.4, 6.1]
+    assert result.humidity.dtype == np.float32
+    assert result.ids == [1, 2, 3]
+    assert type(result.ids[0]) is int
+
+    result = dg.table_to_item(SenzorData, table.T.copy(), header, transpose=True)
+    assert result.temperatures.tolist() == [7.4, 5.4, 6.1]
+
+    result = dg.table_to_item(SenzorData, table.tolist(), header)
+    assert result.humidity.tolist() == pytest.approx([0.4, 0.6, 0.5])
+
+    with pytest.raises(ValueError):
+        dg.table_to_item(SenzorData, table, header[:2])
+
+
+def test_table_to_items_ndarray():
+    @dataclass
+    class Point:
+        temperature: float
+        humidity: int
+        valid: bool
+
+    table = np.array([[7.4, 1.0, 1], [5.4, 2.0, 0]])
+    header = ["temperature", "humidity", "valid"]
+    result = list(dg.table_to_items(Point, table, header))
+    assert result == [Point(7.4, 1, True), Point(5.4, 2, False)]
+    assert type(result[0].temperature) is float
+
+    assert convert_column(np.array([1, 2]), float) == [1.0, 2.0]
+    assert convert_column(np.array([True]), int) == [1]
+    assert convert_column(np.array(["a"]), str) == ["a"]
+    assert convert_column(np.array([1.5]), str) == ["1.5"]
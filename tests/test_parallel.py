@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Annotated
+import pickle
+import types
+import pytest
+import dictgest as dg
+from dictgest import Path, Route, from_dicts
+from dictgest.converter import Convertor, date_convertor
+
+
+@dataclass
+class Article:
+    author: str
+    title: Annotated[str, Path("meta/headline")]
+    views: int = 0
+
+
+@dataclass
+class Event:
+    name: str
+    date: datetime
+    count: int = 0
+
+
+def _upper(val: str) -> str:
+    return val.upper()
+
+
+def _double(val) -> int:
+    return int(val) * 2
+
+
+def _mappings() -> Convertor:
+    # other tests register local functions in the default convertor
+    mappings = Convertor()
+    mappings.register(datetime, date_convertor)
+    return mappings
+
+
+records = [
+    {"author": f"a{idx}", "meta": {"headline": f"t{idx}"}, "views": str(idx)}
+    for idx in range(50)
+]
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_plan_pickle(backend):
+    route = Route(author=Path("author", extractor=_upper))
+    plan = dg.compile_plan(Article, routing=route, type_mappings=_mappings(), backend=backend)
+    clone = pickle.loads(pickle.dumps(plan))
+    assert clone.backend == backend
+    assert (clone.source is None) == (backend == "interpreter")
+    assert clone(records[3]) == plan(records[3]) == Article("A3", "t3", 3)
+
+
+def test_from_dicts_workers():
+    mappings = _mappings()
+    expected = from_dicts(Article, records, mappings)
+    assert from_dicts(Article, records, mappings, workers=2, chunksize=7) == expected
+
+    result = from_dicts(
+        Article, iter(records), mappings, workers=2, chunksize=3, lazy=True
+    )
+    assert isinstance(result, types.GeneratorType)
+    assert list(result) == expected
+
+    result = from_dicts(Article, records, mappings, workers=3, chunksize=4, ordered=False)
+    assert sorted(result, key=lambda item: item.views) == expected
+    assert from_dicts(Article, [], mappings, workers=2) == []
+
+
+def test_from_dicts_workers_shipping():
+    # routing and converter registrations are shipped to the workers
+    mappings = _mappings()
+    mappings.register(int, _double)
+    route = Route(name=Path("title", extractor=_upper))
+    data = [{"title": "x", "date": "2022-01-02", "count": "2"}] * 5
+    result = from_dicts(Event, data, mappings, route, workers=2, chunksize=2)
+    assert result == [Event("X", datetime(2022, 1, 2), 4)] * 5
+
+
+def test_from_dicts_workers_errors():
+    mappings = _mappings()
+    route = Route(author=Path("author", extractor=lambda val: val))
+    with pytest.raises(TypeError, match="Path extractor of field 'author'"):
+        from_dicts(Article, records, mappings, route, workers=2, lazy=True)
+    with pytest.raises(ValueError):
+        from_dicts(Article, records, mappings, workers=0)
+    with pytest.raises(ValueError):
+        from_dicts(Article, records, mappings, workers=2, chunksize=0)
+
+    mappings.register(int, lambda val: 0)
+    with pytest.raises(TypeError, match="converter registered for <class 'int'>"):
+        from_dicts(Article, records, mappings, workers=2)
+
+    # conversion errors are raised in the caller process
+    data = records + [{"author": "x"}]
+    with pytest.raises(ValueError, match="Missing parameter title"):
+        from_dicts(Article, data, _mappings(), workers=2, chunksize=10)
@@ -1,4 +1,6 @@
+import pytest
 from dictgest import Path
+from dictgest.routes import OP_KEY, OP_SKIP, OP_WILDCARD
 
 
 def test_basic():
@@ -33,3 +35,22 @@ def test_basic():
     res = p.extract(data)
     print(res)
     assert res == [30, 20, 30]
+
+
+def test_program():
+    p = Path("e/*{f=30}/g")
+    assert p.program == ((OP_KEY, "e"), (OP_WILDCARD, ("f", "30")), (OP_KEY, "g"))
+    assert Path("").program == ((OP_SKIP, ""),)
+    assert Path("a/*").program == ((OP_KEY, "a"), (OP_WILDCARD, None))
+
+    data = {"a": [{"b": [1, 2]}, {"c": 3}, {"b": [4]}], "d": {"": 5}}
+    assert Path("a/*").extract(data) == data["a"]
+    assert Path("a/b").extract(data) == [1, 2, 4]
+    assert Path("a/b", flatten_en=False).extract(data) == [[1, 2], [4]]
+    assert Path("d//").extract(data) == {"": 5}
+
+    p = Path("a/*{b==3}")
+    with pytest.raises(ValueError):
+        p.extract(data)
+    with pytest.raises(TypeError):
+        p.extract({"a": 1})
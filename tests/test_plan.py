@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from typing import Annotated
+import pytest
+import dictgest as dg
+from dictgest import Path, Route, from_dict
+from dictgest.plan import build_plan, clear_cache
+from .utils import check_fields
+
+
+@dataclass
+class Article:
+    author: str
+    title: Annotated[str, Path("headline")]
+    views: Annotated[int, Path("details/views")]
+    tags: list[str] = ()
+
+
+data = {
+    "author": "H.O. Ward",
+    "headline": "Will statically typed python become a thing?",
+    "details": {"views": "32", "comments": 2},
+    "tags": ["python", 3],
+}
+ref = {
+    "author": "H.O. Ward",
+    "title": "Will statically typed python become a thing?",
+    "views": 32,
+    "tags": ["python", "3"],
+}
+
+
+def test_compile():
+    ingest = dg.compile_plan(Article)
+    assert [field.name for field in ingest.fields] == [
+        "author",
+        "title",
+        "views",
+        "tags",
+    ]
+    check_fields(ingest(data), ref)
+    check_fields(ingest({**data, "tags": ()}), {**ref, "tags": []})
+
+    with pytest.raises(ValueError):
+        ingest({"author": "me"})
+
+
+def test_field_extract():
+    plan = dg.compile_plan(Article)
+    author, title, views, tags = plan.fields
+    assert title.extract(data) == data["headline"]
+    assert plan.convert_field(views, views.extract(data)) == 32
+    assert tags.extract({}) == ()
+    assert author.lookup({}) is author.default
+    with pytest.raises(ValueError, match="Missing parameter author"):
+        author.extract({})
+    assert dg.compile_plan(Article, convert_types=False).convert_field(views, "32") == "32"
+
+
+def test_compile_cache():
+    clear_cache()
+    route = Route(author="name")
+    assert dg.compile_plan(Article) is dg.compile_plan(Article)
+    assert dg.compile_plan(Article, routing=route) is dg.compile_plan(Article, routing=route)
+    assert dg.compile_plan(Article, routing={Article: route}) is dg.compile_plan(
+        Article, routing={Article: route}
+    )
+    assert dg.compile_plan(Article) is not dg.compile_plan(Article, convert_types=False)
+    assert dg.compile_plan(Article) is not dg.compile_plan(Article, type_mappings={})
+    assert dg.compile_plan(Article) is not build_plan(Article)
+
+
+def test_from_dict_uses_cache():
+    clear_cache()
+    from_dict(Article, data)
+    plan = dg.compile_plan(Article)
+    plan.fields[0].dtype = None
+    result = from_dict(Article, {**data, "author": 7})
+    assert result.author == 7
+
+
+def test_compile_route():
+    @dataclass
+    class A:
+        title: str
+        views: int
+
+    ingest = dg.compile_plan(A, routing=Route(title="headline", views="details/views"))
+    check_fields(ingest(data), {"title": ref["title"], "views": 32})
+
+    ingest = dg.compile_plan(A, routing=Route(title="headline"), convert_types=False)
+    check_fields(ingest({"headline": 1, "views": "2"}), {"title": 1, "views": "2"})
@@ -0,0 +1,163 @@
+import io
+import sqlite3
+import tracemalloc
+from dataclasses import dataclass
+from typing import Annotated, Optional
+import pytest
+from dictgest import Path, table_to_item, table_to_items
+from dictgest.sources import TableStream, read_csv, read_cursor
+
+
+@dataclass
+class Trade:
+    symbol: str
+    price: float
+    size: int
+
+
+@dataclass
+class Routed:
+    symbol: str
+    size: Annotated[int, Path("qty")]
+
+
+@dataclass
+class Prices:
+    price: list[float]
+
+
+CSV = "symbol,price,size\na,1.5,10\nb,2,20\nc,3.25,30\n"
+expected = [Trade("a", 1.5, 10), Trade("b", 2.0, 20), Trade("c", 3.25, 30)]
+
+
+@pytest.fixture
+def cursor():
+    connection = sqlite3.connect(":memory:")
+    connection.execute("create table trades (symbol text, price real, size integer)")
+    connection.executemany(
+        "insert into trades values (?, ?, ?)", [("a", 1.5, 10), ("b", 2, 20), ("c", 3.25, 30)]
+    )
+    yield connection.execute("select symbol, price, size from trades order by symbol")
+    connection.close()
+
+
+def test_read_csv(tmp_path):
+    stream = read_csv(io.StringIO(CSV))
+    assert stream.header == ["symbol", "price", "size"]
+    assert list(table_to_items(Trade, stream, chunksize=2)) == expected
+
+    path = tmp_path / "trades.csv"
+    path.write_text(CSV.replace(",", ";"), encoding="utf-8")
+    assert list(table_to_items(Trade, read_csv(path, delimiter=";"))) == expected
+
+    stream = read_csv(io.StringIO(CSV.split("\n", 1)[1]), header=["symbol", "price", "qty"])
+    expected_routed = [Routed("a", 10), Routed("b", 20), Routed("c", 30)]
+    assert list(table_to_items(Routed, stream)) == expected_routed
+
+
+@dataclass
+class Order:
+    symbol: str
+    size: Optional[int] = None
+
+
+def test_read_csv_null_values():
+    text = "symbol,size\na,10\nb,\nNA,NA\n"
+    stream = read_csv(io.StringIO(text), null_values=("", "NA"))
+    assert list(stream) == [["a", "10"], ["b", None], [None, None]]
+    stream = read_csv(io.StringIO(text.rsplit("NA,", 1)[0]), null_values=("",))
+    assert list(table_to_items(Order, stream)) == [Order("a", 10), Order("b")]
+    # by default empty cells are empty strings
+    assert list(read_csv(io.StringIO(text)))[1] == ["b", ""]
+
+
+def test_read_csv_close(tmp_path, monkeypatch):
+    path = tmp_path / "trades.csv"
+    path.write_text(CSV, encoding="utf-8")
+    opened = []
+    builtin_open = open
+
+    def tracked_open(*args, **kwargs):
+        file = builtin_open(*args, **kwargs)
+        opened.append(file)
+        return file
+
+    monkeypatch.setattr("builtins.open", tracked_open)
+    # a stream which is not iterated
+    with read_csv(path) as stream:
+        assert stream.header == ["symbol", "price", "size"]
+    assert opened[-1].closed
+    # a stream whose rows are all read
+    assert list(table_to_items(Trade, read_csv(path))) == expected
+    assert opened[-1].closed
+    # a failing header read
+    with pytest.raises(TypeError):
+        read_csv(path, delimiter=None)
+    assert opened[-1].closed
+    # streams of text streams do not close them
+    text = io.StringIO(CSV)
+    read_csv(text).close()
+    assert not text.closed
+
+
+def test_cursor_sources(cursor):
+    assert list(table_to_items(Trade, cursor, chunksize=2)) == expected
+
+
+def test_read_cursor(cursor):
+    fetched = []
+    original = cursor.fetchmany
+
+    class Spy:
+        description = cursor.description
+
+        def fetchmany(self, size):
+            rows = original(size)
+            fetched.append(len(rows))
+            return rows
+
+    stream = read_cursor(Spy(), chunksize=2)
+    assert stream.header == ["symbol", "price", "size"]
+    assert table_to_items(Trade, stream, output="columns")["size"] == [10, 20, 30]
+    assert fetched == [2, 1, 0]
+
+    with pytest.raises(ValueError):
+        read_cursor(sqlite3.connect(":memory:").cursor())
+
+
+def test_row_iterators():
+    rows = (["a", str(idx), idx] for idx in range(5))
+    items = table_to_items(Trade, rows, ["symbol", "price", "size"], chunksize=2)
+    assert [item.price for item in items] == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+    stream = TableStream(["symbol", "qty"], iter([["a", "1"], ["b", "2"]]))
+    table = table_to_items(Routed, stream, output="columns")
+    assert table["size"] == [1, 2]
+
+    stream = TableStream(["price"], iter([["1"], [2]]))
+    assert table_to_item(Prices, stream) == Prices([1.0, 2.0])
+
+    with pytest.raises(ValueError):
+        list(table_to_items(Trade, iter([["a", 1, 1]])))
+    with pytest.raises(ValueError):
+        list(table_to_items(Trade, iter([["a", 1, 1]]), ["symbol", "price", "size"], True))
+    with pytest.raises(ValueError):
+        list(table_to_items(Trade, iter([["a", 1]]), ["symbol", "price", "size"]))
+
+
+def test_streaming_memory_is_bounded():
+    def rows(count):
+        for idx in range(count):
+            yield ["a", "1.5", str(idx)]
+
+    def peak(count):
+        tracemalloc.start()
+        try:
+            header = ["symbol", "price", "size"]
+            for _ in table_to_items(Trade, rows(count), header, chunksize=100):
+                pass
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    assert peak(20000) < 2 * peak(2000)
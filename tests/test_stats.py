@@ -0,0 +1,146 @@
+import io
+import json
+from dataclasses import dataclass
+from typing import Annotated
+import pytest
+from dictgest import Path, from_dict, from_dicts, table_to_item, table_to_items
+from dictgest.stats import IngestStats
+from dictgest.stream import from_json_stream
+
+
+@dataclass
+class Article:
+    author: str
+    title: Annotated[str, Path("meta/headline")]
+    views: int = 0
+
+
+@dataclass
+class Reading:
+    value: float
+    name: str
+
+
+@dataclass
+class Sample:
+    values: list[float]
+    name: list[str]
+
+
+records = [
+    {"author": f"a{idx}", "meta": {"headline": f"t{idx}"}, "views": str(idx)}
+    for idx in range(10)
+]
+
+
+def _check_counts(stats, target, records_count, fields):
+    target_stats = stats.targets[target.__qualname__]
+    assert target_stats.records == records_count
+    assert target_stats.failures == 0
+    assert set(target_stats.fields) == set(fields)
+    for name in fields:
+        field = target_stats.fields[name]
+        assert field.count == records_count
+        assert field.extract_time >= 0 and field.convert_time >= 0
+        assert field.failures == 0
+    assert target_stats.construct_time > 0
+
+
+def test_from_dict_stats():
+    stats = IngestStats()
+    article = from_dict(Article, records[3], stats=stats)
+    assert article == Article("a3", "t3", 3)
+    _check_counts(stats, Article, 1, ["author", "title", "views"])
+
+
+@pytest.mark.parametrize("backend", ["codegen", "interpreter"])
+def test_from_dicts_stats(backend):
+    stats = IngestStats()
+    articles = from_dicts(Article, records, stats=stats, backend=backend)
+    assert articles == from_dicts(Article, records)
+    _check_counts(stats, Article, len(records), ["author", "title", "views"])
+    assert stats.target(Article).field("views").convert_time > 0
+
+
+def test_stats_accumulate_and_reset():
+    stats = IngestStats()
+    from_dicts(Article, records, stats=stats)
+    list(from_dicts(Article, records, stats=stats, lazy=True))
+    assert stats.target(Article).records == 2 * len(records)
+    stats.reset()
+    assert stats.as_dict() == {}
+
+
+def test_failures_counted():
+    stats = IngestStats()
+    bad = [*records[:2], {"author": "x", "meta": {"headline": "t"}, "views": "many"}]
+    with pytest.raises(ValueError):
+        from_dicts(Article, bad, stats=stats)
+    target_stats = stats.target(Article)
+    assert target_stats.records == 2
+    assert target_stats.failures == 1
+    assert target_stats.field("views").failures == 1
+    assert target_stats.field("title").failures == 0
+
+    with pytest.raises(ValueError):
+        from_dict(Article, {"author": "x"}, stats=stats)
+    assert target_stats.field("title").failures == 1
+    assert target_stats.failures == 2
+
+
+def test_stats_not_supported_with_workers():
+    with pytest.raises(ValueError):
+        from_dicts(Article, records, workers=2, stats=IngestStats())
+
+
+def test_stream_stats():
+    text = "\n".join(json.dumps(record) for record in records)
+    stats = IngestStats()
+    articles = list(from_json_stream(Article, io.StringIO(text), stats=stats))
+    assert articles == from_dicts(Article, records)
+    _check_counts(stats, Article, len(records), ["author", "title", "views"])
+
+
+def test_table_stats():
+    header = ["author", "meta", "views"]
+    table = [[f"a{idx}", {"headline": f"t{idx}"}, str(idx)] for idx in range(4)]
+    stats = IngestStats()
+    items = list(table_to_items(Article, table, header, stats=stats))
+    assert items == [Article(f"a{idx}", f"t{idx}", idx) for idx in range(4)]
+    _check_counts(stats, Article, 4, ["author", "title", "views"])
+
+
+def test_columnar_stats():
+    table = [["1", "x"], [2, "y"], [3.5, "z"]]
+    stats = IngestStats()
+    items = list(table_to_items(Reading, table, ["value", "name"], stats=stats))
+    assert items == [Reading(1.0, "x"), Reading(2.0, "y"), Reading(3.5, "z")]
+    _check_counts(stats, Reading, 3, ["value", "name"])
+
+    header = ["values", "name"]
+    stats.reset()
+    item = table_to_item(Sample, table, header, stats=stats)
+    assert item == table_to_item(Sample, table, header)
+    _check_counts(stats, Sample, 1, ["values", "name"])
+
+
+def test_as_dict_and_prometheus():
+    stats = IngestStats()
+    from_dicts(Article, records, stats=stats)
+    data = stats.as_dict()
+    assert data["Article"]["records"] == len(records)
+    assert data["Article"]["fields"]["views"]["count"] == len(records)
+    assert set(data["Article"]["fields"]["views"]) == {
+        "count",
+        "extract_time",
+        "convert_time",
+        "failures",
+    }
+
+    text = stats.to_prometheus(prefix="ingest")
+    lines = text.splitlines()
+    assert "# TYPE ingest_records_total counter" in lines
+    assert f'ingest_records_total{{target="Article"}} {len(records)}' in lines
+    assert f'ingest_field_values_total{{target="Article",field="views"}} {len(records)}' in lines
+    assert any(line.startswith("ingest_field_convert_seconds_total{") for line in lines)
+    assert text.endswith("\n")
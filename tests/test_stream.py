@@ -0,0 +1,120 @@
+import io
+import json
+from dataclasses import dataclass
+from typing import Annotated
+import pytest
+from dictgest import Path, Route
+from dictgest import stream
+from dictgest.plan import compile_plan
+from dictgest.stream import from_json_stream, iter_json, root_keys
+
+
+@dataclass
+class Article:
+    author: str
+    title: Annotated[str, Path("headline")]
+    views: Annotated[int, Path("details/views")]
+
+
+records = [
+    {
+        "author": f"author {idx}",
+        "headline": f"title é {idx}",
+        "details": {"views": str(idx), "content": "..." * idx},
+        "seo": {"tags": ["python"] * idx},
+    }
+    for idx in range(50)
+]
+expected = [Article(f"author {idx}", f"title é {idx}", idx) for idx in range(50)]
+ndjson = "\n".join(json.dumps(record) for record in records) + "\n"
+array = json.dumps(records, indent=2)
+
+
+@pytest.fixture(params=["simdjson", "json"])
+def parser(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(stream, "simdjson", None)
+    elif stream.simdjson is None:
+        pytest.skip("pysimdjson is not installed")
+
+
+@pytest.mark.parametrize("text", [ndjson, array])
+@pytest.mark.parametrize("binary", [False, True])
+def test_from_json_stream(parser, text, binary):
+    source = io.BytesIO(text.encode()) if binary else io.StringIO(text)
+    result = from_json_stream(Article, source)
+    assert next(result) == expected[0]
+    assert list(result) == expected[1:]
+
+
+def test_from_json_stream_file(parser, tmp_path):
+    path = tmp_path / "records.ndjson"
+    path.write_text(ndjson, encoding="utf-8")
+    assert list(from_json_stream(Article, path)) == expected
+    assert list(from_json_stream(Article, str(path), prune=False)) == expected
+
+
+def test_iter_json_chunks(parser):
+    for chunk_size in [1, 3, 100]:
+        for text in [ndjson, array]:
+            result = iter_json(io.BytesIO(text.encode()), chunk_size=chunk_size)
+            assert list(result) == records
+
+    keys = frozenset({"author", "seo"})
+    for chunk_size in [1, 7, 1 << 16]:
+        for text in [ndjson, array]:
+            result = list(iter_json(io.StringIO(text), keys, chunk_size))
+            assert result == [
+                {"author": rec["author"], "seo": rec["seo"]} for rec in records
+            ]
+
+    assert list(iter_json(io.StringIO(" [ ] "))) == []
+    assert list(iter_json(io.StringIO(""))) == []
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json(io.StringIO("[1, 2")))
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json(io.StringIO("[1 2]")))
+
+
+def test_iter_json_skipped_values(parser):
+    # brackets and escaped quotes in the strings of skipped subtrees
+    tricky = [
+        {"id": 1, "skip": {"text": 'a "]}" [{', "list": [[], {}, "}"]}, "end": "\\"},
+        {"skip": ["\\", "\"", {"x": [1, 2]}], "id": 2},
+        {"id": 3},
+        [1, {"id": 4}],
+        "text",
+        # object separators of nested lists and strings
+        {"id": 5, "skip": [{"a": 1}, {"b": [{}, {}]}], "note": "}, {"},
+        {"id": 6, "skip": [{"a": 1}, {"b": 2}]},
+    ] + [{"id": 7}] * 4
+    keys = frozenset({"id", "end"})
+    expected_items = [{"id": 1, "end": "\\"}, {"id": 2}, {"id": 3}, [1, {"id": 4}], "text"]
+    expected_items += [{"id": 5}, {"id": 6}] + [{"id": 7}] * 4
+    for chunk_size in [1, 5, 1 << 16]:
+        for text in [json.dumps(tricky), "\n".join(map(json.dumps, tricky))]:
+            result = list(iter_json(io.StringIO(text), keys, chunk_size))
+            assert result == expected_items
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json(io.StringIO('[{"skip": [1, 2], "id": 1'), keys))
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json(io.StringIO('[{"skip": "text}'), keys))
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json(io.StringIO('[{"id": 1}, {"id": 2}, {"id"}, {"id": 3}]'), keys))
+
+
+def test_root_keys():
+    assert root_keys(compile_plan(Article)) == {"author", "headline", "details"}
+
+    @dataclass
+    class Whole:
+        raw: Annotated[dict, Path("")]
+
+    assert root_keys(compile_plan(Whole)) is None
+    @dataclass
+    class Tags:
+        author: str
+        tags: list[str]
+
+    route = Route(tags="seo/tags")
+    assert root_keys(compile_plan(Tags, routing=route)) == {"author", "seo"}
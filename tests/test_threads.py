@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+from datetime import datetime
+from threading import Barrier, Thread
+from typing import Annotated
+import pytest
+import dictgest as dg
+from dictgest import Path, from_dict, from_dicts
+from dictgest.converter import Convertor, date_convertor
+from dictgest.plan import clear_cache
+
+
+@dataclass
+class Article:
+    author: str
+    title: Annotated[str, Path("meta/headline")]
+    date: datetime
+    views: int = 0
+
+
+records = [
+    {
+        "author": f"a{idx}",
+        "meta": {"headline": f"t{idx}"},
+        "date": "2022-01-02",
+        "views": str(idx),
+    }
+    for idx in range(200)
+]
+
+
+def _run_threads(func, count=8):
+    barrier = Barrier(count)
+    errors = []
+
+    def run():
+        barrier.wait()
+        try:
+            func()
+        except Exception as err:  # pylint: disable=W0703
+            errors.append(err)
+
+    threads = [Thread(target=run) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_from_dicts_threads(backend):
+    expected = from_dicts(Article, records, backend=backend)
+    result = from_dicts(
+        Article, records, workers=4, chunksize=16, executor="thread", backend=backend
+    )
+    assert result == expected
+
+    result = from_dicts(
+        Article, iter(records), workers=4, chunksize=7, executor="thread", ordered=False
+    )
+    assert sorted(result, key=lambda item: item.views) == expected
+
+    with pytest.raises(ValueError, match="Unknown executor"):
+        from_dicts(Article, records, workers=2, executor="fiber")
+
+
+def test_register_copy_on_write():
+    mappings = Convertor()
+    mappings.register(datetime, date_convertor)
+    snapshot = mappings.snapshot()
+    assert snapshot is mappings.snapshot()
+    old = mappings.mappings
+
+    mappings.register(int, int)
+    assert mappings.version == 2
+    assert mappings.mappings is not old and int not in old
+    assert int not in snapshot and datetime in snapshot
+    assert mappings.snapshot() is not snapshot
+    assert int in mappings.snapshot()
+
+
+def test_concurrent_compile_and_register():
+    mappings = Convertor()
+    mappings.register(datetime, date_convertor)
+    clear_cache()
+    plans = []
+
+    def ingest():
+        for record in records:
+            plans.append(dg.compile_plan(Article, type_mappings=mappings))
+            assert from_dict(Article, record, mappings).views == int(record["views"])
+
+    def register():
+        for idx in range(200):
+            mappings.register(type(f"T{idx}", (), {}), int)
+
+    _run_threads(ingest)
+    assert all(plan is plans[0] for plan in plans)
+    _run_threads(lambda: (register(), ingest()), count=4)
+    assert len(mappings) == 1 + 4 * 200
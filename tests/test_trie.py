@@ -0,0 +1,110 @@
+from dataclasses import dataclass
+from typing import Annotated
+import pytest
+import dictgest as dg
+from dictgest import Path, Route
+from dictgest.trie import PathTrie
+
+
+data = {
+    "details": {
+        "content": "Over the past 10 years ...[+]",
+        "votes": "32",
+        "category": "tech",
+        "comments": [
+            {"user": "a", "tags": ["x", "y"]},
+            {"user": "b", "tags": ["z"]},
+            {"likes": 3},
+        ],
+    },
+    "meta": {"id": 7},
+}
+
+
+def _missing(_):
+    raise KeyError()
+
+
+def test_trie_extract():
+    paths = [
+        Path("details/content"),
+        Path("details/votes"),
+        Path("details/comments/user"),
+        Path("details/comments/tags"),
+        Path("details/comments/tags", flatten_en=False),
+        Path("details/comments/*{user=b}/tags"),
+        Path("details/missing/key"),
+        Path("meta/id", extractor=str),
+        Path("meta", extractor=_missing),
+        Path(""),
+    ]
+    trie = PathTrie(paths)
+    assert trie.shares_prefixes
+    assert not PathTrie([Path("a/b"), Path("c/d")]).shares_prefixes
+
+    marker = object()
+    values = trie.extract(data, marker)
+    for path, value in zip(paths, values):
+        assert value == path.get(data, marker)
+    assert values[3] == ["x", "y", "z"]
+    assert values[4] == [["x", "y"], ["z"]]
+    assert values[6] is marker
+    assert values[8] is marker
+
+    with pytest.raises(TypeError):
+        PathTrie([Path("meta/*"), Path("meta/id")]).extract(data)
+
+
+@dataclass
+class Article:
+    content: str
+    votes: int
+    category: str
+    users: list[str]
+    missing: str = "none"
+
+
+route = Route(
+    content="details/content",
+    votes="details/votes",
+    category="details/category",
+    users="details/comments/user",
+    missing="details/x/y",
+)
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_trie_plan(backend):
+    ingest = dg.compile_plan(Article, routing=route, backend=backend)
+    ref = Article(data["details"]["content"], 32, "tech", ["a", "b"])
+    assert ingest(data) == ref
+
+    listed = {"details": [data["details"], {"votes": 5}]}
+    ingest = dg.compile_plan(Article, routing=route, convert_types=False, backend=backend)
+    result = ingest(listed)
+    for name, path in route.mapping.items():
+        assert getattr(result, name) == path.get(listed, "none")
+    assert result.votes == ["32", 5]
+
+    with pytest.raises(ValueError, match="Missing parameter content"):
+        ingest({"details": {}})
+    with pytest.raises(ValueError, match="Missing parameter content"):
+        ingest({})
+
+
+@dataclass
+class Sensor:
+    name: str
+    low: Annotated[int, Path("range/low")]
+    high: Annotated[int, Path("range/high")]
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_trie_plan_errors(backend):
+    ingest = dg.compile_plan(Sensor, backend=backend)
+    # the first failing field raises, as when each path is extracted separately
+    with pytest.raises(ValueError, match="Missing parameter name"):
+        ingest({"range": 5})
+    with pytest.raises(TypeError):
+        ingest({"name": "x", "range": 5})
+    assert ingest({"name": "x", "range": {"low": "1", "high": 2}}) == Sensor("x", 1, 2)
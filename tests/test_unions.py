@@ -0,0 +1,98 @@
+import sys
+from dataclasses import dataclass
+from enum import Enum
+from typing import Annotated, Literal, Optional, Union
+import pytest
+from dictgest import Path, compile_plan, from_dict, typecast
+from dictgest.cast import convert
+
+
+class Color(Enum):
+    RED = "red"
+    GREEN = "green"
+
+
+class Level(Enum):
+    LOW = 1
+    HIGH = 2
+
+
+def test_union():
+    assert convert("3", Optional[int]) == 3
+    assert convert(None, Optional[int]) is None
+    assert convert("3", Union[int, str]) == "3"  # exact type match first
+    assert convert(3.5, Union[int, str]) == 3
+    assert convert("x", Union[int, float, str]) == "x"
+    assert convert(True, Union[int, str]) is True
+    assert convert(["1", 2], Union[list[int], None]) == [1, 2]
+    assert convert(("1",), Union[list[int], str]) == [1]
+    assert convert([["1"]], list[Optional[list[int]]]) == [[1]]
+    with pytest.raises(ValueError, match="Cannot convert"):
+        convert("x", Optional[int])
+    with pytest.raises(ValueError, match="Cannot convert"):
+        convert("x", Union[int, float])
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="X | Y unions need python 3.10")
+def test_pep604_union():
+    assert convert("3", int | None) == 3
+    assert convert(None, int | None) is None
+    assert convert({"a": "1"}, dict[str, int] | None) == {"a": 1}
+
+
+def test_literal():
+    assert convert("a", Literal["a", "b"]) == "a"
+    assert convert("2", Literal[1, 2]) == 2
+    assert convert(None, Literal["a", None]) is None
+    with pytest.raises(ValueError, match="is not one of"):
+        convert("c", Literal["a", "b"])
+    with pytest.raises(ValueError, match="is not one of"):
+        convert([1], Literal[1])
+
+
+def test_enum():
+    assert convert("red", Color) is Color.RED
+    assert convert("GREEN", Color) is Color.GREEN
+    assert convert(Color.RED, Color) is Color.RED
+    assert convert(2, Level) is Level.HIGH
+    assert convert("HIGH", Level) is Level.HIGH
+    assert convert(["red", "GREEN"], list[Color]) == [Color.RED, Color.GREEN]
+    with pytest.raises(ValueError):
+        convert("blue", Color)
+    with pytest.raises(ValueError):
+        convert("2", Level)  # values are not converted
+
+
+@typecast
+@dataclass
+class Meta:
+    source: str
+    score: float
+
+
+@dataclass
+class Order:
+    status: Literal["new", "done"]
+    color: Color
+    quantity: Optional[int] = None
+    meta: Optional[Meta] = None
+    note: Annotated[Union[int, str, None], Path("details/note")] = None
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_fields(backend):
+    ingest = compile_plan(Order, backend=backend)
+    order = ingest({"status": "new", "color": "red", "quantity": "3"})
+    assert order == Order("new", Color.RED, 3)
+
+    data = {
+        "status": "done",
+        "color": "GREEN",
+        "meta": {"source": "api", "score": "0.5"},
+        "details": {"note": 5.0},
+    }
+    assert ingest(data) == Order("done", Color.GREEN, None, Meta("api", 0.5), 5)
+    assert from_dict(Order, data) == ingest(data)
+
+    with pytest.raises(ValueError):
+        ingest({"status": "unknown", "color": "red"})